@@ -19,13 +19,12 @@ import app.models
 # access to the values within the .ini file in use.
 config = context.config
 
-# 注意：由于现在使用 Supabase 客户端，Alembic 迁移功能被禁用
-# 请在 Supabase Dashboard 中管理数据库架构
-print("Warning: Alembic migrations are disabled when using Supabase client.")
-print("Please manage database schema through Supabase Dashboard.")
-
-# 设置一个虚拟的数据库URL以避免错误
-config.set_main_option("sqlalchemy.url", "sqlite:///:memory:")
+# 注意：表结构由 Supabase Dashboard 管理，这里只维护索引等增量迁移
+# 设置 POSTGRES_URL 指向 Supabase PostgreSQL 时执行迁移，否则使用虚拟的数据库URL
+postgres_url = os.getenv("POSTGRES_URL")
+if not postgres_url:
+    print("Warning: POSTGRES_URL is not set, running migrations against an in-memory SQLite database.")
+config.set_main_option("sqlalchemy.url", (postgres_url or "sqlite:///:memory:").replace("%", "%%"))
 
 # Interpret the config file for Python logging.
 # This line sets up loggers basically.
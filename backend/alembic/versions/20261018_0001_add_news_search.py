@@ -0,0 +1,85 @@
+"""add news search index
+
+为新闻关键词搜索添加索引：
+- pg_trgm 三元组 GIN 索引，加速 title/description 的 ILIKE '%kw%' 子串匹配
+- search_vector 生成列（tsvector）及其 GIN 索引，用于全文检索
+- search_news(text) 函数，按 ts_rank_cd 排序返回匹配的新闻（通过 PostgREST rpc 调用）
+
+仅在 PostgreSQL 上执行；SQLite 开发环境下由应用内的倒排索引兜底。
+
+Revision ID: 20261018_0001
+Revises: 
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '20261018_0001'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _is_postgresql() -> bool:
+    return op.get_context().dialect.name == "postgresql"
+
+
+def upgrade() -> None:
+    if not _is_postgresql():
+        return
+
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_news_title_trgm "
+        "ON news USING gin (title gin_trgm_ops)"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_news_description_trgm "
+        "ON news USING gin (description gin_trgm_ops)"
+    )
+
+    # 使用 simple 配置：不做词干化，中英文混排内容的分词结果可预期
+    op.execute(
+        """
+        ALTER TABLE news ADD COLUMN IF NOT EXISTS search_vector tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('simple', coalesce(title, '')), 'A') ||
+            setweight(to_tsvector('simple', coalesce(description, '')), 'B')
+        ) STORED
+        """
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_news_search_vector "
+        "ON news USING gin (search_vector)"
+    )
+
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION search_news(search_query text)
+        RETURNS SETOF news
+        LANGUAGE sql STABLE
+        AS $$
+            SELECT n.*
+            FROM news n
+            WHERE n.search_vector @@ websearch_to_tsquery('simple', search_query)
+            ORDER BY ts_rank_cd(n.search_vector, websearch_to_tsquery('simple', search_query)) DESC,
+                     n.id DESC
+        $$
+        """
+    )
+
+
+def downgrade() -> None:
+    if not _is_postgresql():
+        return
+
+    op.execute("DROP FUNCTION IF EXISTS search_news(text)")
+    op.execute("DROP INDEX IF EXISTS ix_news_search_vector")
+    op.execute("ALTER TABLE news DROP COLUMN IF EXISTS search_vector")
+    op.execute("DROP INDEX IF EXISTS ix_news_description_trgm")
+    op.execute("DROP INDEX IF EXISTS ix_news_title_trgm")
@@ -1,4 +1,10 @@
-from app.database import Base, get_engine
-
 # 注意：在serverless环境中，不应该在模块导入时创建数据库表
-# 数据库表的创建应该通过迁移脚本或者在应用启动时进行
\ No newline at end of file
+# 数据库表的创建应该通过迁移脚本或者在应用启动时进行
+# SQLAlchemy 不在请求路径上，Base/get_engine 在首次访问时才导入，减少冷启动时间
+
+
+def __getattr__(name):
+    if name in ("Base", "get_engine"):
+        from app import database
+        return getattr(database, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -2,6 +2,8 @@
 from fastapi import APIRouter
 from .users import router as users_router
 from .news import router as news_router
+from .health import router as health_router
+from .uploads import router as uploads_router
 
 # 创建主路由
 api_router = APIRouter()
@@ -9,5 +11,6 @@ api_router = APIRouter()
 # 包含子路由
 api_router.include_router(users_router, prefix="/users", tags=["users"])
 api_router.include_router(news_router, prefix="/news", tags=["news"])
+api_router.include_router(uploads_router, prefix="/uploads", tags=["uploads"])
 
-__all__ = ["api_router", "users_router", "news_router"]
\ No newline at end of file
+__all__ = ["api_router", "users_router", "news_router", "uploads_router", "health_router"]
\ No newline at end of file
@@ -0,0 +1,26 @@
+from fastapi import APIRouter, status
+from fastapi.responses import JSONResponse
+
+from ..services.health_service import health_service
+
+router = APIRouter()
+
+
+@router.get("/health")
+async def health_check():
+    """健康检查（兼容旧接口，等同于存活检查）"""
+    return health_service.liveness()
+
+
+@router.get("/health/live")
+async def liveness():
+    """存活检查：进程可以处理请求"""
+    return health_service.liveness()
+
+
+@router.get("/health/ready")
+async def readiness():
+    """就绪检查：数据库可访问、事件循环未阻塞，未就绪时返回 503"""
+    result = await health_service.readiness()
+    status_code = status.HTTP_200_OK if result["status"] == "ready" else status.HTTP_503_SERVICE_UNAVAILABLE
+    return JSONResponse(status_code=status_code, content=result)
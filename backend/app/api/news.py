@@ -1,18 +1,45 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from typing import Optional, List
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
+from fastapi.responses import Response, StreamingResponse
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional, List, Tuple, Union
+import csv
+import io
+import json
 import logging
 
-from ..schemas.news import NewsCreate, NewsUpdate, NewsResponse, NewsSearchParams
+from pydantic import TypeAdapter, ValidationError
+
+from ..schemas.news import (
+    NewsCreate,
+    NewsUpdate,
+    NewsResponse,
+    NewsSearchParams,
+    NewsBatchCreate,
+    NewsBatchItemResult,
+    NewsBatchResponse,
+)
 from ..core.exceptions import NotFoundException, ForbiddenException, BadRequestException
-from ..core.pagination import PaginationParams, PaginatedResponse
+from ..core.pagination import (
+    PaginationParams,
+    PaginatedResponse,
+    CursorPaginatedResponse,
+    decode_cursor,
+)
 from ..api.users import get_current_user
-from ..services.supabase_service import supabase_service
+from ..services.supabase_service import supabase_service, NEWS_EXPORT_FIELDS
 from ..schemas.user import UserResponse
+from ..core.config import settings
+from ..core.response_cache import news_cache, render_json, cached_json_response
+from ..core.serialization import BulkSerializer, FastJSONResponse, dumps
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# 整体序列化器：每页只做一次校验和一次 JSON 编码
+news_serializer = BulkSerializer(NewsResponse)
+news_page_serializer = BulkSerializer(PaginatedResponse[NewsResponse])
+news_cursor_page_serializer = BulkSerializer(CursorPaginatedResponse[NewsResponse])
+
 
 @router.post("", response_model=NewsResponse, status_code=status.HTTP_201_CREATED)
 async def create_news(
@@ -22,6 +49,7 @@ async def create_news(
     """创建新闻"""
     try:
         result = await supabase_service.create_news(news, current_user["id"])
+        await news_cache.invalidate()
         
         logger.info(f"新闻创建成功: {news.title} (用户: {current_user['username']})")
         return NewsResponse(**result)
@@ -31,49 +59,416 @@ async def create_news(
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
-@router.get("", response_model=PaginatedResponse[NewsResponse])
+class _NewsBatchWriter:
+    """批量写入新闻
+
+    条目先缓存，凑满 NEWS_BATCH_CHUNK_SIZE 条后整块校验一次，
+    校验通过的条目用一条多行 INSERT 写入；每条记录处理结果，失败不影响其他条目。
+    """
+
+    _adapter = TypeAdapter(List[NewsCreate])
+
+    def __init__(self, creator_id: int):
+        self.creator_id = creator_id
+        self.chunk_size = max(1, settings.NEWS_BATCH_CHUNK_SIZE)
+        self.results: List[NewsBatchItemResult] = []
+        self._pending: List[Tuple[int, Any]] = []
+
+    async def add(self, index: int, item: Any) -> None:
+        """添加一条待写入的新闻"""
+        self._pending.append((index, item))
+        if len(self._pending) >= self.chunk_size:
+            await self.flush()
+
+    def fail(self, index: int, error: str) -> None:
+        """记录一条失败的条目"""
+        self.results.append(NewsBatchItemResult(index=index, status="failed", error=error))
+
+    @staticmethod
+    def _format_errors(errors: List[Dict[str, Any]]) -> str:
+        return "; ".join(
+            f"{'.'.join(str(loc) for loc in error['loc'])}: {error['msg']}" if error["loc"] else error["msg"]
+            for error in errors
+        )
+
+    def _validate(self, pending: List[Tuple[int, Any]]) -> List[Tuple[int, NewsCreate]]:
+        """整块校验，返回校验通过的条目；失败条目按位置记录错误"""
+        try:
+            return list(zip(
+                (index for index, _ in pending),
+                self._adapter.validate_python([item for _, item in pending])
+            ))
+        except ValidationError as e:
+            errors_by_position: Dict[int, List[Dict[str, Any]]] = {}
+            for error in e.errors():
+                errors_by_position.setdefault(error["loc"][0], []).append(
+                    {**error, "loc": error["loc"][1:]}
+                )
+
+        valid = []
+        for position, (index, item) in enumerate(pending):
+            if position in errors_by_position:
+                self.fail(index, self._format_errors(errors_by_position[position]))
+            else:
+                valid.append((index, NewsCreate.model_validate(item)))
+        return valid
+
+    async def flush(self) -> None:
+        """写入缓存中的条目"""
+        pending, self._pending = self._pending, []
+        valid = self._validate(pending)
+        if not valid:
+            return
+        try:
+            rows = await supabase_service.create_news_batch(
+                [news for _, news in valid], self.creator_id
+            )
+        except Exception as e:
+            for index, _ in valid:
+                self.fail(index, str(e))
+            return
+        for (index, _), row in zip(valid, rows):
+            self.results.append(NewsBatchItemResult(index=index, status="created", id=row["id"]))
+
+    def response(self) -> NewsBatchResponse:
+        """汇总处理结果（按条目序号排序）"""
+        results = sorted(self.results, key=lambda result: result.index)
+        created = sum(1 for result in results if result.status == "created")
+        return NewsBatchResponse(
+            total=len(results),
+            created=created,
+            failed=len(results) - created,
+            results=results
+        )
+
+
+@router.post("/batch", response_model=NewsBatchResponse)
+async def create_news_batch(
+    batch: NewsBatchCreate,
+    current_user: dict = Depends(get_current_user)
+):
+    """批量创建新闻
+
+    每条单独返回处理结果；校验失败或写入失败的条目不影响其他条目。
+    """
+    if len(batch.items) > settings.NEWS_BATCH_MAX_ITEMS:
+        raise BadRequestException(f"单次最多创建{settings.NEWS_BATCH_MAX_ITEMS}条新闻")
+
+    writer = _NewsBatchWriter(current_user["id"])
+    for index, item in enumerate(batch.items):
+        await writer.add(index, item)
+    await writer.flush()
+
+    result = writer.response()
+    if result.created:
+        await news_cache.invalidate()
+
+    logger.info(
+        f"批量创建新闻: 成功{result.created}条, 失败{result.failed}条 (用户: {current_user['username']})"
+    )
+    return result
+
+
+@router.post("/import", response_model=NewsBatchResponse)
+async def import_news(
+    request: Request,
+    current_user: dict = Depends(get_current_user)
+):
+    """流式导入新闻（NDJSON，每行一条新闻）
+
+    边读取请求体边分块写入，不需要把整个文件读入内存；
+    index 为行号减1，空行跳过，超过 NEWS_IMPORT_MAX_ITEMS 条后停止读取。
+    单行超过 NEWS_IMPORT_MAX_LINE_BYTES 字节时丢弃该行并记为失败，内存占用不随行长增长。
+    """
+    writer = _NewsBatchWriter(current_user["id"])
+    max_line_bytes = settings.NEWS_IMPORT_MAX_LINE_BYTES
+    line_number = 0
+    item_count = 0
+
+    async def handle_line(line: bytes, oversized: bool = False) -> bool:
+        nonlocal line_number, item_count
+        line_number += 1
+        if not oversized and not line.strip():
+            return True
+        item_count += 1
+        if item_count > settings.NEWS_IMPORT_MAX_ITEMS:
+            writer.fail(line_number - 1, f"超出单次导入上限{settings.NEWS_IMPORT_MAX_ITEMS}条，停止导入")
+            return False
+        if oversized:
+            writer.fail(line_number - 1, f"单行超过{max_line_bytes}字节")
+            return True
+        try:
+            item = json.loads(line)
+        except ValueError:
+            writer.fail(line_number - 1, "JSON 格式错误")
+            return True
+        await writer.add(line_number - 1, item)
+        return True
+
+    # pending 保存当前行尚未遇到换行符的部分；当前行超长后不再保存，丢弃到下一个换行符为止
+    pending = bytearray()
+    oversized = False
+    reading = True
+    async for chunk in request.stream():
+        # 只在新到达的数据块中查找换行符
+        start = 0
+        while reading:
+            end = chunk.find(b"\n", start)
+            if end == -1:
+                if not oversized:
+                    pending += chunk[start:]
+                    if len(pending) > max_line_bytes:
+                        oversized = True
+                        pending.clear()
+                break
+            if oversized or len(pending) + end - start > max_line_bytes:
+                reading = await handle_line(b"", oversized=True)
+            else:
+                pending += chunk[start:end]
+                reading = await handle_line(bytes(pending))
+            pending.clear()
+            oversized = False
+            start = end + 1
+        if not reading:
+            break
+    if reading and (pending or oversized):
+        await handle_line(bytes(pending), oversized=oversized)
+    await writer.flush()
+
+    result = writer.response()
+    if result.created:
+        await news_cache.invalidate()
+
+    logger.info(
+        f"导入新闻: 成功{result.created}条, 失败{result.failed}条 (用户: {current_user['username']})"
+    )
+    return result
+
+
+async def _cached_response(
+    request: Request,
+    name: str,
+    params: Dict[str, Any],
+    build: Callable[[], Awaitable[Any]]
+) -> Response:
+    """读取或生成公开接口的缓存响应（带 ETag / Cache-Control）
+
+    build 返回序列化后的响应内容（字节串）或可序列化的对象。
+    """
+    key = None
+    if news_cache.enabled:
+        key = await news_cache.key(name, [(k, v) for k, v in params.items() if v is not None])
+        body = await news_cache.get(key)
+        if body is not None:
+            return cached_json_response(request, body)
+
+    body = render_json(await build())
+    if key is not None:
+        await news_cache.set(key, body)
+    return cached_json_response(request, body)
+
+
+@router.get(
+    "",
+    response_model=Union[PaginatedResponse[NewsResponse], CursorPaginatedResponse[NewsResponse]]
+)
 async def get_news_list(
+    request: Request,
     params: PaginationParams = Depends(),
     keyword: Optional[str] = Query(None, description="搜索关键词"),
     creator_id: Optional[int] = Query(None, description="创建者ID"),
     sort_by: str = Query("created_at", regex="^(created_at|updated_at|title)$"),
-    sort_order: str = Query("desc", regex="^(asc|desc)$")
+    sort_order: str = Query("desc", regex="^(asc|desc)$"),
+    count: Optional[str] = Query(
+        None,
+        regex="^(exact|planned|estimated)$",
+        description="总数统计方式，大表可使用planned/estimated"
+    ),
+    cursor: Optional[str] = Query(
+        None,
+        description="游标分页：首页传空值，之后传上一页返回的next_cursor"
+    ),
+    search_mode: Optional[str] = Query(
+        None,
+        regex="^(ilike|fts|ranked)$",
+        description="搜索方式：ilike子串匹配，fts全文检索，ranked按相关度排序"
+    )
 ):
-    """获取新闻列表（支持搜索和分页）"""
+    """获取新闻列表（支持搜索和分页）
+
+    传入cursor参数时使用游标分页，返回next_cursor，仅在指定count时统计总数。
+    响应按规范化后的查询参数缓存，支持 If-None-Match 返回 304。
+    """
+    search_mode = search_mode or settings.NEWS_SEARCH_MODE
+    if cursor is None:
+        count = count or settings.NEWS_COUNT_METHOD
+
+    cache_params = {
+        "page": params.page if cursor is None else None,
+        "size": params.size,
+        "keyword": keyword,
+        "creator_id": creator_id,
+        "sort_by": sort_by,
+        "sort_order": sort_order,
+        "count": count,
+        "cursor": cursor,
+        "search_mode": search_mode if keyword else None,
+    }
+
+    async def build():
+        if cursor is not None:
+            return await _load_news_by_cursor(
+                params.size, cursor, keyword, creator_id, sort_by, sort_order, count, search_mode
+            )
+
+        try:
+            result = await supabase_service.get_news_list(
+                page=params.page,
+                size=params.size,
+                keyword=keyword,
+                creator_id=creator_id,
+                sort_by=sort_by,
+                sort_order=sort_order,
+                count_method=count,
+                search_mode=search_mode
+            )
+            
+            return news_page_serializer.dump(result)
+            
+        except Exception as e:
+            logger.error(f"获取新闻列表失败: {str(e)}")
+            raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+
+    return await _cached_response(request, "list", cache_params, build)
+
+
+async def _load_news_by_cursor(
+    size: int,
+    cursor: str,
+    keyword: Optional[str],
+    creator_id: Optional[int],
+    sort_by: str,
+    sort_order: str,
+    count: Optional[str],
+    search_mode: str
+) -> bytes:
+    """游标分页获取新闻列表，返回序列化后的响应内容"""
+    if keyword and search_mode == "ranked":
+        raise BadRequestException("按相关度排序的搜索不支持游标分页")
+
+    cursor_data = None
+    if cursor:
+        try:
+            cursor_data = decode_cursor(cursor)
+        except ValueError as e:
+            raise BadRequestException(str(e))
+        if (
+            cursor_data.get("k") != sort_by
+            or cursor_data.get("o") != sort_order
+            or "v" not in cursor_data
+            or not isinstance(cursor_data.get("id"), int)
+        ):
+            raise BadRequestException("游标与排序参数不匹配")
+
     try:
-        result = await supabase_service.get_news_list(
-            page=params.page,
-            size=params.size,
+        result = await supabase_service.get_news_list_by_cursor(
+            size=size,
+            cursor=cursor_data,
             keyword=keyword,
             creator_id=creator_id,
             sort_by=sort_by,
-            sort_order=sort_order
-        )
-        
-        return PaginatedResponse.create(
-            items=[NewsResponse(**item) for item in result["items"]],
-            total=result["total"],
-            page=result["page"],
-            size=result["size"]
+            sort_order=sort_order,
+            count_method=count,
+            search_mode=search_mode
         )
-        
+        return news_cursor_page_serializer.dump(result)
     except Exception as e:
         logger.error(f"获取新闻列表失败: {str(e)}")
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
 
 
+def _encode_ndjson(rows: List[Dict[str, Any]]) -> bytes:
+    return b"".join(dumps(row) + b"\n" for row in rows)
+
+
+def _encode_csv(rows: List[Dict[str, Any]], header: bool = False) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=NEWS_EXPORT_FIELDS, extrasaction="ignore")
+    if header:
+        writer.writeheader()
+    writer.writerows(rows)
+    return buffer.getvalue().encode("utf-8")
+
+
+@router.get("/export")
+async def export_news(
+    keyword: Optional[str] = Query(None, description="搜索关键词"),
+    creator_id: Optional[int] = Query(None, description="创建者ID"),
+    format: str = Query("ndjson", regex="^(ndjson|csv)$", description="导出格式：ndjson/csv"),
+    search_mode: Optional[str] = Query(
+        None,
+        regex="^(ilike|fts)$",
+        description="搜索方式：ilike子串匹配，fts全文检索"
+    ),
+    current_user: dict = Depends(get_current_user)
+):
+    """导出新闻（NDJSON 或 CSV 流式响应）
+
+    按 id 顺序分批读取并边读边写，每批 NEWS_EXPORT_BATCH_SIZE 行，内存占用与导出总量无关。
+    筛选条件与列表接口相同；导出中途出错时响应被截断，错误记录在日志中。
+    """
+    # 按相关度排序对导出没有意义，ranked 配置下使用相同匹配规则的全文检索
+    search_mode = search_mode or ("fts" if settings.NEWS_SEARCH_MODE == "ranked" else settings.NEWS_SEARCH_MODE)
+    batches = supabase_service.iter_news_batches(
+        keyword=keyword,
+        creator_id=creator_id,
+        search_mode=search_mode,
+        batch_size=settings.NEWS_EXPORT_BATCH_SIZE
+    )
+
+    # 先读取第一批，查询失败时仍可以返回错误状态码
+    try:
+        first_batch = await anext(batches, [])
+    except Exception as e:
+        logger.error(f"导出新闻失败: {str(e)}")
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+
+    async def stream() -> AsyncIterator[bytes]:
+        if format == "csv":
+            yield _encode_csv(first_batch, header=True)
+        elif first_batch:
+            yield _encode_ndjson(first_batch)
+        try:
+            async for rows in batches:
+                yield _encode_csv(rows) if format == "csv" else _encode_ndjson(rows)
+        except Exception as e:
+            logger.error(f"导出新闻中断: {str(e)}")
+            raise
+
+    media_type = "text/csv; charset=utf-8" if format == "csv" else "application/x-ndjson"
+    logger.info(f"导出新闻 (用户: {current_user['username']}, 格式: {format})")
+    return StreamingResponse(
+        stream(),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="news.{format}"'}
+    )
+
+
 @router.get("/{news_id}", response_model=NewsResponse)
-async def get_news(news_id: int):
+async def get_news(request: Request, news_id: int):
     """根据ID获取新闻详情"""
-    try:
-        news = await supabase_service.get_news_by_id(news_id)
+    async def build():
+        try:
+            news = await supabase_service.get_news_by_id(news_id)
+        except Exception as e:
+            logger.error(f"获取新闻详情失败: {str(e)}")
+            raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+
         if not news:
             raise NotFoundException("新闻不存在")
-        
-        return NewsResponse(**news)
-    except Exception as e:
-        logger.error(f"获取新闻详情失败: {str(e)}")
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+        return news_serializer.dump(news)
+
+    return await _cached_response(request, "detail", {"id": news_id}, build)
 
 
 @router.put("/{news_id}", response_model=NewsResponse)
@@ -85,6 +480,7 @@ async def update_news(
     """更新新闻"""
     try:
         result = await supabase_service.update_news(news_id, news_update, current_user["id"])
+        await news_cache.invalidate()
         
         logger.info(f"新闻更新成功: {result['title']} (用户: {current_user['username']})")
         return NewsResponse(**result)
@@ -107,6 +503,7 @@ async def delete_news(
     """删除新闻"""
     try:
         await supabase_service.delete_news(news_id, current_user["id"])
+        await news_cache.invalidate()
         
         logger.info(f"新闻删除成功 (用户: {current_user['username']})")
         
@@ -127,8 +524,8 @@ async def get_user_news(
 ):
     """获取指定用户的新闻列表"""
     try:
-        # 检查用户是否存在
-        user = await supabase_service.get_user_by_id(user_id)
+        # 检查用户是否存在（结果留在请求级加载器中，列表的创建者信息不再重复查询）
+        user = await supabase_service.load_user(user_id)
         if not user:
             raise NotFoundException("用户不存在")
         
@@ -138,16 +535,15 @@ async def get_user_news(
             size=params.size,
             creator_id=user_id,
             sort_by="created_at",
-            sort_order="desc"
+            sort_order="desc",
+            count_method=settings.NEWS_COUNT_METHOD
         )
         
-        return PaginatedResponse.create(
-            items=[NewsResponse(**item) for item in result["items"]],
-            total=result["total"],
-            page=result["page"],
-            size=result["size"]
-        )
+        return FastJSONResponse(news_page_serializer.dump(result))
         
+    except HTTPException:
+        # 已经是带状态码的异常（如用户不存在的 404），原样抛出
+        raise
     except Exception as e:
         logger.error(f"获取用户新闻失败: {str(e)}")
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
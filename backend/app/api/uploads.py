@@ -0,0 +1,94 @@
+from fastapi import APIRouter, Depends, Query, Request, status
+from fastapi.responses import FileResponse, Response
+import logging
+import os
+from typing import Optional
+
+from ..api.users import get_current_user
+from ..core.config import settings
+from ..core.exceptions import (
+    BadRequestException,
+    NotFoundException,
+    PayloadTooLargeException,
+    UnprocessableEntityException,
+)
+from ..core.response_cache import _etag_matches
+from ..core.serialization import FastJSONResponse
+from ..services.upload_service import upload_service, CONTENT_TYPES
+from ..services.rendition_service import rendition_service
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+# 文件名就是内容哈希，内容永远不会变化，可以长期缓存
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+def build_upload_url(request: Request, key: str) -> str:
+    """上传文件的访问地址（可直接用作新闻的 image_url）"""
+    if settings.UPLOAD_BASE_URL:
+        return f"{settings.UPLOAD_BASE_URL.rstrip('/')}/{key}"
+    return str(request.url_for("get_upload", key=key))
+
+
+@router.post("", status_code=status.HTTP_201_CREATED)
+async def upload_image(
+    request: Request,
+    current_user: dict = Depends(get_current_user)
+):
+    """上传图片
+
+    请求体为 multipart/form-data，文件字段名为 file。
+    文件按内容去重：相同内容再次上传返回 200 和已有地址，新文件返回 201。
+    """
+    try:
+        upload_service.check_content_length(request.headers.get("content-length"))
+        result = await upload_service.save_multipart(
+            request.headers.get("content-type", ""),
+            request.stream(),
+        )
+    except PayloadTooLargeException as e:
+        logger.warning(f"图片上传失败: {e.detail} (用户: {current_user['username']})")
+        raise
+    except Exception as e:
+        logger.warning(f"图片上传失败: {str(e)} (用户: {current_user['username']})")
+        raise BadRequestException(str(e))
+
+    logger.info(f"图片上传成功: {result['key']} (用户: {current_user['username']})")
+    return FastJSONResponse(
+        {**result, "url": build_upload_url(request, result["key"])},
+        status_code=status.HTTP_200_OK if result["deduplicated"] else status.HTTP_201_CREATED,
+    )
+
+
+@router.get("/{key:path}", name="get_upload", response_class=FileResponse)
+async def get_upload(
+    key: str,
+    request: Request,
+    size: Optional[str] = Query(None, description="缩略图尺寸名称（如 thumb、card、full）"),
+    w: Optional[int] = Query(None, ge=1, le=10000, description="期望宽度（像素），向上取最近的尺寸档位"),
+):
+    """获取已上传的图片
+
+    不带参数时返回原图；带 size 或 w 时返回对应档位的缩略图（首次请求时生成并缓存）。
+    ETag 由内容哈希和档位组成，内容不变 ETag 就不变。
+    """
+    path = upload_service.path_for(key)
+    if path is None or not os.path.isfile(path):
+        raise NotFoundException("文件不存在")
+
+    etag = f'"{path.stem}"'
+    if size is not None or w is not None:
+        try:
+            width = rendition_service.resolve_width(size, w)
+            path, etag = await rendition_service.get_rendition(path, width)
+        except Exception as e:
+            if "不支持的图片尺寸" in str(e):
+                raise BadRequestException(str(e))
+            raise UnprocessableEntityException(str(e))
+
+    headers = {"ETag": etag, "Cache-Control": IMMUTABLE_CACHE_CONTROL}
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return FileResponse(path, media_type=CONTENT_TYPES[path.suffix], headers=headers)
@@ -1,72 +1,89 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from typing import List, Optional
 import logging
 
 from ..schemas.user import UserCreate, UserResponse, UserLogin, Token
-from ..core.security import get_password_hash, verify_password, create_access_token
+from ..core.security import (
+    TokenRevokedError,
+    create_access_token,
+    decode_access_token,
+    get_password_hash,
+    revoke_access_token,
+    verify_password,
+)
 from ..core.exceptions import (
     BadRequestException,
     NotFoundException,
     UnauthorizedException,
     ConflictException,
+    ServiceUnavailableException,
 )
 from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError, jwt
+from jose import JWTError
 from ..core.config import settings
-from ..services.supabase_service import supabase_service
+from ..core.pagination import CursorPaginatedResponse, decode_cursor
+from ..core.profiling import phase
+from ..core.serialization import BulkSerializer, FastJSONResponse
+from ..services.supabase_service import USER_PUBLIC_COLUMNS, supabase_service
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+users_page_serializer = BulkSerializer(CursorPaginatedResponse[UserResponse])
+
 # OAuth2密码流
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/users/login")
 
 async def get_current_user(
     token: str = Depends(oauth2_scheme)
 ) -> dict:
-    """获取当前登录用户"""
-    credentials_exception = UnauthorizedException("无法验证凭据")
+    """获取当前登录用户
+
+    令牌验证结果按令牌缓存至过期，已登出的令牌通过撤销列表拒绝，均不访问数据库。
+    """
+    # 认证耗时计入请求分析的 auth 阶段（未启用分析器时不记录）
+    with phase("auth"):
+        credentials_exception = UnauthorizedException("无法验证凭据")
     
-    try:
-        payload = jwt.decode(
-            token,
-            settings.SECRET_KEY,
-            algorithms=[settings.ALGORITHM]
-        )
-        user_id: str = payload.get("sub")
-        if user_id is None:
+        try:
+            payload = decode_access_token(token)
+            user_id: str = payload.get("sub")
+            if user_id is None:
+                raise credentials_exception
+        except TokenRevokedError:
+            raise UnauthorizedException("令牌已失效，请重新登录")
+        except JWTError:
             raise credentials_exception
-    except JWTError:
-        raise credentials_exception
     
-    user = await supabase_service.get_user_by_id(int(user_id))
-    if user is None:
-        raise credentials_exception
-    
-    return user
+        user = await supabase_service.get_cached_user(int(user_id))
+        if user is None:
+            raise credentials_exception
+
+        # 当前用户创建或修改的新闻以其为创建者，放入请求级加载器后无需再次查询
+        supabase_service.user_loader().prime(user)
+        return user
 
 
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
 async def register_user(user: UserCreate):
     """用户注册"""
     try:
-        # 创建新用户（supabase_service.create_user会检查用户名和邮箱重复）
+        # 创建新用户（用户名和邮箱重复由数据库唯一约束检查）
         db_user = await supabase_service.create_user(user)
         
         logger.info(f"用户注册成功: {user.username}")
         return db_user
         
+    except ConflictException as e:
+        logger.warning(f"用户注册失败: {e.detail}")
+        raise
+    except ServiceUnavailableException:
+        raise
     except Exception as e:
         error_msg = str(e)
         logger.error(f"用户注册失败: {error_msg}")
-        
-        if "邮箱已被注册" in error_msg:
-            raise ConflictException("邮箱已被注册")
-        elif "用户名已存在" in error_msg:
-            raise ConflictException("用户名已存在")
-        else:
-            raise BadRequestException(f"注册失败: {error_msg}")
+        raise BadRequestException(f"注册失败: {error_msg}")
 
 
 @router.post("/login", response_model=Token)
@@ -114,28 +131,77 @@ async def get_user(user_id: int):
     return user
 
 
-@router.get("", response_model=List[UserResponse])
+def _parse_user_ids(ids: str) -> List[int]:
+    """解析逗号分隔的用户ID（去重并保留顺序）"""
+    user_ids = []
+    for value in ids.split(","):
+        value = value.strip()
+        if not value:
+            continue
+        try:
+            user_id = int(value)
+        except ValueError:
+            raise BadRequestException(f"无效的用户ID: {value}")
+        if user_id not in user_ids:
+            user_ids.append(user_id)
+    if not user_ids:
+        raise BadRequestException("ids 不能为空")
+    if len(user_ids) > settings.USERS_MULTI_GET_MAX_IDS:
+        raise BadRequestException(f"单次最多获取{settings.USERS_MULTI_GET_MAX_IDS}个用户")
+    return user_ids
+
+
+@router.get("", response_model=CursorPaginatedResponse[UserResponse])
 async def get_users(
-    skip: int = 0,
-    limit: int = 100
+    size: int = Query(20, ge=1, le=100, description="每页条数"),
+    cursor: Optional[str] = Query(None, description="游标分页：首页不传，之后传上一页返回的next_cursor"),
+    ids: Optional[str] = Query(None, description="按ID批量获取（逗号分隔，如 1,2,3），指定时忽略分页参数"),
+    current_user: dict = Depends(get_current_user)
 ):
-    """获取用户列表"""
-    # 注意：这里需要在supabase_service中实现get_users方法
-    # 暂时返回空列表，需要后续实现
-    return []
+    """获取用户列表（需要登录）
+
+    按 id 升序游标分页；传入 ids 时在一次查询中批量获取，按传入顺序返回，不存在的ID被忽略。
+    只返回公开信息，不包含密码哈希。
+    """
+    if ids is not None:
+        user_ids = _parse_user_ids(ids)
+        try:
+            users = await supabase_service.get_users_by_ids(user_ids, columns=USER_PUBLIC_COLUMNS)
+        except Exception as e:
+            raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+        items = [users[user_id] for user_id in user_ids if user_id in users]
+        result = {"items": items, "size": len(items), "next_cursor": None, "has_more": False, "total": len(items)}
+        return FastJSONResponse(users_page_serializer.dump(result))
+
+    after_id = None
+    if cursor:
+        try:
+            after_id = decode_cursor(cursor).get("id")
+        except ValueError as e:
+            raise BadRequestException(str(e))
+        if not isinstance(after_id, int):
+            raise BadRequestException("无效的游标")
+
+    try:
+        result = await supabase_service.get_users(size=size, after_id=after_id)
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+    return FastJSONResponse(users_page_serializer.dump(result))
 
 
 @router.post("/logout", status_code=status.HTTP_200_OK)
-async def logout_user(current_user: dict = Depends(get_current_user)):
+async def logout_user(
+    token: str = Depends(oauth2_scheme),
+    current_user: dict = Depends(get_current_user)
+):
     """用户登出
-    
-    在JWT机制下，服务器端无法直接使token失效。
-    此接口主要用于告知客户端登出成功，客户端应删除本地存储的token。
-    未来可扩展支持token黑名单机制。
+
+    将当前令牌加入撤销列表，令牌在过期前不能再使用；客户端仍应删除本地存储的token。
     """
+    revoke_access_token(token)
     logger.info(f"用户登出成功: {current_user['username']}")
     return {
         "message": "登出成功",
-        "detail": "请客户端删除本地存储的token"
+        "detail": "令牌已失效，请客户端删除本地存储的token"
     }
 
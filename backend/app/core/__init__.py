@@ -4,6 +4,8 @@ from .security import (
     create_access_token,
     verify_password,
     get_password_hash,
+    verify_password_async,
+    get_password_hash_async,
     verify_token,
     decode_token,
 )
@@ -14,16 +16,29 @@ from .exceptions import (
     ForbiddenException,
     NotFoundException,
     ConflictException,
+    PayloadTooLargeException,
     UnprocessableEntityException,
     InternalServerErrorException,
+    ServiceUnavailableException,
 )
-from .pagination import PaginationParams, PaginatedResponse, PaginationHelper
+from .pagination import (
+    PaginationParams,
+    PaginatedResponse,
+    CursorPaginatedResponse,
+    PaginationHelper,
+    encode_cursor,
+    decode_cursor,
+)
+from .cache import TTLCache
+from .serialization import FastJSONResponse, BulkSerializer
 
 __all__ = [
     "settings",
     "create_access_token",
     "verify_password",
     "get_password_hash",
+    "verify_password_async",
+    "get_password_hash_async",
     "verify_token",
     "decode_token",
     "FeedMusicException",
@@ -32,9 +47,17 @@ __all__ = [
     "ForbiddenException",
     "NotFoundException",
     "ConflictException",
+    "PayloadTooLargeException",
     "UnprocessableEntityException",
     "InternalServerErrorException",
+    "ServiceUnavailableException",
     "PaginationParams",
     "PaginatedResponse",
+    "CursorPaginatedResponse",
     "PaginationHelper",
+    "encode_cursor",
+    "decode_cursor",
+    "TTLCache",
+    "FastJSONResponse",
+    "BulkSerializer",
 ]
\ No newline at end of file
@@ -0,0 +1,110 @@
+import os
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import aiofiles.os
+
+
+class DiskLRUCache:
+    """容量受限的磁盘 LRU 缓存
+
+    文件保存在 directory 下，内存中只维护 文件名 -> 字节数 的访问顺序索引；
+    总大小超过 max_bytes 时删除最久未使用的文件。
+    索引在首次使用时按文件修改时间从目录重建，重启后已生成的文件仍然可以命中。
+    """
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        self._total_bytes = 0
+        self._loaded = False
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def load(self) -> None:
+        """扫描缓存目录重建索引（同步，应在线程池中调用），清理残留的临时文件"""
+        if self._loaded:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        files = []
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if not entry.is_file():
+                    continue
+                if entry.name.endswith(".tmp"):
+                    os.unlink(entry.path)
+                    continue
+                stat = entry.stat()
+                files.append((stat.st_mtime, entry.name, stat.st_size))
+        for _, name, size in sorted(files):
+            self._entries[name] = size
+            self._total_bytes += size
+        self._loaded = True
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    def path(self, name: str) -> Path:
+        """缓存条目的文件路径（不检查是否存在）"""
+        return self.directory / name
+
+    def temp_path(self, name: str) -> Path:
+        """写入缓存条目时使用的临时文件路径，写完后通过 add() 登记"""
+        return self.directory / f"{name}.{os.getpid()}.tmp"
+
+    def get(self, name: str) -> Optional[Path]:
+        """命中时返回文件路径并标记为最近使用，未命中返回 None"""
+        size = self._entries.get(name)
+        if size is not None:
+            path = self.directory / name
+            if path.is_file():
+                self._entries.move_to_end(name)
+                self.hits += 1
+                return path
+            # 文件被外部删除
+            del self._entries[name]
+            self._total_bytes -= size
+        self.misses += 1
+        return None
+
+    async def add(self, name: str, temp_path: Path) -> Path:
+        """把已写好的临时文件登记为缓存条目，必要时淘汰旧条目"""
+        path = self.directory / name
+        size = (await aiofiles.os.stat(temp_path)).st_size
+        await aiofiles.os.replace(temp_path, path)
+        self._total_bytes += size - self._entries.pop(name, 0)
+        self._entries[name] = size
+        await self._evict(keep=name)
+        return path
+
+    async def _evict(self, keep: str) -> None:
+        while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+            name, size = next(iter(self._entries.items()))
+            if name == keep:
+                break
+            del self._entries[name]
+            self._total_bytes -= size
+            self.evictions += 1
+            try:
+                await aiofiles.os.remove(self.directory / name)
+            except FileNotFoundError:
+                pass
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "bytes": self._total_bytes,
+            "max_bytes": self.max_bytes,
+            "evictions": self.evictions,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / total if total else 0.0,
+        }
@@ -53,6 +53,12 @@ class ValidationException(FeedMusicException):
         super().__init__(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=detail)
 
 
+class PayloadTooLargeException(FeedMusicException):
+    """413 Payload Too Large"""
+    def __init__(self, detail: str = "Payload too large") -> None:
+        super().__init__(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=detail)
+
+
 class UnprocessableEntityException(FeedMusicException):
     """422 Unprocessable Entity - 别名"""
     def __init__(self, detail: str = "Unprocessable entity") -> None:
@@ -65,6 +71,12 @@ class InternalServerErrorException(FeedMusicException):
         super().__init__(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=detail)
 
 
+class ServiceUnavailableException(FeedMusicException):
+    """503 Service Unavailable"""
+    def __init__(self, detail: str = "Service unavailable") -> None:
+        super().__init__(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=detail)
+
+
 class DatabaseException(FeedMusicException):
     """数据库异常"""
     def __init__(self, detail: str = "Database error") -> None:
@@ -0,0 +1,533 @@
+import asyncio
+import json
+import operator
+import re
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import httpx
+
+from app.core.search_index import NewsSearchIndex, tokenize
+from app.core.serialization import dumps
+
+# 表结构：列、唯一约束、外键（用于嵌入查询）和全文检索列（对应 search_vector 生成列）
+TABLES: Dict[str, Dict[str, Any]] = {
+    "users": {
+        "columns": ("id", "username", "email", "password", "created_at"),
+        "unique": ("username", "email"),
+    },
+    "news": {
+        "columns": ("id", "title", "description", "image_url", "creator_id", "created_at", "updated_at"),
+        "foreign_keys": {"creator_id": "users"},
+        "search_vectors": {"search_vector": ("title", "description")},
+    },
+}
+
+# 不属于过滤条件的查询参数
+RESERVED_PARAMS = {"select", "order", "limit", "offset", "columns", "on_conflict"}
+
+# 插入时未提供则自动填充当前时间的列（对应数据库的 server_default=now()）
+TIMESTAMP_COLUMNS = ("created_at", "updated_at")
+
+COMPARISONS = {
+    "eq": operator.eq,
+    "neq": operator.ne,
+    "gt": operator.gt,
+    "gte": operator.ge,
+    "lt": operator.lt,
+    "lte": operator.le,
+}
+
+FULL_TEXT_OPERATORS = ("fts", "plfts", "phfts", "wfts")
+
+Row = Dict[str, Any]
+Predicate = Callable[[Row], bool]
+
+
+class PostgRESTError(Exception):
+    """与 PostgREST 错误响应格式一致的异常，客户端会将其解析为 APIError"""
+
+    def __init__(self, status: int, code: str, message: str, details: Optional[str] = None, hint: Optional[str] = None):
+        super().__init__(message)
+        self.status = status
+        self.code = code
+        self.message = message
+        self.details = details
+        self.hint = hint
+
+    def to_json(self) -> Dict[str, Any]:
+        return {"code": self.code, "message": self.message, "details": self.details, "hint": self.hint}
+
+
+def split_top_level(text: str) -> List[str]:
+    """按顶层逗号切分（忽略括号和双引号内的逗号）"""
+    parts, depth, quoted, current = [], 0, False, []
+    i = 0
+    while i < len(text):
+        char = text[i]
+        if char == "\\" and quoted:
+            current.append(text[i:i + 2])
+            i += 2
+            continue
+        if char == '"':
+            quoted = not quoted
+        elif not quoted and char == "(":
+            depth += 1
+        elif not quoted and char == ")":
+            depth -= 1
+        elif not quoted and depth == 0 and char == ",":
+            parts.append("".join(current))
+            current = []
+            i += 1
+            continue
+        current.append(char)
+        i += 1
+    if current:
+        parts.append("".join(current))
+    return parts
+
+
+def unquote(value: str) -> str:
+    """去掉过滤值两侧的双引号并还原转义字符"""
+    if len(value) >= 2 and value[0] == value[-1] == '"':
+        return value[1:-1].replace('\\"', '"').replace("\\\\", "\\")
+    return value
+
+
+class MemoryTable:
+    """内存中的一张表：按插入顺序保存记录，并维护主键索引"""
+
+    def __init__(self, name: str, columns: Iterable[str], unique: Iterable[str] = (),
+                 foreign_keys: Optional[Dict[str, str]] = None,
+                 search_vectors: Optional[Dict[str, Tuple[str, ...]]] = None):
+        self.name = name
+        self.columns = tuple(columns)
+        self.unique = tuple(unique)
+        self.foreign_keys = foreign_keys or {}
+        self.search_vectors = search_vectors or {}
+        self.rows: List[Row] = []
+        self.by_id: Dict[Any, Row] = {}
+        self._next_id = 1
+
+    def check_columns(self, columns: Iterable[str]) -> None:
+        for column in columns:
+            if column not in self.columns and column not in self.search_vectors:
+                raise PostgRESTError(400, "42703", f"column {self.name}.{column} does not exist")
+
+    def new_row(self, data: Row) -> Row:
+        """补全自增 id、时间戳和缺省列"""
+        unknown = [column for column in data if column not in self.columns]
+        if unknown:
+            raise PostgRESTError(
+                400, "PGRST204",
+                f"Could not find the '{unknown[0]}' column of '{self.name}' in the schema cache",
+            )
+        row = {column: data.get(column) for column in self.columns}
+        now = datetime.utcnow().isoformat()
+        for column in TIMESTAMP_COLUMNS:
+            if column in self.columns and row.get(column) is None:
+                row[column] = now
+        return row
+
+    def check_unique(self, row: Row, ignore: Optional[Row] = None) -> None:
+        """检查主键和唯一约束（ignore 为正在更新的原记录）"""
+        existing = self.by_id.get(row.get("id"))
+        if existing is not None and existing is not ignore:
+            self._raise_conflict("pkey", "id", row["id"])
+        for column in self.unique:
+            value = row.get(column)
+            if value is None:
+                continue
+            for other in self.rows:
+                if other is not ignore and other.get(column) == value:
+                    self._raise_conflict(f"{column}_key", column, value)
+
+    def _raise_conflict(self, constraint: str, column: str, value: Any) -> None:
+        raise PostgRESTError(
+            409, "23505",
+            f'duplicate key value violates unique constraint "{self.name}_{constraint}"',
+            details=f"Key ({column})=({value}) already exists.",
+        )
+
+    def insert(self, row: Row) -> Row:
+        if row.get("id") is None:
+            row["id"] = self._next_id
+        self.check_unique(row)
+        self.rows.append(row)
+        self.by_id[row["id"]] = row
+        if isinstance(row["id"], int):
+            self._next_id = max(self._next_id, row["id"] + 1)
+        return row
+
+    def update(self, row: Row, changes: Row) -> Row:
+        updated = {**row, **changes}
+        self.check_unique(updated, ignore=row)
+        if updated["id"] != row["id"]:
+            del self.by_id[row["id"]]
+        row.update(changes)
+        self.by_id[row["id"]] = row
+        return row
+
+    def delete(self, rows: List[Row]) -> None:
+        removed = {id(row) for row in rows}
+        self.rows = [row for row in self.rows if id(row) not in removed]
+        for row in rows:
+            self.by_id.pop(row["id"], None)
+
+
+class InMemoryPostgREST:
+    """进程内的 PostgREST 替身
+
+    实现 SupabaseService 用到的 PostgREST 子集，请求与响应格式与真实服务一致，
+    因此服务层代码无需任何修改即可在没有 Supabase 的环境中运行：
+    - 列投影与多对一嵌入（如 select=*,creator:users(id,username)）
+    - eq/neq/gt/gte/lt/lte/in/like/ilike/is 过滤（支持 not. 前缀）、or/and 组合条件、
+      search_vector 全文检索（fts/plfts/phfts/wfts）
+    - 多列排序、offset/limit、Prefer: count=... 与 Content-Range 总数、HEAD 请求
+    - 单行/多行插入、upsert、条件更新与删除，Prefer: return=representation|minimal
+    - 唯一约束冲突（23505）、未知列（42703）、偏移量超出总数（PGRST103）等错误码
+    - rpc/search_news 按相关度排序的全文检索
+    """
+
+    def __init__(self, tables: Optional[Dict[str, Dict[str, Any]]] = None):
+        self.tables: Dict[str, MemoryTable] = {
+            name: MemoryTable(name, **schema) for name, schema in (tables or TABLES).items()
+        }
+        # 函数名 -> (实现, 参数名)
+        self.functions: Dict[str, Tuple[Callable[..., Tuple[MemoryTable, List[Row]]], Tuple[str, ...]]] = {
+            "search_news": (self._search_news, ("search_query",)),
+        }
+
+    def load(self, data: Dict[str, List[Row]]) -> None:
+        """导入初始数据（保留数据中的 id）"""
+        for name, rows in data.items():
+            table = self.table(name)
+            for row in rows:
+                table.insert(table.new_row(row))
+
+    def table(self, name: str) -> MemoryTable:
+        table = self.tables.get(name)
+        if table is None:
+            raise PostgRESTError(404, "42P01", f'relation "public.{name}" does not exist')
+        return table
+
+    # 请求处理
+
+    def handle(self, method: str, path: str, params: List[Tuple[str, str]],
+               headers: Dict[str, str], body: bytes) -> Tuple[int, Dict[str, str], bytes]:
+        """处理一个 PostgREST 请求，返回 (状态码, 响应头, 响应体)"""
+        try:
+            return self._handle(method, path, params, headers, body)
+        except PostgRESTError as e:
+            return e.status, {"Content-Type": "application/json"}, dumps(e.to_json())
+
+    def _handle(self, method, path, params, headers, body):
+        _, _, resource = path.partition("/rest/v1/")
+        resource = resource.strip("/")
+        prefer = headers.get("prefer", "")
+        query = dict(params)
+
+        if resource.startswith("rpc/"):
+            return self._call_function(method, resource[len("rpc/"):], params, prefer, body)
+
+        table = self.table(resource)
+        if method in ("GET", "HEAD"):
+            rows = self._filter(table, table.rows, params)
+            return self._read(table, rows, query, prefer, head=method == "HEAD")
+        if method == "POST":
+            return self._insert(table, query, prefer, self._json(body))
+        if method == "PATCH":
+            changes = self._json(body)
+            if not isinstance(changes, dict):
+                raise PostgRESTError(400, "PGRST102", "Empty or invalid json")
+            table.check_columns(changes)
+            rows = [table.update(row, changes) for row in self._filter(table, table.rows, params)]
+            return self._written(table, rows, query, prefer, status=200)
+        if method == "DELETE":
+            rows = self._filter(table, table.rows, params)
+            table.delete(rows)
+            return self._written(table, rows, query, prefer, status=200)
+        raise PostgRESTError(405, "PGRST117", f"Unsupported HTTP method: {method}")
+
+    @staticmethod
+    def _json(body: bytes) -> Any:
+        try:
+            return json.loads(body or b"null")
+        except ValueError:
+            raise PostgRESTError(400, "PGRST102", "Empty or invalid json")
+
+    def _read(self, table: MemoryTable, rows: List[Row], query: Dict[str, str], prefer: str, head: bool = False):
+        rows = self._order(table, rows, query.get("order"))
+        total = len(rows)
+        offset = int(query.get("offset", 0))
+        limit = int(query["limit"]) if "limit" in query else None
+        counted = "count=" in prefer
+
+        if counted and offset > 0 and offset >= total:
+            raise PostgRESTError(
+                416, "PGRST103", "Requested range not satisfiable",
+                details=f"An offset of {offset} was requested, but there are only {total} rows.",
+            )
+
+        page = rows[offset:offset + limit if limit is not None else None]
+        range_text = f"{offset}-{offset + len(page) - 1}" if page else "*"
+        response_headers = {
+            "Content-Type": "application/json",
+            "Content-Range": f"{range_text}/{total if counted else '*'}",
+        }
+        content = b"" if head else dumps(self._project(table, page, query.get("select", "*")))
+        return 200, response_headers, content
+
+    def _insert(self, table: MemoryTable, query: Dict[str, str], prefer: str, payload: Any):
+        items = payload if isinstance(payload, list) else [payload]
+        if not all(isinstance(item, dict) for item in items):
+            raise PostgRESTError(400, "PGRST102", "Empty or invalid json")
+        if "columns" in query:
+            columns = [column.strip().strip('"') for column in query["columns"].split(",")]
+            items = [{column: item.get(column) for column in columns} for item in items]
+
+        resolution = re.search(r"resolution=(merge|ignore)-duplicates", prefer)
+        conflict_columns = [c.strip() for c in query.get("on_conflict", "id").split(",")]
+
+        # 整条 INSERT 是一个事务：任何一条记录失败时撤销已插入的记录
+        written, inserted = [], []
+        try:
+            for item in items:
+                row = table.new_row(item)
+                existing = None
+                if resolution:
+                    existing = next(
+                        (other for other in table.rows
+                         if all(other.get(c) == row.get(c) and row.get(c) is not None for c in conflict_columns)),
+                        None,
+                    )
+                if existing is None:
+                    inserted.append(table.insert(row))
+                    written.append(row)
+                elif resolution.group(1) == "merge":
+                    written.append(table.update(existing, {k: row[k] for k in item}))
+        except PostgRESTError:
+            table.delete(inserted)
+            raise
+        return self._written(table, written, query, prefer, status=201)
+
+    def _written(self, table: MemoryTable, rows: List[Row], query: Dict[str, str], prefer: str, status: int):
+        if "return=representation" not in prefer:
+            return (201 if status == 201 else 204), {}, b""
+        content = dumps(self._project(table, rows, query.get("select", "*")))
+        return status, {"Content-Type": "application/json"}, content
+
+    def _call_function(self, method: str, name: str, params, prefer: str, body: bytes):
+        if name not in self.functions:
+            raise PostgRESTError(
+                404, "PGRST202", f"Could not find the function public.{name} in the schema cache"
+            )
+        function, argument_names = self.functions[name]
+        if method in ("GET", "HEAD"):
+            # GET 调用时，与函数参数同名的查询参数是实参，其余为过滤条件
+            arguments = {key: value for key, value in params if key in argument_names}
+            params = [(key, value) for key, value in params if key not in argument_names]
+        else:
+            arguments = self._json(body) or {}
+        table, rows = function(**arguments)
+        rows = self._filter(table, rows, params)
+        return self._read(table, rows, dict(params), prefer, head=method == "HEAD")
+
+    def _search_news(self, search_query: str = "") -> Tuple[MemoryTable, List[Row]]:
+        """search_news(search_query)：所有关键词都命中的新闻，按相关度降序"""
+        table = self.table("news")
+        index = NewsSearchIndex()
+        index.rebuild(table.rows)
+        return table, [table.by_id[doc["id"]] for doc, _ in index.search(search_query)]
+
+    # 过滤
+
+    def _filter(self, table: MemoryTable, rows: List[Row], params) -> List[Row]:
+        predicates = []
+        for key, value in params:
+            if key in RESERVED_PARAMS:
+                continue
+            if key in ("or", "and"):
+                predicates.append(self._compile_logic(table, key, value))
+                continue
+            # 主键等值查询直接使用索引
+            if key == "id" and value.startswith("eq.") and rows is table.rows:
+                row = table.by_id.get(self._coerce(value[3:]))
+                rows = [row] if row is not None else []
+                continue
+            predicates.append(self._compile_operator(table, key, value))
+        for predicate in predicates:
+            rows = [row for row in rows if predicate(row)]
+        return list(rows)
+
+    @staticmethod
+    def _coerce(value: str) -> Any:
+        return int(value) if value.lstrip("-").isdigit() else value
+
+    def _compile_logic(self, table: MemoryTable, logic: str, group: str) -> Predicate:
+        group = group.strip()
+        if not (group.startswith("(") and group.endswith(")")):
+            raise PostgRESTError(400, "PGRST100", f'"failed to parse logic tree ({group})"')
+        predicates = [self._compile_condition(table, c) for c in split_top_level(group[1:-1])]
+        if logic == "or":
+            return lambda row: any([predicate(row) for predicate in predicates])
+        return lambda row: all([predicate(row) for predicate in predicates])
+
+    def _compile_condition(self, table: MemoryTable, condition: str) -> Predicate:
+        """编译 or/and 中的单个条件：column.op.value 或嵌套的 or(...)/and(...)"""
+        for logic in ("or", "and"):
+            if condition.startswith(logic + "("):
+                return self._compile_logic(table, logic, condition[len(logic):])
+        column, _, expression = condition.partition(".")
+        return self._compile_operator(table, column, expression)
+
+    def _compile_operator(self, table: MemoryTable, column: str, expression: str) -> Predicate:
+        """把 column=op.value 编译为判断单行记录的函数"""
+        table.check_columns([column])
+        op, _, raw = expression.partition(".")
+        if op == "not":
+            inner = self._compile_operator(table, column, raw)
+            return lambda row: not inner(row)
+
+        if column in table.search_vectors:
+            return self._compile_full_text(table.search_vectors[column], op, raw)
+
+        if op == "in":
+            values = {unquote(v) for v in split_top_level(raw.strip("()"))}
+            test = lambda actual: actual is not None and str(actual) in values
+        elif op == "is":
+            expected = {"null": None, "true": True, "false": False}.get(raw, raw)
+            test = lambda actual: actual is expected
+        elif op in ("like", "ilike"):
+            pattern = re.compile(
+                re.escape(unquote(raw)).replace("%", ".*").replace("\\*", ".*"),
+                (re.IGNORECASE if op == "ilike" else 0) | re.DOTALL,
+            )
+            test = lambda actual: actual is not None and pattern.fullmatch(str(actual)) is not None
+        elif op in COMPARISONS:
+            # 整数列按数值比较，其余按字符串比较（ISO 时间字符串可直接比较大小）
+            value, compare = unquote(raw), COMPARISONS[op]
+            number = int(value) if value.lstrip("-").isdigit() else None
+
+            def test(actual):
+                if actual is None:
+                    return False
+                if number is not None and type(actual) is int:
+                    return compare(actual, number)
+                if isinstance(actual, bool):
+                    return compare(str(actual).lower(), value)
+                return compare(str(actual), value)
+        else:
+            raise PostgRESTError(400, "PGRST100", f'"failed to parse filter ({op}.{raw})"')
+
+        return lambda row: test(row.get(column))
+
+    @staticmethod
+    def _compile_full_text(source_columns: Tuple[str, ...], op: str, raw: str) -> Predicate:
+        """全文检索：查询词全部出现在来源列中即匹配（分词方式与进程内倒排索引一致）"""
+        if op.split("(")[0] not in FULL_TEXT_OPERATORS:
+            raise PostgRESTError(400, "PGRST100", f'"failed to parse filter ({op}.{raw})"')
+        terms = set(tokenize(unquote(raw)))
+
+        def test(row: Row) -> bool:
+            if not terms:
+                return False
+            tokens = set()
+            for column in source_columns:
+                tokens.update(tokenize(row.get(column)))
+            return terms <= tokens
+        return test
+
+    # 排序与投影
+
+    def _order(self, table: MemoryTable, rows: List[Row], order: Optional[str]) -> List[Row]:
+        """多列排序，默认空值规则与 PostgreSQL 一致（升序在后、降序在前）"""
+        if not order:
+            return rows
+        rows = list(rows)
+        for term in reversed(split_top_level(order)):
+            column, *modifiers = term.split(".")
+            table.check_columns([column])
+            descending = "desc" in modifiers
+            nulls_first = "nullsfirst" in modifiers or (descending and "nullslast" not in modifiers)
+            present = [row for row in rows if row.get(column) is not None]
+            missing = [row for row in rows if row.get(column) is None]
+            present.sort(key=lambda row: row[column], reverse=descending)
+            rows = missing + present if nulls_first else present + missing
+        return rows
+
+    def _parse_select(self, select: str) -> List[Tuple[str, str, Any]]:
+        """解析 select 参数为 (输出名, 列名或关联表, 子字段) 列表，子字段为 None 表示普通列"""
+        fields = []
+        for item in split_top_level(select.replace(" ", "")):
+            if not item:
+                continue
+            alias, _, target = item.rpartition(":")
+            if "(" in target:
+                name, _, inner = target.partition("(")
+                fields.append((alias or name.split("!")[0], name, inner[:-1] or "*"))
+            else:
+                fields.append((alias or target.split("::")[0], target.split("::")[0], None))
+        return fields
+
+    def _project(self, table: MemoryTable, rows: List[Row], select: str) -> List[Row]:
+        fields = self._parse_select(select)
+        table.check_columns(column for _, column, inner in fields if inner is None and column != "*")
+        embeds = {name: self._relationship(table, target) for name, target, inner in fields if inner is not None}
+
+        projected = []
+        for row in rows:
+            item = {}
+            for name, column, inner in fields:
+                if inner is None:
+                    if column == "*":
+                        item.update(row)
+                    else:
+                        item[name] = row.get(column)
+                    continue
+                foreign_key, related_table = embeds[name]
+                related = related_table.by_id.get(row.get(foreign_key))
+                item[name] = self._project(related_table, [related], inner)[0] if related else None
+            projected.append(item)
+        return projected
+
+    def _relationship(self, table: MemoryTable, target: str) -> Tuple[str, MemoryTable]:
+        """多对一嵌入：根据外键（可用 table!column 指定）找到关联表"""
+        name, _, hint = target.partition("!")
+        for column, related in table.foreign_keys.items():
+            if related == name and hint in ("", column):
+                return column, self.table(related)
+        raise PostgRESTError(
+            400, "PGRST200",
+            f"Could not find a relationship between '{table.name}' and '{name}' in the schema cache",
+        )
+
+
+class InMemoryPostgRESTTransport(httpx.AsyncBaseTransport):
+    """把 PostgREST 请求交给进程内替身处理的 httpx 传输层
+
+    latency_ms 为每次请求注入的固定延迟，用于模拟网络与数据库耗时。
+    """
+
+    def __init__(self, database: Optional[InMemoryPostgREST] = None, latency_ms: float = 0.0):
+        self.database = database or InMemoryPostgREST()
+        self.latency_ms = latency_ms
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        body = await request.aread()
+        if self.latency_ms:
+            await asyncio.sleep(self.latency_ms / 1000)
+        status, headers, content = self.database.handle(
+            request.method,
+            request.url.path,
+            request.url.params.multi_items(),
+            {key.lower(): value for key, value in request.headers.items()},
+            body,
+        )
+        return httpx.Response(status, headers=headers, content=content, request=request)
+
+
+def load_seed_file(path: str) -> Dict[str, List[Row]]:
+    """读取初始数据文件（JSON：{"users": [...], "news": [...]}）"""
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
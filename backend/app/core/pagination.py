@@ -1,7 +1,11 @@
-from typing import Generic, TypeVar, List, Optional, Union
+from typing import TYPE_CHECKING, Any, Dict, Generic, TypeVar, List, Optional, Union
+import base64
+import json
 from pydantic import BaseModel, Field
-from sqlalchemy.orm import Query
-from sqlalchemy import func
+
+if TYPE_CHECKING:
+    # SQLAlchemy 只在类型注解中使用，避免在请求路径上导入
+    from sqlalchemy.orm import Query
 
 
 T = TypeVar('T')
@@ -57,12 +61,43 @@ class PaginatedResponse(BaseModel, Generic[T]):
         )
 
 
+class CursorPaginatedResponse(BaseModel, Generic[T]):
+    """游标分页响应模型"""
+    items: List[T] = Field(description="数据列表")
+    size: int = Field(description="每页条数")
+    next_cursor: Optional[str] = Field(None, description="下一页游标，为空表示没有更多数据")
+    has_more: bool = Field(description="是否还有更多数据")
+    total: Optional[int] = Field(None, description="总条数（仅在请求统计时返回）")
+
+
+def encode_cursor(payload: Dict[str, Any]) -> str:
+    """将游标内容编码为不透明字符串"""
+    raw = json.dumps(payload, separators=(",", ":"), ensure_ascii=False)
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    """解码游标字符串
+
+    Raises:
+        ValueError: 游标格式无效
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except Exception:
+        raise ValueError("无效的游标")
+    if not isinstance(payload, dict):
+        raise ValueError("无效的游标")
+    return payload
+
+
 class PaginationHelper:
     """分页工具类"""
     
     @staticmethod
     def paginate_query(
-        query: Query,
+        query: "Query",
         params: PaginationParams
     ) -> tuple[List, int]:
         """对查询进行分页
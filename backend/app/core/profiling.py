@@ -0,0 +1,207 @@
+import asyncio
+import os
+import sys
+import threading
+import time
+from collections import Counter as StackCounter, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Deque, Dict, List, Optional, Tuple
+
+from app.core.metrics import Histogram, registry
+
+# 事件循环延迟分桶（秒）
+LOOP_LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+event_loop_lag = registry.register(Histogram(
+    "event_loop_lag_seconds",
+    "Event loop scheduling lag sampled by the profiler",
+    buckets=LOOP_LAG_BUCKETS,
+))
+
+
+class RequestProfile:
+    """单个请求的分阶段耗时（auth/postgrest/serialize 等，阶段之间可能重叠）"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases: Dict[str, float] = {}
+        self.calls: Dict[str, int] = {}
+
+    def add(self, name: str, seconds: float) -> None:
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+        self.calls[name] = self.calls.get(name, 0) + 1
+
+    def breakdown(self) -> Dict[str, Dict[str, float]]:
+        """各阶段的耗时（毫秒）和次数"""
+        return {
+            name: {"ms": round(seconds * 1000, 2), "calls": self.calls[name]}
+            for name, seconds in self.phases.items()
+        }
+
+
+_current_profile: ContextVar[Optional[RequestProfile]] = ContextVar("request_profile", default=None)
+
+
+def start_request_profile() -> Tuple[RequestProfile, object]:
+    """为当前请求开始记录分阶段耗时，返回 (profile, token)"""
+    profile = RequestProfile()
+    return profile, _current_profile.set(profile)
+
+
+def end_request_profile(token) -> None:
+    _current_profile.reset(token)
+
+
+def record_phase(name: str, seconds: float) -> None:
+    """把一段耗时计入当前请求（未启用分析器时不做任何事）"""
+    profile = _current_profile.get()
+    if profile is not None:
+        profile.add(name, seconds)
+
+
+@contextmanager
+def phase(name: str):
+    """记录代码块耗时到当前请求的指定阶段"""
+    if _current_profile.get() is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_phase(name, time.perf_counter() - started)
+
+
+class LoopLagMonitor:
+    """事件循环延迟监测
+
+    后台任务每隔 interval 秒休眠一次，实际唤醒时间与预期之差即为事件循环被阻塞的时长；
+    最近的采样保留在内存中，用于计算某个请求期间的最大延迟。
+    """
+
+    def __init__(self, interval: float = 0.1, history: int = 1200):
+        self.interval = interval
+        self._samples: Deque[Tuple[float, float]] = deque(maxlen=history)
+        self._task: Optional[asyncio.Task] = None
+        # 当前这次休眠的预期唤醒时间（loop.time()）
+        self._expected: Optional[float] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        if not self.running:
+            self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            self._expected = expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            now = loop.time()
+            lag = max(0.0, now - expected)
+            self._samples.append((time.perf_counter(), lag))
+            event_loop_lag.observe(lag)
+
+    def pending_lag(self) -> float:
+        """尚未被采样的延迟：监测任务本应已经唤醒却还没有运行的时长（秒）"""
+        if not self.running or self._expected is None:
+            return 0.0
+        return max(0.0, asyncio.get_running_loop().time() - self._expected)
+
+    def max_lag(self, since: float) -> float:
+        """从 since（perf_counter）至今的最大延迟（秒）
+
+        阻塞刚结束时监测任务还来不及运行，因此同时计入尚未采样的延迟。
+        """
+        sampled = max((lag for at, lag in self._samples if at >= since), default=0.0)
+        return max(sampled, self.pending_lag())
+
+    def latest(self) -> Optional[float]:
+        return self._samples[-1][1] if self._samples else None
+
+
+class StackProfile:
+    """单个请求的调用栈采样结果（folded stacks 格式，每行 "a;b;c 次数"）"""
+
+    def __init__(self, thread_id: int):
+        self.thread_id = thread_id
+        self.stacks: StackCounter = StackCounter()
+
+    def folded(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+class StackSampler:
+    """采样式分析器：在后台线程中定期采集事件循环线程的调用栈
+
+    输出 folded stacks 格式，可直接用 flamegraph.pl 或 speedscope 查看；
+    与 cProfile 不同，采样对请求本身几乎没有额外开销，也能看到阻塞事件循环的同步调用。
+    所有被抽样的请求共用一个采样线程：begin() 登记请求，end() 注销，都不等待线程，
+    因此不会阻塞事件循环；没有请求需要采样时线程挂起等待，不占用 CPU。
+    """
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self._profiles: List[StackProfile] = []
+        self._lock = threading.Lock()
+        self._active = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def begin(self) -> StackProfile:
+        """开始为当前线程（事件循环线程）上的请求采样"""
+        profile = StackProfile(threading.get_ident())
+        with self._lock:
+            self._profiles.append(profile)
+            self._active.set()
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+                self._thread.start()
+        return profile
+
+    def end(self, profile: StackProfile) -> None:
+        """停止为该请求采样；返回后采样线程不会再修改 profile.stacks"""
+        with self._lock:
+            self._profiles.remove(profile)
+
+    def _run(self) -> None:
+        while self._active.wait():
+            time.sleep(self.interval)
+            with self._lock:
+                if not self._profiles:
+                    self._active.clear()
+                    continue
+                thread_ids = {profile.thread_id for profile in self._profiles}
+            frames = sys._current_frames()
+            stacks = {thread_id: self._format(frames.get(thread_id)) for thread_id in thread_ids}
+            with self._lock:
+                for profile in self._profiles:
+                    stack = stacks.get(profile.thread_id)
+                    if stack:
+                        profile.stacks[stack] += 1
+
+    @staticmethod
+    def _format(frame) -> str:
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+            frame = frame.f_back
+        return ";".join(reversed(stack))
+
+
+# 全局事件循环延迟监测器（应用启动时启动，供就绪检查和慢请求分析使用）
+loop_lag_monitor = LoopLagMonitor()
+# 全局调用栈采样器（按 PROFILER_SAMPLE_RATE 抽样的请求共用）
+stack_sampler = StackSampler()
@@ -0,0 +1,195 @@
+import hashlib
+from typing import Any, Iterable, Optional, Tuple
+from urllib.parse import urlencode
+
+from fastapi import Request
+from fastapi.responses import Response
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.metrics import register_cache_stats
+from app.core.serialization import dumps
+
+
+class CacheBackend:
+    """响应缓存存储后端接口
+
+    只需要实现按键读写字节串，以及版本计数器的读取和原子自增，即可替换为 Redis 或本地替身。
+    """
+
+    async def get(self, key: str) -> Optional[bytes]:
+        raise NotImplementedError()
+
+    async def set(self, key: str, value: bytes, ttl: int) -> None:
+        raise NotImplementedError()
+
+    async def get_version(self, key: str) -> int:
+        """读取版本计数器，不存在时为 0"""
+        raise NotImplementedError()
+
+    async def incr(self, key: str) -> int:
+        raise NotImplementedError()
+
+
+class MemoryCacheBackend(CacheBackend):
+    """进程内 LRU 缓存后端（默认）
+
+    多个 worker 之间不共享，失效只作用于当前进程，其余进程依赖 TTL 过期。
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        self.cache = TTLCache(maxsize=maxsize)
+        self._counters = {}
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return self.cache.get(key)
+
+    async def set(self, key: str, value: bytes, ttl: int) -> None:
+        self.cache.set(key, value, ttl=ttl)
+
+    async def get_version(self, key: str) -> int:
+        return self._counters.get(key, 0)
+
+    async def incr(self, key: str) -> int:
+        self._counters[key] = self._counters.get(key, 0) + 1
+        return self._counters[key]
+
+
+class RedisCacheBackend(CacheBackend):
+    """Redis 缓存后端（可选，需要安装 redis 包）
+
+    兼容 Redis 协议的服务（如 KeyDB、Dragonfly）均可使用，多个 worker 共享缓存和失效。
+    """
+
+    def __init__(self, url: str):
+        try:
+            from redis import asyncio as redis_asyncio
+        except ImportError:
+            raise ImportError("使用 Redis 缓存后端需要安装 redis: pip install redis")
+        self.client = redis_asyncio.from_url(url)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self.client.get(key)
+
+    async def set(self, key: str, value: bytes, ttl: int) -> None:
+        await self.client.set(key, value, ex=ttl)
+
+    async def get_version(self, key: str) -> int:
+        raw = await self.client.get(key)
+        return int(raw) if raw else 0
+
+    async def incr(self, key: str) -> int:
+        return await self.client.incr(key)
+
+
+def create_cache_backend() -> Optional[CacheBackend]:
+    """根据配置创建缓存后端，RESPONSE_CACHE_BACKEND=none 时禁用缓存"""
+    backend = settings.RESPONSE_CACHE_BACKEND
+    if backend == "memory":
+        return MemoryCacheBackend(maxsize=settings.RESPONSE_CACHE_MAX_ENTRIES)
+    if backend == "redis":
+        if not settings.REDIS_URL:
+            raise ValueError("RESPONSE_CACHE_BACKEND=redis 时必须设置 REDIS_URL")
+        return RedisCacheBackend(settings.REDIS_URL)
+    return None
+
+
+def make_etag(body: bytes) -> str:
+    """根据响应内容生成强 ETag"""
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return etag in candidates or f"W/{etag}" in candidates
+
+
+class ResponseCache:
+    """公开只读接口的响应缓存
+
+    缓存键由命名空间版本号、路由名和规范化后的查询参数组成；
+    写操作调用 invalidate() 递增版本号，使旧版本的缓存全部失效，无需逐个删除。
+    """
+
+    def __init__(self, namespace: str, backend: Optional[CacheBackend] = None):
+        self.namespace = namespace
+        self._backend = backend
+        self._backend_created = backend is not None
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def backend(self) -> Optional[CacheBackend]:
+        """缓存后端（首次使用时按配置创建）"""
+        if not self._backend_created:
+            self._backend = create_cache_backend()
+            self._backend_created = True
+        return self._backend
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None
+
+    async def _version(self) -> int:
+        return await self.backend.get_version(f"{self.namespace}:version")
+
+    async def key(self, name: str, params: Iterable[Tuple[str, Any]] = ()) -> str:
+        """生成缓存键（查询参数排序后编码）"""
+        version = await self._version()
+        query = urlencode(sorted((k, str(v)) for k, v in params))
+        return f"{self.namespace}:v{version}:{name}:{query}"
+
+    async def get(self, key: str) -> Optional[bytes]:
+        """读取缓存的响应内容"""
+        body = await self.backend.get(key)
+        if body is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return body
+
+    async def set(self, key: str, body: bytes) -> None:
+        """写入响应内容"""
+        await self.backend.set(key, body, settings.RESPONSE_CACHE_TTL)
+
+    async def invalidate(self) -> None:
+        """使命名空间下的所有缓存失效"""
+        if self.enabled:
+            await self.backend.incr(f"{self.namespace}:version")
+
+    def stats(self) -> dict:
+        """缓存统计信息"""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / total if total else 0.0,
+        }
+
+
+def render_json(content: Any) -> bytes:
+    """序列化响应内容，已序列化的字节串原样返回"""
+    if isinstance(content, bytes):
+        return content
+    return dumps(content)
+
+
+def cached_json_response(request: Request, body: bytes) -> Response:
+    """返回带 ETag / Cache-Control 的响应，If-None-Match 命中时返回 304"""
+    etag = make_etag(body)
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={settings.RESPONSE_CACHE_MAX_AGE}",
+    }
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+# 新闻公开接口的响应缓存
+news_cache = ResponseCache("news")
+register_cache_stats("news_response", news_cache.stats)
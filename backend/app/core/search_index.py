@@ -0,0 +1,127 @@
+import math
+import re
+import time
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# 英文/数字按单词切分，中文按字切分后生成二元组
+_WORD_RE = re.compile(r"[a-z0-9]+")
+_CJK_RE = re.compile(r"[\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff]+")
+
+# 标题命中的权重高于描述
+TITLE_WEIGHT = 2.0
+DESCRIPTION_WEIGHT = 1.0
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """分词：英文单词 + 中文二元组（单字时保留单字）"""
+    if not text:
+        return []
+    text = text.lower()
+    tokens = _WORD_RE.findall(text)
+    for run in _CJK_RE.findall(text):
+        if len(run) == 1:
+            tokens.append(run)
+        else:
+            tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+    return tokens
+
+
+class NewsSearchIndex:
+    """新闻倒排索引（进程内）
+
+    在没有 PostgreSQL 全文检索（search_vector 列 / search_news 函数）的开发环境中，
+    为关键词搜索提供排序结果。查询词全部命中才算匹配，按 TF-IDF 打分。
+    """
+
+    def __init__(self):
+        self._postings: Dict[str, Dict[int, float]] = defaultdict(dict)
+        self._docs: Dict[int, Dict[str, Any]] = {}
+        self.built_at: Optional[float] = None
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def is_stale(self, ttl: float) -> bool:
+        """索引是否需要重建"""
+        return self.built_at is None or time.monotonic() - self.built_at > ttl
+
+    def rebuild(self, rows: Iterable[Dict[str, Any]]) -> None:
+        """根据新闻数据重建索引"""
+        self._postings = defaultdict(dict)
+        self._docs = {}
+        for row in rows:
+            self.add(row)
+        self.built_at = time.monotonic()
+
+    def add(self, row: Dict[str, Any]) -> None:
+        """添加或更新一条新闻"""
+        news_id = row["id"]
+        if news_id in self._docs:
+            self.remove(news_id)
+
+        weights: Dict[str, float] = defaultdict(float)
+        for token in tokenize(row.get("title")):
+            weights[token] += TITLE_WEIGHT
+        for token in tokenize(row.get("description")):
+            weights[token] += DESCRIPTION_WEIGHT
+
+        for token, weight in weights.items():
+            self._postings[token][news_id] = weight
+        self._docs[news_id] = {
+            "id": news_id,
+            "creator_id": row.get("creator_id"),
+            "title": row.get("title"),
+            "created_at": row.get("created_at"),
+            "updated_at": row.get("updated_at"),
+            "tokens": list(weights),
+        }
+
+    def remove(self, news_id: int) -> None:
+        """删除一条新闻"""
+        doc = self._docs.pop(news_id, None)
+        if doc is None:
+            return
+        for token in doc["tokens"]:
+            postings = self._postings.get(token)
+            if postings is not None:
+                postings.pop(news_id, None)
+                if not postings:
+                    del self._postings[token]
+
+    def search(
+        self,
+        keyword: str,
+        creator_id: Optional[int] = None,
+    ) -> List[Tuple[Dict[str, Any], float]]:
+        """搜索关键词，返回按得分降序排列的 (文档, 得分) 列表"""
+        terms = set(tokenize(keyword))
+        if not terms:
+            return []
+
+        postings = [self._postings.get(term) for term in terms]
+        if any(not p for p in postings):
+            return []
+
+        # 从最短的倒排表开始求交集
+        postings.sort(key=len)
+        candidates = set(postings[0])
+        for p in postings[1:]:
+            candidates &= p.keys()
+            if not candidates:
+                return []
+
+        total_docs = len(self._docs)
+        results = []
+        for news_id in candidates:
+            doc = self._docs[news_id]
+            if creator_id and doc["creator_id"] != creator_id:
+                continue
+            score = sum(
+                p[news_id] * math.log(1 + total_docs / len(p))
+                for p in postings
+            )
+            results.append((doc, score))
+
+        results.sort(key=lambda item: (-item[1], -item[0]["id"]))
+        return results
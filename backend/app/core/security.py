@@ -1,12 +1,32 @@
+import asyncio
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Any, Union, Optional
-from jose import jwt
+from typing import Any, Callable, Union, Optional
+from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import HTTPException, status
 from app.core.config import settings
+from app.core.exceptions import ServiceUnavailableException
+from app.core.metrics import register_cache_stats
+from app.core.profiling import phase
+from app.core.token_cache import RevocationList, VerifiedTokenCache, token_digest
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# 已验证令牌缓存和已撤销令牌列表（进程内）
+token_cache = VerifiedTokenCache(maxsize=settings.TOKEN_CACHE_MAX_SIZE)
+revoked_tokens = RevocationList(
+    capacity=settings.TOKEN_REVOCATION_CAPACITY,
+    error_rate=settings.TOKEN_REVOCATION_ERROR_RATE,
+)
+register_cache_stats("token", token_cache.stats)
+
+# 密码哈希线程池（bcrypt 计算期间释放 GIL，放到线程池中不会阻塞事件循环）
+_password_executor: Optional[ThreadPoolExecutor] = None
+# 正在执行和排队中的密码哈希任务数
+_password_pending = 0
+
 
 def create_access_token(
     subject: Union[str, Any], expires_delta: timedelta = None
@@ -19,11 +39,44 @@ def create_access_token(
             minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
         )
     
-    to_encode = {"exp": expire, "sub": str(subject)}
+    # jti 保证同一用户同一秒内签发的令牌也互不相同，撤销一个不会影响其他设备
+    to_encode = {"exp": expire, "sub": str(subject), "jti": uuid.uuid4().hex}
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
 
+class TokenRevokedError(JWTError):
+    """令牌已被撤销（用户已登出）"""
+
+
+def decode_access_token(token: str) -> dict:
+    """校验并解码访问令牌
+
+    先查撤销列表，再查已验证令牌缓存，都未命中时才做签名校验并缓存结果。
+    返回的声明字典是缓存中的共享对象，调用方不应修改。
+
+    Raises:
+        TokenRevokedError: 令牌已被撤销
+        JWTError: 令牌无效或已过期
+    """
+    digest = token_digest(token)
+    if revoked_tokens.is_revoked(digest):
+        raise TokenRevokedError("令牌已失效")
+    claims = token_cache.get(digest)
+    if claims is None:
+        claims = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        token_cache.set(digest, claims)
+    return claims
+
+
+def revoke_access_token(token: str) -> None:
+    """撤销访问令牌，在令牌过期前拒绝再次使用"""
+    claims = decode_access_token(token)
+    digest = token_digest(token)
+    revoked_tokens.revoke(digest, claims.get("exp", 0))
+    token_cache.delete(digest)
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """验证密码"""
     return pwd_context.verify(plain_password, hashed_password)
@@ -34,12 +87,58 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+def _get_password_executor() -> ThreadPoolExecutor:
+    """获取密码哈希线程池（首次使用时创建）"""
+    global _password_executor
+    if _password_executor is None:
+        _password_executor = ThreadPoolExecutor(
+            max_workers=settings.PASSWORD_HASH_WORKERS,
+            thread_name_prefix="password-hash",
+        )
+    return _password_executor
+
+
+async def _run_password_task(func: Callable[..., Any], *args: Any) -> Any:
+    """在密码哈希线程池中执行任务
+
+    同时执行的任务数受线程数限制，排队任务超过 PASSWORD_HASH_MAX_QUEUE 时直接拒绝，
+    避免登录高峰期请求无限堆积。
+    """
+    global _password_pending
+    if _password_pending >= settings.PASSWORD_HASH_WORKERS + settings.PASSWORD_HASH_MAX_QUEUE:
+        raise ServiceUnavailableException("请求过多，请稍后重试")
+
+    _password_pending += 1
+    try:
+        loop = asyncio.get_running_loop()
+        with phase("password_hash"):
+            return await loop.run_in_executor(_get_password_executor(), func, *args)
+    finally:
+        _password_pending -= 1
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """验证密码（在线程池中执行）"""
+    return await _run_password_task(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """获取密码哈希（在线程池中执行）"""
+    return await _run_password_task(get_password_hash, password)
+
+
+def shutdown_password_executor() -> None:
+    """关闭密码哈希线程池"""
+    global _password_executor
+    if _password_executor is not None:
+        _password_executor.shutdown(wait=False)
+        _password_executor = None
+
+
 def verify_token(token: str) -> Optional[str]:
     """验证令牌"""
     try:
-        payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
-        )
+        payload = decode_access_token(token)
         username: str = payload.get("sub")
         if username is None:
             return None
@@ -51,9 +150,7 @@ def verify_token(token: str) -> Optional[str]:
 def decode_token(token: str) -> dict:
     """解码令牌"""
     try:
-        payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
-        )
+        payload = decode_access_token(token)
         return payload
     except jwt.ExpiredSignatureError:
         raise HTTPException(
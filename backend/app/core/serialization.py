@@ -0,0 +1,66 @@
+import json
+from typing import Any, Generic, Type, TypeVar
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+from app.core.profiling import phase
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson 为可选依赖，缺失时回退到标准库
+    orjson = None
+
+T = TypeVar("T")
+
+
+def dumps(content: Any) -> bytes:
+    """序列化为 JSON 字节串（优先使用 orjson）
+
+    输出与 FastAPI JSONResponse 一致：紧凑格式、不转义非 ASCII 字符；
+    orjson 不支持的类型（pydantic 模型、datetime 等）交给 jsonable_encoder 处理。
+    """
+    if orjson is not None:
+        return orjson.dumps(
+            content,
+            default=jsonable_encoder,
+            option=orjson.OPT_PASSTHROUGH_DATETIME,
+        )
+    return json.dumps(
+        jsonable_encoder(content),
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """使用 orjson 编码的 JSON 响应，已序列化的字节串直接返回"""
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        with phase("serialize"):
+            return dumps(content)
+
+
+class BulkSerializer(Generic[T]):
+    """基于 TypeAdapter 的整体序列化器
+
+    对整个响应（如一页新闻）只做一次校验和一次编码，
+    替代逐行构造模型后再由 response_model 重复校验、jsonable_encoder 逐字段转换。
+    """
+
+    def __init__(self, model_type: Type[T]):
+        self.adapter = TypeAdapter(model_type)
+
+    def validate(self, data: Any) -> T:
+        """校验原始数据（字典/列表），返回模型对象"""
+        return self.adapter.validate_python(data)
+
+    def dump(self, data: Any) -> bytes:
+        """校验并序列化为 JSON 字节串"""
+        with phase("serialize"):
+            return dumps(self.adapter.dump_python(self.validate(data), mode="json"))
@@ -1,10 +1,170 @@
-from supabase import create_client, Client
+import time
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
+
+import httpx
+from postgrest import AsyncPostgrestClient
 from app.core.config import settings
+from app.core.metrics import postgrest_request_duration, postgrest_requests_total
+from app.core.profiling import record_phase
+
+if TYPE_CHECKING:
+    from supabase import Client
 
 # 创建 Supabase 客户端实例
-def get_supabase_client() -> Client:
+def get_supabase_client() -> "Client":
     """获取 Supabase 客户端实例"""
+    # supabase 包会连带导入 auth/realtime/storage 等模块，只在需要同步客户端时导入
+    from supabase import create_client
     return create_client(settings.SUPABASE_URL, settings.SUPABASE_KEY)
 
-# 全局 Supabase 客户端
-supabase_client = get_supabase_client()
\ No newline at end of file
+# 全局 Supabase 客户端（首次访问 supabase_client 时创建）
+_supabase_client: Optional["Client"] = None
+
+
+def __getattr__(name):
+    global _supabase_client
+    if name == "supabase_client":
+        if _supabase_client is None:
+            _supabase_client = get_supabase_client()
+        return _supabase_client
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def describe_postgrest_request(request: httpx.Request) -> Tuple[str, str]:
+    """从请求中解析 PostgREST 表名（rpc 为 rpc/函数名）和操作类型"""
+    path = request.url.path
+    _, _, resource = path.partition("/rest/v1/")
+    resource = resource.strip("/") or path
+    if resource.startswith("rpc/"):
+        return resource, "rpc"
+    if request.method == "POST":
+        prefer = request.headers.get("prefer", "")
+        return resource, "upsert" if "resolution=" in prefer else "insert"
+    operation = {
+        "GET": "select",
+        "HEAD": "count",
+        "PATCH": "update",
+        "DELETE": "delete",
+    }.get(request.method, request.method.lower())
+    return resource, operation
+
+
+class PostgRESTMetricsTransport(httpx.AsyncBaseTransport):
+    """记录每次 PostgREST 调用的耗时和状态码（按表和操作类型）
+
+    耗时从发出请求到收到响应头，响应体由调用方随后读取。
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport):
+        self._transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        table, operation = describe_postgrest_request(request)
+        status = "error"
+        started = time.perf_counter()
+        try:
+            response = await self._transport.handle_async_request(request)
+            status = str(response.status_code)
+            return response
+        finally:
+            elapsed = time.perf_counter() - started
+            postgrest_request_duration.observe(elapsed, table=table, operation=operation)
+            record_phase("postgrest", elapsed)
+            postgrest_requests_total.inc(table=table, operation=operation, status=status)
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+# 全局异步 PostgREST 客户端（首次使用时创建）
+_async_postgrest_client: Optional[AsyncPostgrestClient] = None
+# 客户端底层的传输层（postgrest 后端为连接池，用于读取连接池状态）
+_http_transport: Optional[httpx.AsyncBaseTransport] = None
+
+
+def create_postgrest_transport() -> httpx.AsyncBaseTransport:
+    """根据 SUPABASE_BACKEND 创建数据访问传输层
+
+    postgrest 后端通过连接池访问 Supabase；memory 后端在进程内处理请求，
+    服务层代码不变，可以在没有 Supabase 的环境中测试和压测。
+    """
+    backend = settings.SUPABASE_BACKEND
+    if backend == "memory":
+        from app.core.memory_postgrest import (
+            InMemoryPostgREST,
+            InMemoryPostgRESTTransport,
+            load_seed_file,
+        )
+
+        database = InMemoryPostgREST()
+        if settings.MEMORY_BACKEND_SEED_FILE:
+            database.load(load_seed_file(settings.MEMORY_BACKEND_SEED_FILE))
+        return InMemoryPostgRESTTransport(database, latency_ms=settings.MEMORY_BACKEND_LATENCY_MS)
+    if backend != "postgrest":
+        raise ValueError(f"不支持的 SUPABASE_BACKEND: {backend}（可选 postgrest/memory）")
+    return httpx.AsyncHTTPTransport(
+        limits=httpx.Limits(
+            max_connections=settings.SUPABASE_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.SUPABASE_MAX_KEEPALIVE_CONNECTIONS,
+        )
+    )
+
+
+def get_async_postgrest_client() -> AsyncPostgrestClient:
+    """获取异步 PostgREST 客户端实例
+
+    所有请求共享同一个 httpx.AsyncClient 连接池，查询不会阻塞事件循环；
+    SUPABASE_BACKEND=memory 时请求由进程内替身处理。
+    """
+    global _async_postgrest_client, _http_transport
+    if _async_postgrest_client is None:
+        transport = _http_transport = create_postgrest_transport()
+        http_client = httpx.AsyncClient(
+            transport=PostgRESTMetricsTransport(transport),
+            timeout=settings.SUPABASE_TIMEOUT,
+            follow_redirects=True,
+        )
+        _async_postgrest_client = AsyncPostgrestClient(
+            f"{settings.SUPABASE_URL.rstrip('/')}/rest/v1",
+            headers={
+                "Accept": "application/json",
+                "Content-Type": "application/json",
+                "apikey": settings.SUPABASE_KEY,
+                "Authorization": f"Bearer {settings.SUPABASE_KEY}",
+            },
+            http_client=http_client,
+        )
+    return _async_postgrest_client
+
+
+async def close_async_postgrest_client() -> None:
+    """关闭异步 PostgREST 客户端的连接池"""
+    global _async_postgrest_client, _http_transport
+    if _async_postgrest_client is not None:
+        await _async_postgrest_client.aclose()
+        _async_postgrest_client = None
+        _http_transport = None
+
+
+def get_connection_pool_stats() -> Optional[Dict[str, Any]]:
+    """连接池使用情况，客户端尚未创建或使用 memory 后端时返回 None
+
+    saturation 为使用中的连接数占 SUPABASE_MAX_CONNECTIONS 的比例，
+    waiting 为等待空闲连接的请求数（大于 0 说明连接池已经成为瓶颈）。
+    """
+    pool = getattr(_http_transport, "_pool", None)
+    if pool is None:
+        return None
+    connections = list(getattr(pool, "connections", []))
+    idle = sum(1 for connection in connections if connection.is_idle())
+    waiting = sum(1 for request in getattr(pool, "_requests", []) if request.is_queued())
+    active = len(connections) - idle
+    max_connections = settings.SUPABASE_MAX_CONNECTIONS
+    return {
+        "max_connections": max_connections,
+        "open": len(connections),
+        "active": active,
+        "idle": idle,
+        "waiting": waiting,
+        "saturation": round(active / max_connections, 3) if max_connections else 0.0,
+    }
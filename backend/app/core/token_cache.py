@@ -0,0 +1,116 @@
+import hashlib
+import math
+import time
+from typing import Any, Dict, Optional
+
+from app.core.cache import TTLCache
+
+
+def token_digest(token: str) -> bytes:
+    """令牌摘要（16 字节），缓存和撤销列表中只保存摘要，不保存令牌本身"""
+    return hashlib.blake2b(token.encode("utf-8"), digest_size=16).digest()
+
+
+class BloomFilter:
+    """布隆过滤器
+
+    判断“不存在”是确定的，判断“可能存在”有 error_rate 的误判率；
+    元素本身是均匀分布的摘要，用双重哈希从中派生 k 个位置，不需要再计算哈希。
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        self.capacity = max(1, capacity)
+        self.size = max(8, int(-self.capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / self.capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, digest: bytes):
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:16], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hash_count))
+
+    def add(self, digest: bytes) -> None:
+        for position in self._positions(digest):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, digest: bytes) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(digest))
+
+
+class RevocationList:
+    """已撤销令牌的拒绝列表（进程内）
+
+    布隆过滤器在前：绝大多数未撤销的令牌只需检查 k 个位即可放行；
+    命中时再查精确集合（摘要 -> 令牌过期时间）排除误判。令牌过期后条目自动清理，
+    布隆过滤器随清理重建，因此占用空间只与有效期内的撤销数量有关。
+    多个 worker 之间不共享，登出只对处理该请求的进程生效。
+    """
+
+    def __init__(self, capacity: int = 100000, error_rate: float = 0.001):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self._entries: Dict[bytes, float] = {}
+        self._bloom = BloomFilter(capacity, error_rate)
+        self._next_purge: Optional[float] = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def revoke(self, digest: bytes, expires_at: float) -> None:
+        """撤销令牌，expires_at 为令牌过期时间（Unix 时间戳）"""
+        now = time.time()
+        if expires_at <= now:
+            return
+        self._entries[digest] = expires_at
+        self._bloom.add(digest)
+        if self._next_purge is None or expires_at < self._next_purge:
+            self._next_purge = expires_at
+        if now >= self._next_purge or len(self._entries) > self._bloom.capacity:
+            self.purge(now)
+
+    def is_revoked(self, digest: bytes) -> bool:
+        if digest not in self._bloom:
+            return False
+        expires_at = self._entries.get(digest)
+        return expires_at is not None and expires_at > time.time()
+
+    def purge(self, now: Optional[float] = None) -> None:
+        """删除已过期的条目并重建布隆过滤器（撤销数超过容量时按需扩容）"""
+        now = time.time() if now is None else now
+        self._entries = {digest: expires_at for digest, expires_at in self._entries.items() if expires_at > now}
+        self._bloom = BloomFilter(max(self.capacity, len(self._entries) * 2), self.error_rate)
+        for digest in self._entries:
+            self._bloom.add(digest)
+        self._next_purge = min(self._entries.values(), default=None)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "size": len(self._entries),
+            "bloom_bits": self._bloom.size,
+            "bloom_hashes": self._bloom.hash_count,
+        }
+
+
+class VerifiedTokenCache:
+    """已验证令牌的缓存：摘要 -> 声明（claims）
+
+    条目在令牌过期时同时过期，命中时省去签名校验、JSON 解析和声明检查。
+    只有签名校验通过的令牌才会写入，键是完整令牌的摘要，伪造的令牌不可能命中。
+    """
+
+    def __init__(self, maxsize: int = 10000):
+        self.cache = TTLCache(maxsize=maxsize)
+
+    def get(self, digest: bytes) -> Optional[Dict[str, Any]]:
+        return self.cache.get(digest)
+
+    def set(self, digest: bytes, claims: Dict[str, Any]) -> None:
+        expires_in = claims.get("exp", 0) - time.time()
+        if expires_in > 0:
+            self.cache.set(digest, claims, ttl=expires_in)
+
+    def delete(self, digest: bytes) -> None:
+        self.cache.delete(digest)
+
+    def stats(self) -> Dict[str, Any]:
+        return self.cache.stats()
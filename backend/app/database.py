@@ -4,7 +4,6 @@ from sqlalchemy.orm import sessionmaker
 import os
 
 from app.core.config import settings
-from app.core.supabase_client import supabase_client
 
 Base = declarative_base()
 
@@ -46,4 +45,5 @@ def get_db():
 # 新的 Supabase 客户端依赖项
 def get_supabase_client():
     """获取 Supabase 客户端实例"""
-    return supabase_client
\ No newline at end of file
+    from app.core import supabase_client as client_module
+    return client_module.supabase_client
\ No newline at end of file
@@ -1,11 +1,22 @@
 import os
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
-from app.database import get_engine
-from app.models import Base
-from app.api import api_router
-from app.middleware import register_exception_handlers
+from app.core.serialization import FastJSONResponse
+from app.core.metrics import registry as metrics_registry
+from app.core.profiling import loop_lag_monitor
+from app.api import api_router, health_router
+from app.middleware import (
+    register_exception_handlers,
+    RequestScopeMiddleware,
+    MetricsMiddleware,
+    ProfilerMiddleware,
+    CompressionMiddleware,
+)
+from app.core.supabase_client import close_async_postgrest_client
+from app.core.security import shutdown_password_executor
+from app.services.rendition_service import rendition_service
 
 # 数据库初始化
 def init_database():
@@ -18,7 +29,9 @@ def init_database():
             print("Skipping database initialization in Vercel environment")
             return
         else:
-            # 本地开发环境直接创建表
+            # 本地开发环境直接创建表（SQLAlchemy 不在请求路径上，只在这里导入）
+            from app.database import get_engine
+            from app.models import Base
             engine = get_engine()
             print(f"Creating database tables with engine: {engine.url}")
             Base.metadata.create_all(bind=engine)
@@ -30,9 +43,6 @@ def init_database():
             print("Continuing without database connection...")
             # raise
 
-# 初始化数据库
-init_database()
-
 # 创建FastAPI应用
 app = FastAPI(
     title=settings.APP_NAME,
@@ -41,6 +51,7 @@ app = FastAPI(
     openapi_url="/api/v1/openapi.json",
     docs_url="/api/v1/docs",
     redoc_url="/api/v1/redoc",
+    default_response_class=FastJSONResponse,
 )
 
 # 配置CORS
@@ -62,12 +73,53 @@ app.add_middleware(
     expose_headers=["*"],
 )
 
+# 请求级用户加载器（合并同一请求内的创建者查询）
+app.add_middleware(RequestScopeMiddleware)
+
+# 响应压缩（按 Accept-Encoding 协商 zstd/gzip）
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+        zstd_level=settings.COMPRESSION_ZSTD_LEVEL,
+        gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+    )
+
+# 慢请求分析（按需开启）
+if settings.PROFILER_ENABLED:
+    app.add_middleware(ProfilerMiddleware)
+
+# 请求指标（最外层，统计包括中间件在内的完整耗时）
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
 # 注册异常处理器
 register_exception_handlers(app)
 
 # 注册路由
 app.include_router(api_router, prefix="/api/v1")
 
+# 健康检查（不带前缀，供负载均衡器探测）
+app.include_router(health_router, tags=["health"])
+
+
+@app.on_event("startup")
+async def startup():
+    """启动时初始化数据库（不在导入时执行，避免拖慢 serverless 冷启动），开始监测事件循环延迟"""
+    init_database()
+    # 就绪检查读取最近的延迟采样，启动后即开始采样
+    loop_lag_monitor.interval = settings.PROFILER_LOOP_LAG_INTERVAL
+    loop_lag_monitor.start()
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    """关闭时释放 Supabase 连接池、密码哈希和缩略图线程池，停止事件循环延迟监测"""
+    await loop_lag_monitor.stop()
+    await close_async_postgrest_client()
+    shutdown_password_executor()
+    rendition_service.shutdown()
+
 
 @app.get("/")
 async def root():
@@ -79,10 +131,14 @@ async def root():
     }
 
 
-@app.get("/health")
-async def health_check():
-    """健康检查"""
-    return {"status": "healthy", "timestamp": "2024-01-01T00:00:00Z"}
+if settings.METRICS_ENABLED:
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        """Prometheus 指标"""
+        return PlainTextResponse(
+            metrics_registry.render(),
+            media_type="text/plain; version=0.0.4"
+        )
 
 
 if __name__ == "__main__":
@@ -1,4 +1,14 @@
 """中间件模块"""
 from .error_handler import register_exception_handlers
+from .request_scope import RequestScopeMiddleware
+from .metrics import MetricsMiddleware
+from .profiler import ProfilerMiddleware
+from .compression import CompressionMiddleware
 
-__all__ = ["register_exception_handlers"]
\ No newline at end of file
+__all__ = [
+    "register_exception_handlers",
+    "RequestScopeMiddleware",
+    "MetricsMiddleware",
+    "ProfilerMiddleware",
+    "CompressionMiddleware",
+]
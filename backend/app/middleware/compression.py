@@ -0,0 +1,180 @@
+import zlib
+from typing import Dict, Optional
+
+import zstandard
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# 服务端偏好顺序：客户端 q 值相同时优先 zstd
+SUPPORTED_ENCODINGS = ("zstd", "gzip")
+
+# 值得压缩的响应类型（图片等已压缩的内容不再压缩）
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+)
+
+
+def parse_accept_encoding(header: str) -> Dict[str, float]:
+    """解析 Accept-Encoding，返回 {编码: q 值}"""
+    encodings = {}
+    for item in header.split(","):
+        coding, _, params = item.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        encodings[coding] = q
+    return encodings
+
+
+def negotiate_encoding(header: Optional[str]) -> Optional[str]:
+    """按 Accept-Encoding 选择压缩编码，客户端不接受任何支持的编码时返回 None"""
+    if not header:
+        return None
+    encodings = parse_accept_encoding(header)
+    default = encodings.get("*", 0.0)
+    best, best_q = None, 0.0
+    for coding in SUPPORTED_ENCODINGS:
+        q = encodings.get(coding, default)
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+def is_compressible(content_type: str) -> bool:
+    content_type = content_type.split(";", 1)[0].strip().lower()
+    return (
+        content_type.startswith(COMPRESSIBLE_TYPES)
+        or content_type.endswith(("+json", "+xml"))
+    )
+
+
+class StreamCompressor:
+    """流式压缩器：每个响应块压缩后立即刷新，客户端能及时收到已生成的数据"""
+
+    def __init__(self, encoding: str, level: int):
+        if encoding == "zstd":
+            self._obj = zstandard.ZstdCompressor(level=level).compressobj()
+            self._flush_mode = zstandard.COMPRESSOBJ_FLUSH_BLOCK
+        else:
+            self._obj = zlib.compressobj(level, zlib.DEFLATED, 31)
+            self._flush_mode = zlib.Z_SYNC_FLUSH
+
+    def compress(self, data: bytes, more: bool) -> bytes:
+        output = self._obj.compress(data)
+        return output + (self._obj.flush(self._flush_mode) if more else self._obj.flush())
+
+
+class CompressionMiddleware:
+    """响应压缩中间件
+
+    按 Accept-Encoding 协商 zstd/gzip（q 值相同时优先 zstd）：
+    - 完整响应（JSONResponse 等）小于 minimum_size 时不压缩，否则一次性压缩并改写 Content-Length
+    - 流式响应（StreamingResponse，如 /news/export）逐块压缩并刷新，去掉 Content-Length
+    - 已编码、非文本类型、带 no-transform 的响应原样返回
+    压缩后的表示与原始内容不同，强 ETag 改为弱 ETag（If-None-Match 按弱比较仍能命中）。
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        zstd_level: int = 3,
+        gzip_level: int = 4,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.levels = {"zstd": zstd_level, "gzip": gzip_level}
+        # 一次性压缩在事件循环线程中同步完成，共用一个压缩上下文
+        self._zstd = zstandard.ZstdCompressor(level=zstd_level)
+
+    def compress(self, encoding: str, body: bytes) -> bytes:
+        """一次性压缩完整响应体"""
+        if encoding == "zstd":
+            return self._zstd.compress(body)
+        compressor = zlib.compressobj(self.levels["gzip"], zlib.DEFLATED, 31)
+        return compressor.compress(body) + compressor.flush()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding"))
+        start_message: Optional[Message] = None
+        compressor: Optional[StreamCompressor] = None
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start_message, compressor
+            message_type = message["type"]
+            if message_type == "http.response.start":
+                # 等第一个响应块到达后才能决定是否压缩
+                start_message = message
+                return
+            if message_type != "http.response.body":
+                await send(message)
+                return
+
+            if compressor is not None:
+                more = message.get("more_body", False)
+                await send({
+                    "type": "http.response.body",
+                    "body": compressor.compress(message.get("body", b""), more),
+                    "more_body": more,
+                })
+                return
+            if start_message is None:
+                await send(message)
+                return
+
+            start, start_message = start_message, None
+            body = message.get("body", b"")
+            more = message.get("more_body", False)
+            headers = MutableHeaders(raw=list(start["headers"]))
+            start["headers"] = headers.raw
+            if (
+                start["status"] < 200
+                or start["status"] in (204, 304)
+                or "content-encoding" in headers
+                or "no-transform" in headers.get("cache-control", "")
+                or not is_compressible(headers.get("content-type", ""))
+                or (not more and len(body) < self.minimum_size)
+            ):
+                await send(start)
+                await send(message)
+                return
+
+            # 响应内容随 Accept-Encoding 变化，不压缩时也要告诉缓存
+            headers.add_vary_header("Accept-Encoding")
+            if encoding is None:
+                await send(start)
+                await send(message)
+                return
+
+            headers["Content-Encoding"] = encoding
+            etag = headers.get("etag")
+            if etag and not etag.startswith("W/"):
+                headers["ETag"] = f"W/{etag}"
+            if more:
+                compressor = StreamCompressor(encoding, self.levels[encoding])
+                if "content-length" in headers:
+                    del headers["Content-Length"]
+                body = compressor.compress(body, True)
+            else:
+                body = self.compress(encoding, body)
+                headers["Content-Length"] = str(len(body))
+            await send(start)
+            await send({"type": "http.response.body", "body": body, "more_body": more})
+
+        await self.app(scope, receive, send_wrapper)
@@ -1,9 +1,9 @@
 from fastapi import Request, status
 from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
-from sqlalchemy.exc import IntegrityError
 from starlette.exceptions import HTTPException as StarletteHTTPException
 import logging
+import sys
 
 from app.core.exceptions import FeedMusicException
 
@@ -72,7 +72,7 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
     )
 
 
-async def integrity_error_handler(request: Request, exc: IntegrityError):
+async def integrity_error_handler(request: Request, exc: Exception):
     """处理数据库完整性错误"""
     logger.error(f"Database integrity error: {exc}")
     return JSONResponse(
@@ -88,6 +88,10 @@ async def integrity_error_handler(request: Request, exc: IntegrityError):
 
 async def general_exception_handler(request: Request, exc: Exception):
     """处理通用异常"""
+    # SQLAlchemy 不在请求路径上，不在注册时导入；只有已经加载过（说明确实用到了）才可能抛出完整性错误
+    sqlalchemy_exc = sys.modules.get("sqlalchemy.exc")
+    if sqlalchemy_exc is not None and isinstance(exc, sqlalchemy_exc.IntegrityError):
+        return await integrity_error_handler(request, exc)
     logger.error(f"Unhandled exception: {exc}", exc_info=True)
     return JSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -105,6 +109,6 @@ def register_exception_handlers(app):
     app.add_exception_handler(FeedMusicException, feed_music_exception_handler)
     app.add_exception_handler(StarletteHTTPException, http_exception_handler)
     app.add_exception_handler(RequestValidationError, validation_exception_handler)
-    app.add_exception_handler(IntegrityError, integrity_error_handler)
+    # 完整性错误（sqlalchemy.exc.IntegrityError）由通用处理器在出错时识别
     app.add_exception_handler(Exception, general_exception_handler)
 
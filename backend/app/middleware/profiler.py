@@ -0,0 +1,91 @@
+import asyncio
+import logging
+import random
+import re
+import time
+from datetime import datetime
+from pathlib import Path
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.profiling import (
+    end_request_profile,
+    loop_lag_monitor,
+    stack_sampler,
+    start_request_profile,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class ProfilerMiddleware:
+    """慢请求分析中间件（PROFILER_ENABLED=true 时启用）
+
+    - 后台监测事件循环延迟
+    - 超过 PROFILER_SLOW_REQUEST_MS 的请求记录日志，包含分阶段耗时（认证、PostgREST 调用、序列化）
+      和请求期间的最大事件循环延迟
+    - 按 PROFILER_SAMPLE_RATE 抽样对请求做调用栈采样，慢请求的采样结果写入 PROFILER_OUTPUT_DIR
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.slow_threshold = settings.PROFILER_SLOW_REQUEST_MS / 1000
+        self.output_dir = Path(settings.PROFILER_OUTPUT_DIR)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        if not loop_lag_monitor.running:
+            loop_lag_monitor.interval = settings.PROFILER_LOOP_LAG_INTERVAL
+            loop_lag_monitor.start()
+
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        stack_profile = None
+        if settings.PROFILER_SAMPLE_RATE > 0 and random.random() < settings.PROFILER_SAMPLE_RATE:
+            stack_sampler.interval = settings.PROFILER_SAMPLE_INTERVAL
+            stack_profile = stack_sampler.begin()
+
+        profile, token = start_request_profile()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            end_request_profile(token)
+            if stack_profile is not None:
+                stack_sampler.end(stack_profile)
+            elapsed = time.perf_counter() - profile.started
+            if elapsed >= self.slow_threshold:
+                await self._report(scope, status_code, elapsed, profile, stack_profile)
+
+    async def _report(self, scope: Scope, status_code: int, elapsed: float, profile, stack_profile) -> None:
+        route = getattr(scope.get("route"), "path", None) or scope["path"]
+        loop_lag = loop_lag_monitor.max_lag(profile.started)
+        profile_file = None
+        if stack_profile is not None and stack_profile.stacks:
+            profile_file = await asyncio.to_thread(
+                self._write_profile, scope["method"], route, elapsed, stack_profile.folded()
+            )
+        logger.warning(
+            f"慢请求: {scope['method']} {scope['path']} (路由: {route}) "
+            f"状态码 {status_code}, 耗时 {elapsed * 1000:.1f}ms, "
+            f"分阶段 {profile.breakdown()}, 事件循环最大延迟 {loop_lag * 1000:.1f}ms"
+            + (f", 调用栈采样: {profile_file}" if profile_file else "")
+        )
+
+    def _write_profile(self, method: str, route: str, elapsed: float, folded: str) -> str:
+        """写入 folded stacks 文件，返回文件路径"""
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        slug = re.sub(r"[^A-Za-z0-9]+", "_", route).strip("_") or "root"
+        timestamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+        path = self.output_dir / f"{timestamp}_{method}_{slug}_{int(elapsed * 1000)}ms.folded"
+        path.write_text(folded, encoding="utf-8")
+        return str(path)
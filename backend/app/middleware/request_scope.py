@@ -0,0 +1,22 @@
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.services.supabase_service import supabase_service
+from app.services.user_loader import user_loader_scope
+
+
+class RequestScopeMiddleware:
+    """为每个 HTTP 请求创建独立的用户加载器
+
+    同一请求内的创建者信息只查询一次，请求结束后随作用域一起丢弃。
+    使用纯 ASGI 中间件，保证处理函数与其派生的任务共享同一个上下文。
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        with user_loader_scope(supabase_service.load_users):
+            await self.app(scope, receive, send)
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field, validator
-from typing import Optional
+from typing import Any, List, Optional
 from datetime import datetime
 
 
@@ -100,6 +100,27 @@ class NewsListResponse(BaseModel):
         from_attributes = True
 
 
+class NewsBatchCreate(BaseModel):
+    """批量创建新闻请求模型（每条单独校验，失败不影响其他条目）"""
+    items: List[Any] = Field(..., min_length=1, description="新闻列表，字段同创建新闻")
+
+
+class NewsBatchItemResult(BaseModel):
+    """批量创建中单条新闻的处理结果"""
+    index: int = Field(..., description="条目序号（从0开始，导入时为行号减1）")
+    status: str = Field(..., description="处理结果：created/failed")
+    id: Optional[int] = Field(None, description="创建成功的新闻ID")
+    error: Optional[str] = Field(None, description="失败原因")
+
+
+class NewsBatchResponse(BaseModel):
+    """批量创建新闻响应模型"""
+    total: int = Field(..., description="处理条数")
+    created: int = Field(..., description="成功条数")
+    failed: int = Field(..., description="失败条数")
+    results: List[NewsBatchItemResult] = Field(..., description="逐条处理结果")
+
+
 class NewsSearchParams(BaseModel):
     """新闻搜索参数"""
     keyword: Optional[str] = Field(None, max_length=100, description="搜索关键词")
@@ -0,0 +1,95 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from app.core.config import settings
+from app.core.profiling import loop_lag_monitor
+from app.core.supabase_client import get_connection_pool_stats
+from app.services.supabase_service import supabase_service
+
+logger = logging.getLogger(__name__)
+
+
+def recent_loop_lag() -> float:
+    """最近 HEALTH_LOOP_LAG_WINDOW 秒内的最大事件循环延迟（秒）
+
+    由后台的 loop_lag_monitor 持续采样。就绪检查的处理函数要等事件循环空闲后才会执行，
+    在其中临时测量只能得到接近 0 的值，阻塞只会表现为探测变慢。
+    """
+    if not loop_lag_monitor.running:
+        loop_lag_monitor.interval = settings.PROFILER_LOOP_LAG_INTERVAL
+        loop_lag_monitor.start()
+    return loop_lag_monitor.max_lag(time.perf_counter() - settings.HEALTH_LOOP_LAG_WINDOW)
+
+
+class HealthService:
+    """存活/就绪检查
+
+    数据库探测结果缓存 HEALTH_CACHE_TTL 秒，并发的就绪检查共用同一次探测，
+    负载均衡器频繁探测也不会给数据库增加负担。
+    """
+
+    def __init__(self):
+        self.started_at = time.monotonic()
+        self._database: Optional[Dict[str, Any]] = None
+        self._checked_at: Optional[float] = None
+        self._probe: Optional[asyncio.Task] = None
+
+    async def _probe_database(self) -> Dict[str, Any]:
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(supabase_service.ping(), timeout=settings.HEALTH_PROBE_TIMEOUT)
+            result = {"status": "ok"}
+        except asyncio.TimeoutError:
+            result = {"status": "error", "error": f"探测超时（{settings.HEALTH_PROBE_TIMEOUT}秒）"}
+        except Exception as e:
+            logger.warning(f"数据库探测失败: {str(e)}")
+            result = {"status": "error", "error": str(e)}
+        result["latency_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        result["checked_at"] = datetime.now(timezone.utc).isoformat()
+        self._database = result
+        self._checked_at = time.monotonic()
+        return result
+
+    async def check_database(self) -> Dict[str, Any]:
+        """数据库探测结果（缓存期内直接返回上次结果）"""
+        if self._checked_at is not None and time.monotonic() - self._checked_at < settings.HEALTH_CACHE_TTL:
+            return self._database
+        if self._probe is None or self._probe.done():
+            self._probe = asyncio.ensure_future(self._probe_database())
+        return await asyncio.shield(self._probe)
+
+    def liveness(self) -> Dict[str, Any]:
+        """存活检查：进程能处理请求即可，不访问外部依赖"""
+        return {
+            "status": "alive",
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "uptime_seconds": round(time.monotonic() - self.started_at, 1),
+        }
+
+    async def readiness(self) -> Dict[str, Any]:
+        """就绪检查：数据库可访问且最近一段时间内事件循环没有被阻塞"""
+        database = await self.check_database()
+        loop_lag = recent_loop_lag()
+        pool = get_connection_pool_stats()
+
+        ready = database["status"] == "ok" and loop_lag <= settings.HEALTH_MAX_LOOP_LAG
+        return {
+            "status": "ready" if ready else "not_ready",
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "checks": {
+                "database": database,
+                "event_loop": {
+                    "lag_ms": round(loop_lag * 1000, 2),
+                    "max_lag_ms": settings.HEALTH_MAX_LOOP_LAG * 1000,
+                    "window_seconds": settings.HEALTH_LOOP_LAG_WINDOW,
+                },
+                "connection_pool": pool,
+            },
+        }
+
+
+# 创建全局实例
+health_service = HealthService()
@@ -0,0 +1,175 @@
+import asyncio
+import logging
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from ..core.config import settings
+from ..core.disk_cache import DiskLRUCache
+from ..core.metrics import register_cache_stats
+
+logger = logging.getLogger(__name__)
+
+# 扩展名 -> Pillow 输出格式；GIF 可能是动图，不做缩放
+PILLOW_FORMATS = {".jpg": "JPEG", ".png": "PNG", ".webp": "WEBP"}
+EXIF_ORIENTATION = 0x0112
+
+
+def _load_pillow():
+    """按需导入 Pillow（首次生成缩略图时才导入，不计入启动耗时）"""
+    try:
+        from PIL import Image, ImageOps
+    except ImportError:
+        raise ImportError("生成图片缩略图需要安装 Pillow: pip install Pillow")
+    return Image, ImageOps
+
+
+def render_image(source: Path, destination: Path, width: int, quality: int) -> None:
+    """把 source 缩放到不超过 width 像素宽，写入 destination（同步，在线程池中执行）
+
+    原图本身不超过目标宽度时直接复制，之后同样命中缓存。
+    """
+    image_format = PILLOW_FORMATS[source.suffix]
+    Image, ImageOps = _load_pillow()
+    with Image.open(source) as image:
+        # EXIF 方向为 5-8 时图片显示时会旋转 90 度，显示宽度是存储的高度
+        rotated = image.getexif().get(EXIF_ORIENTATION) in (5, 6, 7, 8)
+        if (image.height if rotated else image.width) <= width:
+            shutil.copyfile(source, destination)
+            return
+        # thumbnail 会对 JPEG 使用 draft 模式按 1/2、1/4、1/8 解码，比完整解码后再缩放快得多；
+        # 先缩放再按 EXIF 旋转，旋转的像素更少
+        box = (image.width, width) if rotated else (width, image.height)
+        image.thumbnail(box, Image.LANCZOS, reducing_gap=3.0)
+        image = ImageOps.exif_transpose(image)
+        if image_format == "JPEG":
+            if image.mode not in ("RGB", "L", "CMYK"):
+                image = image.convert("RGB")
+            image.save(destination, "JPEG", quality=quality, optimize=True, progressive=True)
+        elif image_format == "WEBP":
+            image.save(destination, "WEBP", quality=quality, method=4)
+        else:
+            image.save(destination, "PNG", optimize=True)
+
+
+class RenditionService:
+    """上传图片的缩略图服务
+
+    按宽度档位（如 thumb/card/full）在首次请求时生成缩略图，生成在线程池中进行，
+    同一缩略图的并发请求只生成一次；结果写入容量受限的磁盘 LRU 缓存，
+    之后的请求直接返回缓存文件，不再重新编码。
+    缓存文件名包含原图哈希、宽度和质量，可直接用作强 ETag。
+    """
+
+    def __init__(
+        self,
+        cache: DiskLRUCache,
+        sizes: Dict[str, int],
+        quality: int = 82,
+        workers: int = 2,
+    ):
+        self.cache = cache
+        self.sizes = sizes
+        self.quality = quality
+        self.workers = workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._pillow_available: Optional[bool] = None
+
+    def resolve_width(self, size: Optional[str] = None, width: Optional[int] = None) -> int:
+        """把尺寸名称或期望宽度映射到档位宽度（宽度向上取最近的档位，超出时取最大档位）"""
+        if size is not None:
+            if size not in self.sizes:
+                raise Exception(f"不支持的图片尺寸，可选: {', '.join(self.sizes)}")
+            return self.sizes[size]
+        widths = list(self.sizes.values())
+        return next((bucket for bucket in widths if bucket >= width), widths[-1])
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """获取缩略图线程池（首次使用时创建）"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers,
+                thread_name_prefix="image-rendition",
+            )
+        return self._executor
+
+    def pillow_available(self) -> bool:
+        if self._pillow_available is None:
+            try:
+                _load_pillow()
+                self._pillow_available = True
+            except ImportError as e:
+                logger.warning(f"{e}，缩略图请求将直接返回原图")
+                self._pillow_available = False
+        return self._pillow_available
+
+    async def get_rendition(self, source: Path, width: int) -> Tuple[Path, str]:
+        """获取 source 在指定宽度档位的缩略图
+
+        Returns:
+            (文件路径, 强 ETag)；GIF 或 Pillow 未安装时返回原图和原图的 ETag
+        """
+        if source.suffix not in PILLOW_FORMATS or not self.pillow_available():
+            return source, f'"{source.stem}"'
+
+        loop = asyncio.get_running_loop()
+        if not self.cache.loaded:
+            await loop.run_in_executor(self._get_executor(), self.cache.load)
+
+        name = f"{source.stem}-w{width}-q{self.quality}{source.suffix}"
+        etag = f'"{source.stem}-w{width}-q{self.quality}"'
+        path = self.cache.get(name)
+        if path is not None:
+            return path, etag
+
+        future = self._inflight.get(name)
+        if future is None:
+            future = loop.create_future()
+            self._inflight[name] = future
+            try:
+                temp_path = self.cache.temp_path(name)
+                try:
+                    await loop.run_in_executor(
+                        self._get_executor(), render_image, source, temp_path, width, self.quality
+                    )
+                except Exception as e:
+                    logger.error(f"缩略图生成失败: {source.name} (宽度 {width}): {str(e)}")
+                    try:
+                        os.unlink(temp_path)
+                    except FileNotFoundError:
+                        pass
+                    raise Exception("图片无法处理")
+                future.set_result(await self.cache.add(name, temp_path))
+            except asyncio.CancelledError:
+                future.cancel()
+                raise
+            except Exception as e:
+                future.set_exception(e)
+                # 没有其他请求等待时避免 "exception was never retrieved" 警告
+                future.exception()
+                raise
+            finally:
+                del self._inflight[name]
+        return await asyncio.shield(future), etag
+
+    def shutdown(self) -> None:
+        """关闭缩略图线程池"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+rendition_service = RenditionService(
+    DiskLRUCache(
+        settings.IMAGE_RENDITION_CACHE_DIR or os.path.join(settings.UPLOAD_DIR, ".renditions"),
+        settings.IMAGE_RENDITION_CACHE_MAX_BYTES,
+    ),
+    settings.get_image_rendition_sizes(),
+    quality=settings.IMAGE_RENDITION_QUALITY,
+    workers=settings.IMAGE_RENDITION_WORKERS,
+)
+
+register_cache_stats("image_rendition", rendition_service.cache.stats)
@@ -1,21 +1,218 @@
-from supabase import Client
-from typing import List, Optional, Dict, Any
+from postgrest import AsyncPostgrestClient, APIError
+import asyncio
+from typing import AsyncIterator, List, Optional, Dict, Any
 import logging
 from datetime import datetime
 
-from app.core.supabase_client import supabase_client
+from app.core.config import settings
+from app.core.supabase_client import get_async_postgrest_client
+from app.core.cache import TTLCache
+from app.core.metrics import register_cache_stats
+from app.core.pagination import encode_cursor
+from app.core.search_index import NewsSearchIndex
+from app.services.user_loader import UserLoader, get_request_loader
 from app.schemas.news import NewsCreate, NewsUpdate
 from app.schemas.user import UserCreate
-from app.core.security import get_password_hash, verify_password
+from app.core.security import get_password_hash_async, verify_password_async
+from app.core.exceptions import ConflictException, ServiceUnavailableException
 
 logger = logging.getLogger(__name__)
 
+# 新闻查询列（创建者信息由请求级用户加载器批量补充，不再逐行嵌入）
+# 显式列出，避免 search_vector（全文检索迁移添加的 tsvector 列）随每次查询和写入返回
+NEWS_COLUMNS = "id, title, description, image_url, creator_id, created_at, updated_at"
+
+# 创建者信息列
+CREATOR_COLUMNS = "id, username, email"
+
+# 用户公开信息列（与 UserResponse 一致，不含密码哈希）
+USER_PUBLIC_COLUMNS = "id, username, email, created_at"
+
+# 导出新闻的字段（扁平结构，便于写入 CSV）
+NEWS_EXPORT_FIELDS = ("id", "title", "description", "image_url", "creator_id", "created_at", "updated_at")
+
+# 未执行全文检索迁移时 PostgREST 返回的错误码（列不存在 / 函数不存在）
+MISSING_SEARCH_SCHEMA_CODES = {"42703", "42883", "PGRST202"}
+
+# PostgreSQL 唯一约束冲突错误码
+UNIQUE_VIOLATION_CODE = "23505"
+
 class SupabaseService:
-    def __init__(self):
-        # 使用全局的 supabase_client 实例，避免重复创建
-        self.supabase: Client = supabase_client
+    def __init__(self, client: Optional[AsyncPostgrestClient] = None):
+        # 默认使用全局共享连接池的异步客户端，首次访问时才创建
+        self._client = client
+        self._search_index = NewsSearchIndex()
+        # 并发请求同时发现索引过期时只重建一次
+        self._search_index_lock = asyncio.Lock()
+        # 已认证用户缓存（按用户ID），避免每个认证请求都查询一次用户表
+        self.user_cache = TTLCache(
+            maxsize=settings.USER_CACHE_MAX_SIZE,
+            ttl=settings.USER_CACHE_TTL
+        )
+
+    @property
+    def supabase(self) -> AsyncPostgrestClient:
+        """异步 PostgREST 客户端"""
+        if self._client is None:
+            self._client = get_async_postgrest_client()
+        return self._client
     
     # 新闻相关操作
+    def _build_news_query(
+        self,
+        columns: str,
+        keyword: Optional[str] = None,
+        creator_id: Optional[int] = None,
+        count: Optional[str] = None,
+        head: Optional[bool] = None,
+        search_mode: str = "ilike",
+    ):
+        """构建带筛选条件的新闻查询
+
+        search_mode:
+            ilike  - 标题/描述子串匹配（由 pg_trgm 三元组索引加速）
+            fts    - search_vector 全文检索，保留原有排序
+            ranked - 通过 search_news 函数按相关度排序
+        """
+        if keyword and search_mode == "ranked":
+            query = self.supabase.rpc(
+                "search_news",
+                {"search_query": keyword},
+                count=count,
+                head=bool(head),
+                get=True,
+            ).select(columns)
+        else:
+            query = self.supabase.table("news").select(columns, count=count, head=head)
+
+            # 添加搜索条件
+            if keyword and search_mode == "fts":
+                query = query.filter("search_vector", "wfts(simple)", keyword)
+            elif keyword:
+                query = query.or_(f"title.ilike.%{keyword}%,description.ilike.%{keyword}%")
+
+        if creator_id:
+            query = query.eq("creator_id", creator_id)
+
+        return query
+
+    @staticmethod
+    def _is_missing_search_schema(error: APIError) -> bool:
+        """判断是否因为未执行全文检索迁移而失败（列或函数不存在）"""
+        return error.code in MISSING_SEARCH_SCHEMA_CODES
+
+    async def _get_search_index(self) -> NewsSearchIndex:
+        """获取进程内倒排索引，过期时从数据库重建（同一时间只有一个请求重建）"""
+        if self._search_index.is_stale(settings.NEWS_SEARCH_INDEX_TTL):
+            async with self._search_index_lock:
+                if self._search_index.is_stale(settings.NEWS_SEARCH_INDEX_TTL):
+                    response = await self.supabase.table("news").select(
+                        "id, title, description, creator_id, created_at, updated_at"
+                    ).execute()
+                    self._search_index.rebuild(response.data)
+        return self._search_index
+
+    def _update_search_index(self, row: Dict[str, Any]) -> None:
+        """写操作后同步更新已构建的倒排索引"""
+        if self._search_index.built_at is not None:
+            self._search_index.add(row)
+
+    async def _search_docs_locally(
+        self,
+        keyword: str,
+        creator_id: Optional[int],
+        sort_by: str,
+        sort_order: str,
+        search_mode: str,
+    ) -> List[Dict[str, Any]]:
+        """在进程内倒排索引中搜索，返回排好序的索引文档"""
+        index = await self._get_search_index()
+        docs = [doc for doc, _ in index.search(keyword, creator_id=creator_id)]
+        if search_mode != "ranked":
+            docs.sort(
+                key=lambda doc: (doc.get(sort_by) or "", doc["id"]),
+                reverse=sort_order != "asc"
+            )
+        return docs
+
+    async def _get_news_rows_by_ids(self, news_ids: List[int]) -> List[Dict[str, Any]]:
+        """按给定顺序批量获取新闻（含创建者信息）"""
+        if not news_ids:
+            return []
+        response = await self.supabase.table("news").select(
+            NEWS_COLUMNS
+        ).in_("id", news_ids).execute()
+        rows_by_id = {row["id"]: row for row in response.data}
+        items = [rows_by_id[news_id] for news_id in news_ids if news_id in rows_by_id]
+        await self._attach_creators(items)
+        return items
+
+    async def _search_news_locally(
+        self,
+        page: int,
+        size: int,
+        keyword: str,
+        creator_id: Optional[int],
+        sort_by: str,
+        sort_order: str,
+        search_mode: str,
+    ) -> Dict[str, Any]:
+        """使用进程内倒排索引搜索新闻（未执行全文检索迁移的开发环境）"""
+        docs = await self._search_docs_locally(keyword, creator_id, sort_by, sort_order, search_mode)
+
+        total = len(docs)
+        offset = (page - 1) * size
+        items = await self._get_news_rows_by_ids([doc["id"] for doc in docs[offset:offset + size]])
+
+        return {
+            "items": items,
+            "total": total,
+            "page": page,
+            "size": size,
+            "pages": (total + size - 1) // size
+        }
+
+    async def _search_news_locally_by_cursor(
+        self,
+        size: int,
+        cursor: Optional[Dict[str, Any]],
+        keyword: str,
+        creator_id: Optional[int],
+        sort_by: str,
+        sort_order: str,
+        count_method: Optional[str],
+    ) -> Dict[str, Any]:
+        """使用进程内倒排索引按游标搜索新闻（未执行全文检索迁移的开发环境）"""
+        docs = await self._search_docs_locally(keyword, creator_id, sort_by, sort_order, "fts")
+        total = len(docs) if count_method else None
+
+        if cursor is not None:
+            position = (cursor["v"] or "", int(cursor["id"]))
+            if sort_order != "asc":
+                docs = [doc for doc in docs if (doc.get(sort_by) or "", doc["id"]) < position]
+            else:
+                docs = [doc for doc in docs if (doc.get(sort_by) or "", doc["id"]) > position]
+
+        has_more = len(docs) > size
+        items = await self._get_news_rows_by_ids([doc["id"] for doc in docs[:size]])
+        return {
+            "items": items,
+            "size": size,
+            "next_cursor": self._encode_news_cursor(items[-1], sort_by, sort_order) if has_more and items else None,
+            "has_more": has_more,
+            "total": total
+        }
+
+    @staticmethod
+    def _encode_news_cursor(last: Dict[str, Any], sort_by: str, sort_order: str) -> str:
+        """根据当前页最后一行生成下一页游标"""
+        return encode_cursor({
+            "k": sort_by,
+            "o": sort_order,
+            "v": last[sort_by],
+            "id": last["id"],
+        })
+
     async def get_news_list(
         self, 
         page: int = 1, 
@@ -23,44 +220,65 @@ class SupabaseService:
         keyword: Optional[str] = None,
         creator_id: Optional[int] = None,
         sort_by: str = "created_at",
-        sort_order: str = "desc"
+        sort_order: str = "desc",
+        count_method: str = "exact",
+        search_mode: str = "ilike"
     ) -> Dict[str, Any]:
-        """获取新闻列表"""
+        """获取新闻列表
+
+        数据与总数在同一次请求中返回（PostgREST 通过 Content-Range 携带总数）。
+        count_method 可选 exact/planned/estimated，大表上后两者避免 COUNT(*) 全表扫描。
+        search_mode 为 fts/ranked 但数据库未执行全文检索迁移时，回退到进程内倒排索引。
+        """
         try:
-            # 构建查询
-            query = self.supabase.table("news").select(
-                "*, creator:users(id, username, email)"
+            query = self._build_news_query(
+                NEWS_COLUMNS,
+                keyword=keyword,
+                creator_id=creator_id,
+                count=count_method,
+                search_mode=search_mode,
             )
             
-            # 添加搜索条件
-            if keyword:
-                query = query.or_(f"title.ilike.%{keyword}%,description.ilike.%{keyword}%")
-            
-            if creator_id:
-                query = query.eq("creator_id", creator_id)
-            
-            # 添加排序
-            ascending = sort_order == "asc"
-            query = query.order(sort_by, desc=not ascending)
+            # 添加排序（ranked 模式由 search_news 函数按相关度排序）
+            if not (keyword and search_mode == "ranked"):
+                ascending = sort_order == "asc"
+                query = query.order(sort_by, desc=not ascending)
             
             # 计算偏移量
             offset = (page - 1) * size
             
             # 执行查询
-            response = query.range(offset, offset + size - 1).execute()
-            
-            # 获取总数
-            count_query = self.supabase.table("news").select("id", count="exact")
-            if keyword:
-                count_query = count_query.or_(f"title.ilike.%{keyword}%,description.ilike.%{keyword}%")
-            if creator_id:
-                count_query = count_query.eq("creator_id", creator_id)
-            
-            count_response = count_query.execute()
-            total = count_response.count
+            try:
+                response = await query.range(offset, offset + size - 1).execute()
+                items = response.data
+                total = response.count
+            except APIError as e:
+                if keyword and search_mode != "ilike" and self._is_missing_search_schema(e):
+                    logger.warning(f"全文检索不可用，使用进程内索引: {e.message}")
+                    return await self._search_news_locally(
+                        page, size, keyword, creator_id, sort_by, sort_order, search_mode
+                    )
+                # 偏移量超出总数时 PostgREST 返回 416，此时单独查询总数
+                if e.code != "PGRST103":
+                    raise
+                count_response = await self._build_news_query(
+                    "id",
+                    keyword=keyword,
+                    creator_id=creator_id,
+                    count=count_method,
+                    head=True,
+                    search_mode=search_mode,
+                ).execute()
+                items = []
+                total = count_response.count
+
+            if total is None:
+                total = offset + len(items)
+
+            await self._attach_creators(items)
             
             return {
-                "items": response.data,
+                "items": items,
                 "total": total,
                 "page": page,
                 "size": size,
@@ -71,14 +289,170 @@ class SupabaseService:
             logger.error(f"获取新闻列表失败: {str(e)}")
             raise Exception(f"获取新闻列表失败: {str(e)}")
     
+    @staticmethod
+    def _quote_filter_value(value: Any) -> str:
+        """转义 PostgREST 过滤值（双引号包裹，避免逗号、括号破坏 or 语法）"""
+        text = str(value).replace("\\", "\\\\").replace('"', '\\"')
+        return f'"{text}"'
+
+    async def get_news_list_by_cursor(
+        self,
+        size: int = 10,
+        cursor: Optional[Dict[str, Any]] = None,
+        keyword: Optional[str] = None,
+        creator_id: Optional[int] = None,
+        sort_by: str = "created_at",
+        sort_order: str = "desc",
+        count_method: Optional[str] = None,
+        search_mode: str = "ilike"
+    ) -> Dict[str, Any]:
+        """按游标获取新闻列表（keyset 分页）
+
+        以 (sort_by, id) 作为排序键，每页只扫描 size + 1 行，深翻页与首页耗时相同。
+        cursor 为上一页 next_cursor 解码后的内容；count_method 为空时不统计总数。
+        search_mode 支持 ilike/fts（ranked 按相关度排序，无法使用 keyset 分页）。
+        """
+        try:
+            # 首页可以顺带统计总数，翻页时总数需单独查询
+            query = self._build_news_query(
+                NEWS_COLUMNS,
+                keyword=keyword,
+                creator_id=creator_id,
+                count=count_method if cursor is None else None,
+                search_mode=search_mode,
+            )
+
+            descending = sort_order != "asc"
+            if cursor is not None:
+                op = "lt" if descending else "gt"
+                value = self._quote_filter_value(cursor["v"])
+                # 使用顶层 and 参数，避免与关键词搜索的 or 参数冲突
+                query.params = query.params.add(
+                    "and",
+                    f"(or({sort_by}.{op}.{value},"
+                    f"and({sort_by}.eq.{value},id.{op}.{int(cursor['id'])})))"
+                )
+
+            query = query.order(sort_by, desc=descending).order("id", desc=descending)
+
+            # 多取一行用于判断是否还有下一页
+            try:
+                response = await query.limit(size + 1).execute()
+            except APIError as e:
+                if keyword and search_mode != "ilike" and self._is_missing_search_schema(e):
+                    logger.warning(f"全文检索不可用，使用进程内索引: {e.message}")
+                    return await self._search_news_locally_by_cursor(
+                        size, cursor, keyword, creator_id, sort_by, sort_order, count_method
+                    )
+                raise
+            rows = response.data
+            has_more = len(rows) > size
+            items = rows[:size]
+            await self._attach_creators(items)
+
+            total = response.count
+            if count_method and cursor is not None:
+                count_response = await self._build_news_query(
+                    "id",
+                    keyword=keyword,
+                    creator_id=creator_id,
+                    count=count_method,
+                    head=True,
+                    search_mode=search_mode,
+                ).execute()
+                total = count_response.count
+
+            next_cursor = None
+            if has_more:
+                next_cursor = self._encode_news_cursor(items[-1], sort_by, sort_order)
+
+            return {
+                "items": items,
+                "size": size,
+                "next_cursor": next_cursor,
+                "has_more": has_more,
+                "total": total
+            }
+
+        except Exception as e:
+            logger.error(f"获取新闻列表失败: {str(e)}")
+            raise Exception(f"获取新闻列表失败: {str(e)}")
+
+    async def iter_news_batches(
+        self,
+        keyword: Optional[str] = None,
+        creator_id: Optional[int] = None,
+        search_mode: str = "ilike",
+        batch_size: int = 500
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """按 id 顺序分批遍历所有匹配的新闻（keyset 分页）
+
+        每批只查询 batch_size 行且不统计总数，内存占用与总行数无关；
+        search_mode 支持 ilike/fts，不补充创建者信息。
+        fts 模式下数据库未执行全文检索迁移时，与列表接口一样回退到进程内倒排索引。
+        """
+        last_id = None
+        while True:
+            try:
+                query = self._build_news_query(
+                    ", ".join(NEWS_EXPORT_FIELDS),
+                    keyword=keyword,
+                    creator_id=creator_id,
+                    search_mode=search_mode,
+                )
+                if last_id is not None:
+                    query = query.gt("id", last_id)
+                response = await query.order("id").limit(batch_size).execute()
+            except APIError as e:
+                if keyword and search_mode != "ilike" and self._is_missing_search_schema(e):
+                    logger.warning(f"全文检索不可用，使用进程内索引: {e.message}")
+                    break
+                logger.error(f"导出新闻失败: {str(e)}")
+                raise Exception(f"导出新闻失败: {str(e)}")
+            except Exception as e:
+                logger.error(f"导出新闻失败: {str(e)}")
+                raise Exception(f"导出新闻失败: {str(e)}")
+
+            rows = response.data
+            if rows:
+                yield rows
+            if len(rows) < batch_size:
+                return
+            last_id = rows[-1]["id"]
+
+        async for rows in self._iter_news_batches_locally(keyword, creator_id, last_id, batch_size):
+            yield rows
+
+    async def _iter_news_batches_locally(
+        self,
+        keyword: str,
+        creator_id: Optional[int],
+        last_id: Optional[int],
+        batch_size: int,
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """按进程内倒排索引的匹配结果分批读取导出数据（按 id 升序）"""
+        try:
+            docs = await self._search_docs_locally(keyword, creator_id, "id", "asc", "fts")
+            news_ids = [doc["id"] for doc in docs if last_id is None or doc["id"] > last_id]
+            for start in range(0, len(news_ids), batch_size):
+                response = await self.supabase.table("news").select(
+                    ", ".join(NEWS_EXPORT_FIELDS)
+                ).in_("id", news_ids[start:start + batch_size]).order("id").execute()
+                if response.data:
+                    yield response.data
+        except Exception as e:
+            logger.error(f"导出新闻失败: {str(e)}")
+            raise Exception(f"导出新闻失败: {str(e)}")
+
     async def get_news_by_id(self, news_id: int) -> Optional[Dict[str, Any]]:
         """根据ID获取新闻"""
         try:
-            response = self.supabase.table("news").select(
-                "*, creator:users(id, username, email)"
+            response = await self.supabase.table("news").select(
+                NEWS_COLUMNS
             ).eq("id", news_id).execute()
             
             if response.data:
+                await self._attach_creators(response.data)
                 return response.data[0]
             return None
             
@@ -86,6 +460,19 @@ class SupabaseService:
             logger.error(f"获取新闻详情失败: {str(e)}")
             raise Exception(f"获取新闻详情失败: {str(e)}")
     
+    @staticmethod
+    def _returning(builder, columns: str):
+        """让写操作直接返回指定列，省去写后回读"""
+        builder.params = builder.params.add("select", columns.replace(" ", ""))
+        return builder
+
+    async def _raise_news_write_error(self, news_id: int, action: str) -> None:
+        """条件写入未命中时区分新闻不存在和没有权限（仅在失败路径上查询）"""
+        response = await self.supabase.table("news").select("id").eq("id", news_id).execute()
+        if not response.data:
+            raise Exception("新闻不存在")
+        raise Exception(f"没有权限{action}此新闻")
+
     async def create_news(self, news_data: NewsCreate, creator_id: int) -> Dict[str, Any]:
         """创建新闻"""
         try:
@@ -98,11 +485,15 @@ class SupabaseService:
                 "updated_at": datetime.utcnow().isoformat()
             }
             
-            response = self.supabase.table("news").insert(data).execute()
+            # 插入时直接返回新闻信息；创建者即当前用户，由请求级加载器直接提供
+            response = await self._returning(
+                self.supabase.table("news").insert(data), NEWS_COLUMNS
+            ).execute()
             
             if response.data:
-                # 获取完整的新闻信息（包含创建者信息）
-                return await self.get_news_by_id(response.data[0]["id"])
+                self._update_search_index(response.data[0])
+                await self._attach_creators(response.data)
+                return response.data[0]
             
             raise Exception("创建新闻失败")
             
@@ -110,56 +501,96 @@ class SupabaseService:
             logger.error(f"创建新闻失败: {str(e)}")
             raise Exception(f"创建新闻失败: {str(e)}")
     
+    async def create_news_batch(self, news_list: List[NewsCreate], creator_id: int) -> List[Dict[str, Any]]:
+        """批量创建新闻
+
+        所有条目在一条多行 INSERT 中写入，按输入顺序返回新记录（不含创建者信息）；
+        调用方负责按 NEWS_BATCH_CHUNK_SIZE 分块。
+        """
+        try:
+            now = datetime.utcnow().isoformat()
+            data = [
+                {
+                    "title": news_data.title,
+                    "description": news_data.description,
+                    "image_url": news_data.image_url,
+                    "creator_id": creator_id,
+                    "created_at": now,
+                    "updated_at": now
+                }
+                for news_data in news_list
+            ]
+
+            response = await self._returning(
+                self.supabase.table("news").insert(data), NEWS_COLUMNS
+            ).execute()
+
+            if len(response.data) != len(data):
+                raise Exception("批量创建新闻返回的条数不一致")
+
+            for row in response.data:
+                self._update_search_index(row)
+            return response.data
+
+        except Exception as e:
+            logger.error(f"批量创建新闻失败: {str(e)}")
+            raise Exception(f"批量创建新闻失败: {str(e)}")
+
     async def update_news(self, news_id: int, news_data: NewsUpdate, user_id: int) -> Dict[str, Any]:
-        """更新新闻"""
+        """更新新闻
+
+        按 id 和 creator_id 条件更新并直接返回完整记录，权限检查与更新在同一条语句中完成。
+        """
         try:
-            # 检查新闻是否存在且用户有权限
-            existing_news = await self.get_news_by_id(news_id)
-            if not existing_news:
-                raise Exception("新闻不存在")
-            
-            if existing_news["creator_id"] != user_id:
-                raise Exception("没有权限更新此新闻")
-            
             # 准备更新数据
             update_data = news_data.dict(exclude_unset=True)
             update_data["updated_at"] = datetime.utcnow().isoformat()
             
-            response = self.supabase.table("news").update(update_data).eq("id", news_id).execute()
+            response = await self._returning(
+                self.supabase.table("news").update(update_data), NEWS_COLUMNS
+            ).eq("id", news_id).eq("creator_id", user_id).execute()
             
             if response.data:
-                return await self.get_news_by_id(news_id)
+                self._update_search_index(response.data[0])
+                await self._attach_creators(response.data)
+                return response.data[0]
             
-            raise Exception("更新新闻失败")
+            await self._raise_news_write_error(news_id, "更新")
             
         except Exception as e:
             logger.error(f"更新新闻失败: {str(e)}")
             raise Exception(f"更新新闻失败: {str(e)}")
     
     async def delete_news(self, news_id: int, user_id: int) -> bool:
-        """删除新闻"""
+        """删除新闻
+
+        按 id 和 creator_id 条件删除，只返回被删除行的 id；
+        未删除任何行时才查询一次以区分新闻不存在和没有权限。
+        """
         try:
-            # 检查新闻是否存在且用户有权限
-            existing_news = await self.get_news_by_id(news_id)
-            if not existing_news:
-                raise Exception("新闻不存在")
-            
-            if existing_news["creator_id"] != user_id:
-                raise Exception("没有权限删除此新闻")
+            response = await self._returning(
+                self.supabase.table("news").delete(), "id"
+            ).eq("id", news_id).eq("creator_id", user_id).execute()
             
-            response = self.supabase.table("news").delete().eq("id", news_id).execute()
+            if not response.data:
+                await self._raise_news_write_error(news_id, "删除")
             
+            self._search_index.remove(news_id)
             return True
             
         except Exception as e:
             logger.error(f"删除新闻失败: {str(e)}")
             raise Exception(f"删除新闻失败: {str(e)}")
     
+    async def ping(self) -> None:
+        """探测数据库连通性（只读取一行的 id），失败时抛出异常"""
+        await self.supabase.table("users").select("id").limit(1).execute()
+
     # 用户相关操作
     async def get_user_by_email(self, email: str) -> Optional[Dict[str, Any]]:
         """根据邮箱获取用户"""
         try:
-            response = self.supabase.table("users").select("*").eq("email", email).execute()
+            response = await self.supabase.table("users").select("*").eq("email", email).execute()
             
             if response.data:
                 return response.data[0]
@@ -172,7 +603,7 @@ class SupabaseService:
     async def get_user_by_username(self, username: str) -> Optional[Dict[str, Any]]:
         """根据用户名获取用户"""
         try:
-            response = self.supabase.table("users").select("*").eq("username", username).execute()
+            response = await self.supabase.table("users").select("*").eq("username", username).execute()
             
             if response.data:
                 return response.data[0]
@@ -182,10 +613,12 @@ class SupabaseService:
             logger.error(f"获取用户失败: {str(e)}")
             raise Exception(f"获取用户失败: {str(e)}")
     
-    async def get_user_by_id(self, user_id: int) -> Optional[Dict[str, Any]]:
-        """根据ID获取用户"""
+    async def get_user_by_id(
+        self, user_id: int, columns: str = USER_PUBLIC_COLUMNS
+    ) -> Optional[Dict[str, Any]]:
+        """根据ID获取用户（默认只查询公开字段，不含密码）"""
         try:
-            response = self.supabase.table("users").select("*").eq("id", user_id).execute()
+            response = await self.supabase.table("users").select(columns).eq("id", user_id).execute()
             
             if response.data:
                 return response.data[0]
@@ -195,60 +628,169 @@ class SupabaseService:
             logger.error(f"获取用户失败: {str(e)}")
             raise Exception(f"获取用户失败: {str(e)}")
     
-    async def create_user(self, user_data: UserCreate) -> Dict[str, Any]:
-        """创建用户"""
+    async def get_users_by_ids(
+        self, user_ids: List[int], columns: str = CREATOR_COLUMNS
+    ) -> Dict[int, Dict[str, Any]]:
+        """批量获取用户公开信息（一次 in.(...) 查询，不含密码）"""
         try:
-            # 检查邮箱是否已存在
-            existing_user = await self.get_user_by_email(user_data.email)
-            if existing_user:
-                raise Exception("邮箱已被注册")
-            
-            # 检查用户名是否已存在
-            existing_username = await self.get_user_by_username(user_data.username)
-            if existing_username:
-                raise Exception("用户名已存在")
+            response = await self.supabase.table("users").select(
+                columns
+            ).in_("id", list(user_ids)).execute()
+            return {user["id"]: user for user in response.data}
             
+        except Exception as e:
+            logger.error(f"批量获取用户失败: {str(e)}")
+            raise Exception(f"批量获取用户失败: {str(e)}")
+
+    async def get_users(self, size: int = 20, after_id: Optional[int] = None) -> Dict[str, Any]:
+        """按 id 升序获取用户列表（keyset 分页，只返回公开信息）
+
+        每页只读取 size + 1 行，翻到任意深度耗时都相同；after_id 为上一页最后一个用户的 id。
+        """
+        try:
+            query = self.supabase.table("users").select(USER_PUBLIC_COLUMNS)
+            if after_id is not None:
+                query = query.gt("id", after_id)
+
+            # 多取一行用于判断是否还有下一页
+            response = await query.order("id").limit(size + 1).execute()
+            rows = response.data
+            has_more = len(rows) > size
+            items = rows[:size]
+
+            return {
+                "items": items,
+                "size": size,
+                "next_cursor": encode_cursor({"id": items[-1]["id"]}) if has_more else None,
+                "has_more": has_more,
+                "total": None
+            }
+
+        except Exception as e:
+            logger.error(f"获取用户列表失败: {str(e)}")
+            raise Exception(f"获取用户列表失败: {str(e)}")
+
+    async def load_users(self, user_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """用户加载器的批量查询：先读用户缓存，只查询未命中的用户并写入缓存
+
+        创建者信息与认证共用用户缓存，与 get_cached_user 一样最多滞后 USER_CACHE_TTL 秒。
+        """
+        users = {}
+        missing = []
+        for user_id in user_ids:
+            user = self.user_cache.get(user_id)
+            if user is None:
+                missing.append(user_id)
+            else:
+                users[user_id] = user
+        if missing:
+            fetched = await self.get_users_by_ids(missing, columns=USER_PUBLIC_COLUMNS)
+            for user_id, user in fetched.items():
+                self.user_cache.set(user_id, user)
+            users.update(fetched)
+        return users
+
+    def user_loader(self) -> UserLoader:
+        """当前请求的用户加载器，不在请求作用域内（如脚本调用）时使用一次性加载器"""
+        return get_request_loader() or UserLoader(self.load_users)
+
+    async def load_user(self, user_id: int) -> Optional[Dict[str, Any]]:
+        """通过请求级加载器获取用户公开信息，同一请求内与创建者信息共用一次查询"""
+        return await self.user_loader().load(user_id)
+
+    async def _attach_creators(self, rows: List[Dict[str, Any]]) -> None:
+        """为新闻补充创建者信息，同一页中的创建者只查询一次"""
+        if not rows:
+            return
+        creators = await self.user_loader().load_many(row["creator_id"] for row in rows)
+        for row in rows:
+            row["creator"] = creators.get(row["creator_id"])
+
+    async def get_cached_user(self, user_id: int) -> Optional[Dict[str, Any]]:
+        """根据ID获取用户公开信息（优先读取用户缓存）
+
+        缓存中只保存公开字段（USER_PUBLIC_COLUMNS），不含密码哈希。
+        目前没有修改或删除用户的接口，缓存不做主动失效，
+        数据库中直接修改的用户信息最多 USER_CACHE_TTL 秒后生效。
+        """
+        user = self.user_cache.get(user_id)
+        if user is None:
+            user = await self.get_user_by_id(user_id)
+            if user is not None:
+                self.user_cache.set(user_id, user)
+        return user
+
+    @staticmethod
+    def _unique_violation_message(error: APIError) -> str:
+        """根据唯一约束冲突的错误信息判断重复的字段"""
+        text = f"{error.message} {error.details}"
+        if "email" in text:
+            return "邮箱已被注册"
+        if "username" in text:
+            return "用户名已存在"
+        return "用户名或邮箱已存在"
+
+    async def create_user(self, user_data: UserCreate) -> Dict[str, Any]:
+        """创建用户
+
+        直接插入，由 users 表的 username/email 唯一约束检查重复，注册只需一次数据库往返。
+        """
+        try:
             data = {
                 "username": user_data.username,
                 "email": user_data.email,
-                "password": get_password_hash(user_data.password),
+                "password": await get_password_hash_async(user_data.password),
                 "created_at": datetime.utcnow().isoformat()
             }
             
-            response = self.supabase.table("users").insert(data).execute()
+            try:
+                response = await self.supabase.table("users").insert(data).execute()
+            except APIError as e:
+                if e.code == UNIQUE_VIOLATION_CODE:
+                    raise ConflictException(self._unique_violation_message(e))
+                raise
             
             if response.data:
                 return response.data[0]
             
             raise Exception("创建用户失败")
             
+        except (ConflictException, ServiceUnavailableException):
+            raise
         except Exception as e:
             logger.error(f"创建用户失败: {str(e)}")
             raise Exception(f"创建用户失败: {str(e)}")
     
     async def authenticate_user(self, username_or_email: str, password: str) -> Optional[Dict[str, Any]]:
-        """验证用户（支持用户名或邮箱登录）"""
+        """验证用户（支持用户名或邮箱登录）
+
+        用户名和邮箱在同一次查询中匹配，两者都命中时优先使用邮箱匹配的用户。
+        """
         try:
-            # 先尝试通过邮箱查找
-            user = await self.get_user_by_email(username_or_email)
+            value = self._quote_filter_value(username_or_email)
+            response = await self.supabase.table("users").select("*").or_(
+                f"email.eq.{value},username.eq.{value}"
+            ).limit(2).execute()
             
-            # 如果通过邮箱没找到，尝试通过用户名查找
-            if not user:
-                response = self.supabase.table("users").select("*").eq("username", username_or_email).execute()
-                if response.data:
-                    user = response.data[0]
-            
-            if not user:
+            if not response.data:
                 return None
             
-            if not verify_password(password, user["password"]):
+            user = next(
+                (row for row in response.data if row["email"] == username_or_email),
+                response.data[0]
+            )
+            
+            if not await verify_password_async(password, user["password"]):
                 return None
             
             return user
             
+        except ServiceUnavailableException:
+            raise
         except Exception as e:
             logger.error(f"用户验证失败: {str(e)}")
             return None
 
 # 创建全局实例
-supabase_service = SupabaseService()
\ No newline at end of file
+supabase_service = SupabaseService()
+register_cache_stats("user", supabase_service.user_cache.stats)
\ No newline at end of file
@@ -0,0 +1,258 @@
+import hashlib
+import logging
+import os
+import re
+import uuid
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+import aiofiles
+import aiofiles.os
+from multipart.multipart import MultipartParser, parse_options_header
+
+from ..core.config import settings
+from ..core.exceptions import PayloadTooLargeException
+
+logger = logging.getLogger(__name__)
+
+# 文件头签名 -> (存储扩展名, Content-Type)；扩展名以实际内容为准，不信任客户端文件名
+IMAGE_SIGNATURES: List[Tuple[bytes, str, str]] = [
+    (b"\xff\xd8\xff", ".jpg", "image/jpeg"),
+    (b"\x89PNG\r\n\x1a\n", ".png", "image/png"),
+    (b"GIF87a", ".gif", "image/gif"),
+    (b"GIF89a", ".gif", "image/gif"),
+]
+SNIFF_SIZE = 12
+
+# 同一种格式的不同扩展名写法
+EXTENSION_ALIASES = {".jpeg": ".jpg"}
+
+# 除文件内容外，multipart 边界、段头和普通字段允许占用的字节数
+MULTIPART_OVERHEAD = 64 * 1024
+
+# 上传文件的存储键：<哈希前两位>/<sha256><扩展名>
+UPLOAD_KEY_PATTERN = re.compile(r"^([0-9a-f]{2})/(\1[0-9a-f]{62})\.(jpg|png|gif|webp)$")
+
+CONTENT_TYPES = {
+    ".jpg": "image/jpeg",
+    ".png": "image/png",
+    ".gif": "image/gif",
+    ".webp": "image/webp",
+}
+
+
+def sniff_image_type(head: bytes) -> Optional[Tuple[str, str]]:
+    """根据文件头识别图片格式，返回 (扩展名, Content-Type)，无法识别时返回 None"""
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return ".webp", "image/webp"
+    for signature, extension, content_type in IMAGE_SIGNATURES:
+        if head.startswith(signature):
+            return extension, content_type
+    return None
+
+
+class _UploadPart:
+    """multipart 中正在解析的段"""
+
+    def __init__(self):
+        self.headers: Dict[bytes, bytes] = {}
+        self.field_name: Optional[str] = None
+        self.filename: Optional[str] = None
+
+
+class UploadService:
+    """图片上传服务
+
+    请求体按块流式解析并写入临时文件，边写边计算 sha256 和大小，超过限制立即中止；
+    写完后按内容哈希重命名到 UPLOAD_DIR/<前两位>/<sha256><扩展名>，
+    相同内容重复上传只保留一份文件。
+    """
+
+    def __init__(
+        self,
+        upload_dir: str,
+        max_file_size: int,
+        allowed_extensions: List[str],
+    ):
+        self.upload_dir = Path(upload_dir)
+        self.tmp_dir = self.upload_dir / ".tmp"
+        self.max_file_size = max_file_size
+        self.allowed_extensions = {
+            EXTENSION_ALIASES.get(extension.lower(), extension.lower())
+            for extension in allowed_extensions
+        }
+
+    def path_for(self, key: str) -> Optional[Path]:
+        """存储键对应的文件路径，键格式不合法时返回 None（防止路径穿越）"""
+        if not UPLOAD_KEY_PATTERN.match(key):
+            return None
+        return self.upload_dir / key
+
+    def check_content_length(self, content_length: Optional[str]) -> None:
+        """根据 Content-Length 提前拒绝明显超限的请求，不必读取请求体"""
+        if content_length is None:
+            return
+        try:
+            length = int(content_length)
+        except ValueError:
+            raise Exception("Content-Length 不合法")
+        if length > self.max_file_size + MULTIPART_OVERHEAD:
+            raise self._too_large_error()
+
+    def _too_large_error(self) -> PayloadTooLargeException:
+        return PayloadTooLargeException(f"文件大小超过限制（最大{self.max_file_size // (1024 * 1024)}MB）")
+
+    def _check_filename(self, filename: str) -> None:
+        extension = os.path.splitext(filename)[1].lower()
+        extension = EXTENSION_ALIASES.get(extension, extension)
+        if extension not in self.allowed_extensions:
+            raise Exception(f"不支持的文件类型，仅支持: {', '.join(sorted(self.allowed_extensions))}")
+
+    async def save_multipart(
+        self,
+        content_type: str,
+        stream: AsyncIterator[bytes],
+        field_name: str = "file",
+    ) -> Dict[str, Any]:
+        """流式解析 multipart/form-data 请求体并保存其中的图片文件
+
+        Args:
+            content_type: 请求的 Content-Type 头
+            stream: 请求体字节流（request.stream()）
+            field_name: 文件字段名
+
+        Returns:
+            {key, size, sha256, content_type, deduplicated}
+        """
+        mime_type, options = parse_options_header(content_type or "")
+        if mime_type != b"multipart/form-data" or b"boundary" not in options:
+            raise Exception("请求必须是包含 boundary 的 multipart/form-data")
+
+        # 解析器回调是同步的，只把事件记录下来，每块数据解析完后再异步写盘
+        events: List[Tuple[str, Any]] = []
+        header_name = bytearray()
+        header_value = bytearray()
+
+        def on_header_field(data: bytes, start: int, end: int) -> None:
+            header_name.extend(data[start:end])
+
+        def on_header_value(data: bytes, start: int, end: int) -> None:
+            header_value.extend(data[start:end])
+
+        def on_header_end() -> None:
+            events.append(("header", (bytes(header_name).lower(), bytes(header_value))))
+            header_name.clear()
+            header_value.clear()
+
+        callbacks = {
+            "on_part_begin": lambda: events.append(("begin", None)),
+            "on_header_field": on_header_field,
+            "on_header_value": on_header_value,
+            "on_header_end": on_header_end,
+            "on_headers_finished": lambda: events.append(("headers", None)),
+            "on_part_data": lambda data, start, end: events.append(("data", data[start:end])),
+            "on_part_end": lambda: events.append(("end", None)),
+        }
+        parser = MultipartParser(options[b"boundary"], callbacks)
+
+        await aiofiles.os.makedirs(self.tmp_dir, exist_ok=True)
+        tmp_path = self.tmp_dir / f"{uuid.uuid4().hex}.part"
+        hasher = hashlib.sha256()
+        size = 0
+        received = 0
+        head = b""
+        image_type: Optional[Tuple[str, str]] = None
+        part = _UploadPart()
+        in_file = False
+        file_done = False
+        file = None
+
+        try:
+            async for chunk in stream:
+                received += len(chunk)
+                if received > self.max_file_size + MULTIPART_OVERHEAD:
+                    raise self._too_large_error()
+                parser.write(chunk)
+
+                for event, value in events:
+                    if event == "begin":
+                        part = _UploadPart()
+                    elif event == "header":
+                        part.headers[value[0]] = value[1]
+                    elif event == "headers":
+                        _, disposition = parse_options_header(part.headers.get(b"content-disposition", b""))
+                        part.field_name = disposition.get(b"name", b"").decode("utf-8", "replace")
+                        if b"filename" in disposition:
+                            part.filename = disposition[b"filename"].decode("utf-8", "replace")
+                        in_file = part.field_name == field_name and part.filename is not None and not file_done
+                        if in_file:
+                            self._check_filename(part.filename)
+                            file = await aiofiles.open(tmp_path, "wb")
+                    elif event == "data" and in_file:
+                        size += len(value)
+                        if size > self.max_file_size:
+                            raise self._too_large_error()
+                        if image_type is None:
+                            head += value
+                            if len(head) < SNIFF_SIZE:
+                                continue
+                            image_type = self._check_image(head)
+                            value = head
+                        hasher.update(value)
+                        await file.write(value)
+                    elif event == "end" and in_file:
+                        in_file = False
+                        file_done = True
+                events.clear()
+            parser.finalize()
+
+            if not file_done:
+                raise Exception(f"缺少上传文件（字段名: {field_name}）")
+            if size == 0:
+                raise Exception("上传文件为空")
+            if image_type is None:
+                # 文件比文件头还短，最后再识别一次
+                image_type = self._check_image(head)
+                hasher.update(head)
+                await file.write(head)
+            await file.close()
+            file = None
+
+            digest = hasher.hexdigest()
+            extension, mime = image_type
+            key = f"{digest[:2]}/{digest}{extension}"
+            final_path = self.upload_dir / key
+            deduplicated = await aiofiles.os.path.exists(final_path)
+            if deduplicated:
+                await aiofiles.os.remove(tmp_path)
+            else:
+                await aiofiles.os.makedirs(final_path.parent, exist_ok=True)
+                await aiofiles.os.replace(tmp_path, final_path)
+            return {
+                "key": key,
+                "size": size,
+                "sha256": digest,
+                "content_type": mime,
+                "deduplicated": deduplicated,
+            }
+        except BaseException:
+            if file is not None:
+                await file.close()
+            try:
+                await aiofiles.os.remove(tmp_path)
+            except FileNotFoundError:
+                pass
+            raise
+
+    def _check_image(self, head: bytes) -> Tuple[str, str]:
+        image_type = sniff_image_type(head)
+        if image_type is None or image_type[0] not in self.allowed_extensions:
+            raise Exception("文件内容不是支持的图片格式")
+        return image_type
+
+
+upload_service = UploadService(
+    settings.UPLOAD_DIR,
+    settings.MAX_FILE_SIZE,
+    settings.get_allowed_extensions(),
+)
@@ -0,0 +1,84 @@
+import asyncio
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+# 批量查询函数：传入一组用户ID，返回 {用户ID: 用户数据}
+BatchFetch = Callable[[List[int]], Awaitable[Dict[int, Dict[str, Any]]]]
+
+
+class UserLoader:
+    """请求级用户批量加载器（DataLoader 模式）
+
+    同一轮事件循环内的 load() 调用被合并成一次 in.(...) 查询；
+    结果按用户ID缓存在加载器内，同一请求中重复加载不会再次查询。
+    """
+
+    def __init__(self, fetch: BatchFetch):
+        self._fetch = fetch
+        self._futures: Dict[int, asyncio.Future] = {}
+        self._pending: List[int] = []
+        self._scheduled = False
+        self.batches = 0
+
+    async def load(self, user_id: int) -> Optional[Dict[str, Any]]:
+        """加载单个用户，不存在时返回 None"""
+        future = self._futures.get(user_id)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._futures[user_id] = future
+            self._pending.append(user_id)
+            if not self._scheduled:
+                self._scheduled = True
+                loop.call_soon(lambda: asyncio.ensure_future(self._dispatch()))
+        return await future
+
+    async def load_many(self, user_ids: Iterable[int]) -> Dict[int, Optional[Dict[str, Any]]]:
+        """批量加载用户（去重后一次查询），返回 {用户ID: 用户数据}"""
+        unique_ids = list(dict.fromkeys(user_ids))
+        users = await asyncio.gather(*(self.load(user_id) for user_id in unique_ids))
+        return dict(zip(unique_ids, users))
+
+    def prime(self, user: Dict[str, Any]) -> None:
+        """把已查询到的用户放入加载器，后续加载直接复用"""
+        if user["id"] not in self._futures:
+            future = asyncio.get_running_loop().create_future()
+            future.set_result(user)
+            self._futures[user["id"]] = future
+
+    async def _dispatch(self) -> None:
+        user_ids, self._pending = self._pending, []
+        self._scheduled = False
+        self.batches += 1
+        try:
+            users = await self._fetch(user_ids)
+        except Exception as e:
+            for user_id in user_ids:
+                # 失败结果不缓存，下次加载重新查询
+                future = self._futures.pop(user_id)
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for user_id in user_ids:
+            future = self._futures[user_id]
+            if not future.done():
+                future.set_result(users.get(user_id))
+
+
+_current_loader: ContextVar[Optional[UserLoader]] = ContextVar("user_loader", default=None)
+
+
+def get_request_loader() -> Optional[UserLoader]:
+    """当前请求的用户加载器（不在请求作用域内时为 None）"""
+    return _current_loader.get()
+
+
+@contextmanager
+def user_loader_scope(fetch: BatchFetch):
+    """在作用域内使用同一个用户加载器，退出时丢弃其中缓存的用户"""
+    token = _current_loader.set(UserLoader(fetch))
+    try:
+        yield _current_loader.get()
+    finally:
+        _current_loader.reset(token)
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+新闻分页响应压缩微基准
+对比不同每页条数下各压缩方式的传输字节数和单次压缩 CPU 耗时：
+
+- identity: 不压缩
+- gzip-N / zstd-N: CompressionMiddleware 使用的一次性压缩，N 为压缩级别
+
+描述字段按固定种子从词表随机生成（默认 2000 字符），避免重复文本导致压缩率虚高。
+
+使用方法:
+python scripts/benchmark_compression.py
+python scripts/benchmark_compression.py --sizes 10,20,50,100 --iterations 200
+python scripts/benchmark_compression.py --gzip-levels 1,6,9 --zstd-levels 1,3,9
+"""
+
+import argparse
+import random
+import sys
+import time
+import zlib
+from pathlib import Path
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(Path(__file__).parent))
+
+import zstandard
+
+from app.core.pagination import PaginatedResponse
+from app.core.serialization import BulkSerializer
+from app.middleware.compression import CompressionMiddleware
+from app.schemas.news import NewsResponse
+from stub_postgrest import build_dataset
+
+WORDS = [
+    "专辑", "单曲", "巡演", "演唱会", "乐队", "歌手", "制作人", "音乐节", "榜单", "首发",
+    "摇滚", "民谣", "电子", "爵士", "古典", "说唱", "流行", "独立", "现场", "录音室",
+    "新歌", "合作", "发行", "预售", "门票", "粉丝", "编曲", "作词", "作曲", "MV",
+    "album", "tour", "live", "remix", "vinyl", "festival", "chart", "single", "band", "studio",
+    "，", "。", "、", "！", " ", "2024", "首次", "宣布", "全新", "限定",
+]
+
+
+def build_page(items: int, description_length: int, seed: int) -> bytes:
+    """生成一页新闻分页响应（与 GET /api/v1/news 相同的序列化方式）"""
+    rng = random.Random(seed)
+    dataset = build_dataset(items)
+    users = {user["id"]: user for user in dataset["users"]}
+    rows = []
+    for row in dataset["news"]:
+        description = ""
+        while len(description) < description_length:
+            description += rng.choice(WORDS)
+        rows.append({
+            **row,
+            "description": description[:description_length],
+            "creator": {key: users[row["creator_id"]][key] for key in ("id", "username", "email")},
+        })
+    result = {"items": rows, "total": items * 10, "page": 1, "size": items, "pages": 10}
+    return BulkSerializer(PaginatedResponse[NewsResponse]).dump(result)
+
+
+def measure(func, arg, iterations: int):
+    """返回每次调用的 CPU 耗时列表（毫秒）"""
+    func(arg)
+    timings = []
+    for _ in range(iterations):
+        started = time.process_time()
+        func(arg)
+        timings.append((time.process_time() - started) * 1000)
+    return timings
+
+
+def parse_ints(value: str):
+    return [int(item) for item in value.split(",") if item.strip()]
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="新闻分页响应压缩微基准")
+    parser.add_argument("--sizes", default="10,20,50,100", help="每页条数（逗号分隔）")
+    parser.add_argument("--description-length", type=int, default=2000, help="描述字段长度（字符）")
+    parser.add_argument("--gzip-levels", default="1,4,6", help="gzip 压缩级别（逗号分隔）")
+    parser.add_argument("--zstd-levels", default="1,3,6", help="zstd 压缩级别（逗号分隔）")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    codecs = [("identity", None, None)]
+    codecs += [(f"gzip-{level}", "gzip", CompressionMiddleware(None, gzip_level=level)) for level in parse_ints(args.gzip_levels)]
+    codecs += [(f"zstd-{level}", "zstd", CompressionMiddleware(None, zstd_level=level)) for level in parse_ints(args.zstd_levels)]
+    decompress = {
+        "gzip": lambda data: zlib.decompress(data, 31),
+        "zstd": lambda data: zstandard.ZstdDecompressor().decompress(data),
+    }
+
+    print("=" * 72)
+    print(f"News page compression ({args.description_length}-char descriptions, {args.iterations} runs)")
+    print("=" * 72)
+    print(f"{'items':>6}  {'codec':<10}{'bytes':>10}{'ratio':>8}{'mean(ms)':>10}{'p95(ms)':>10}{'MB/s':>9}")
+
+    for items in parse_ints(args.sizes):
+        body = build_page(items, args.description_length, args.seed)
+        for name, encoding, middleware in codecs:
+            if encoding is None:
+                print(f"{items:>6}  {name:<10}{len(body):>10}{1.0:>8.2f}{'-':>10}{'-':>10}{'-':>9}")
+                continue
+            compressed = middleware.compress(encoding, body)
+            if decompress[encoding](compressed) != body:
+                print(f"❌ {name} 解压结果与原始内容不一致")
+                sys.exit(1)
+            timings = sorted(measure(lambda data: middleware.compress(encoding, data), body, args.iterations))
+            mean = sum(timings) / len(timings)
+            throughput = len(body) / (mean / 1000) / 1e6 if mean else float("inf")
+            print(
+                f"{items:>6}  {name:<10}{len(compressed):>10}{len(body) / len(compressed):>8.2f}"
+                f"{mean:>10.3f}{timings[int(len(timings) * 0.95)]:>10.3f}{throughput:>9.0f}"
+            )
+        print("-" * 72)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+登录吞吐量压测脚本
+在登录高峰期间测量 POST /api/v1/users/login 的吞吐量，以及同时浏览新闻列表的延迟
+
+对比两种密码校验方式：
+- inline: 旧实现（在事件循环中同步执行 bcrypt）
+- pool:   当前实现（在有界线程池中执行 bcrypt）
+
+使用方法:
+python scripts/benchmark_login.py
+python scripts/benchmark_login.py --login-concurrency 20 --browse-concurrency 10 --duration 10
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from benchmark_news_list import percentile, run_stub, wait_ready
+
+PASSWORD = "benchmark123"
+
+
+def run_api(port: int, stub_port: int, mode: str):
+    """子进程：运行 API 服务"""
+    os.environ["SUPABASE_URL"] = f"http://127.0.0.1:{stub_port}"
+    os.environ["SUPABASE_KEY"] = "benchmark-key"
+    # 关闭响应缓存，测量的是数据访问路径而不是缓存命中
+    os.environ["RESPONSE_CACHE_BACKEND"] = "none"
+    os.chdir(project_root)
+
+    import logging
+    import uvicorn
+    from app.main import app
+    from app.services import supabase_service as service_module
+
+    logging.disable(logging.CRITICAL)
+    if mode == "inline":
+        from app.core.security import verify_password
+
+        async def verify_inline(plain_password, hashed_password):
+            return verify_password(plain_password, hashed_password)
+
+        service_module.verify_password_async = verify_inline
+
+    uvicorn.run(app, host="127.0.0.1", port=port, log_level="warning")
+
+
+async def run_mix(base_url: str, login_concurrency: int, browse_concurrency: int, duration: float):
+    """同时运行登录和浏览请求，返回统计结果"""
+    deadline = time.monotonic() + duration
+    login_latencies, browse_latencies = [], []
+    errors = {"login": 0, "browse": 0}
+    limits = httpx.Limits(max_connections=login_concurrency + browse_concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60.0) as client:
+        async def login_worker(worker_id: int):
+            payload = {"username": f"user{worker_id % 20 + 1}", "password": PASSWORD}
+            while time.monotonic() < deadline:
+                started = time.perf_counter()
+                response = await client.post("/api/v1/users/login", json=payload)
+                login_latencies.append(time.perf_counter() - started)
+                if response.status_code != 200:
+                    errors["login"] += 1
+
+        async def browse_worker(worker_id: int):
+            while time.monotonic() < deadline:
+                started = time.perf_counter()
+                response = await client.get("/api/v1/news", params={"page": worker_id % 10 + 1})
+                browse_latencies.append(time.perf_counter() - started)
+                if response.status_code != 200:
+                    errors["browse"] += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(
+            *(login_worker(i) for i in range(login_concurrency)),
+            *(browse_worker(i) for i in range(browse_concurrency)),
+        )
+        elapsed = time.perf_counter() - started
+
+    return {
+        "logins_per_sec": len(login_latencies) / elapsed,
+        "login_p50_ms": statistics.median(login_latencies) * 1000,
+        "browse_p50_ms": statistics.median(browse_latencies) * 1000,
+        "browse_p95_ms": percentile(browse_latencies, 95) * 1000,
+        "browse_p99_ms": percentile(browse_latencies, 99) * 1000,
+        "errors": errors["login"] + errors["browse"],
+    }
+
+
+def main():
+    """主函数"""
+    from passlib.context import CryptContext
+
+    parser = argparse.ArgumentParser(description="登录吞吐量压测")
+    parser.add_argument("--login-concurrency", type=int, default=20)
+    parser.add_argument("--browse-concurrency", type=int, default=10)
+    parser.add_argument("--duration", type=float, default=10.0, help="每种模式的压测时长（秒）")
+    parser.add_argument("--latency", type=float, default=5.0, help="桩服务注入延迟（毫秒）")
+    parser.add_argument("--modes", nargs="+", default=["inline", "pool"], choices=["inline", "pool"])
+    parser.add_argument("--stub-port", type=int, default=54321)
+    parser.add_argument("--api-port", type=int, default=8765)
+    args = parser.parse_args()
+
+    password_hash = CryptContext(schemes=["bcrypt"]).hash(PASSWORD)
+
+    ctx = multiprocessing.get_context("spawn")
+    stub = ctx.Process(
+        target=run_stub, args=(args.stub_port, args.latency, password_hash), daemon=True
+    )
+    stub.start()
+
+    print("=" * 72)
+    print("Login burst benchmark")
+    print(
+        f"Login clients: {args.login_concurrency}, browse clients: {args.browse_concurrency}, "
+        f"duration: {args.duration}s"
+    )
+    print("=" * 72)
+    print(
+        f"{'mode':<8}{'login/s':>10}{'login p50':>12}"
+        f"{'news p50':>12}{'news p95':>12}{'news p99':>12}{'errors':>8}"
+    )
+
+    try:
+        asyncio.run(wait_ready(f"http://127.0.0.1:{args.stub_port}/rest/v1/news"))
+        for mode in args.modes:
+            api = ctx.Process(target=run_api, args=(args.api_port, args.stub_port, mode), daemon=True)
+            api.start()
+            try:
+                base_url = f"http://127.0.0.1:{args.api_port}"
+                asyncio.run(wait_ready(f"{base_url}/health"))
+                result = asyncio.run(
+                    run_mix(base_url, args.login_concurrency, args.browse_concurrency, args.duration)
+                )
+                print(
+                    f"{mode:<8}{result['logins_per_sec']:>10.1f}{result['login_p50_ms']:>12.1f}"
+                    f"{result['browse_p50_ms']:>12.1f}{result['browse_p95_ms']:>12.1f}"
+                    f"{result['browse_p99_ms']:>12.1f}{result['errors']:>8}"
+                )
+            finally:
+                api.terminate()
+                api.join()
+    finally:
+        stub.terminate()
+        stub.join()
+
+
+if __name__ == "__main__":
+    main()
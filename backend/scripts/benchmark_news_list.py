@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+新闻列表接口压测脚本
+在本地 PostgREST 桩服务上测量 GET /api/v1/news 的吞吐量
+
+默认对比两种数据访问方式：
+- async: 当前实现（共享连接池的异步 PostgREST 客户端）
+- sync:  旧实现（在 async 处理函数中调用同步 supabase 客户端）
+
+使用方法:
+python scripts/benchmark_news_list.py
+python scripts/benchmark_news_list.py --concurrency 50 200 --requests 2000 --latency 20
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(Path(__file__).parent))
+
+
+class _SyncAdapter:
+    """把同步 postgrest 请求构造器包装成 await 接口（执行时阻塞事件循环，复现旧实现）"""
+
+    def __init__(self, target):
+        self._target = target
+
+    def __getattr__(self, name):
+        attr = getattr(self._target, name)
+        if name == "execute":
+            async def execute():
+                return attr()
+            return execute
+        if callable(attr):
+            def call(*args, **kwargs):
+                return _SyncAdapter(attr(*args, **kwargs))
+            return call
+        return attr
+
+
+def run_stub(port: int, latency_ms: float, password_hash: str = ""):
+    """子进程：运行 PostgREST 桩服务"""
+    import uvicorn
+    from stub_postgrest import create_stub_app
+
+    app = create_stub_app(latency_ms, password_hash=password_hash)
+    uvicorn.run(app, host="127.0.0.1", port=port, log_level="warning")
+
+
+def run_api(port: int, stub_port: int, mode: str):
+    """子进程：运行 API 服务"""
+    os.environ["SUPABASE_URL"] = f"http://127.0.0.1:{stub_port}"
+    os.environ["SUPABASE_KEY"] = "benchmark-key"
+    # 关闭响应缓存，测量的是数据访问路径而不是缓存命中
+    os.environ["RESPONSE_CACHE_BACKEND"] = "none"
+    os.chdir(project_root)
+
+    import logging
+    import uvicorn
+    from app.main import app
+    from app.services.supabase_service import supabase_service
+
+    logging.disable(logging.CRITICAL)
+    if mode == "sync":
+        from app.core.supabase_client import supabase_client
+        supabase_service._client = _SyncAdapter(supabase_client)
+
+    uvicorn.run(app, host="127.0.0.1", port=port, log_level="warning")
+
+
+async def wait_ready(url: str, timeout: float = 30.0):
+    """等待服务可用"""
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            try:
+                await client.get(url)
+                return
+            except httpx.TransportError:
+                await asyncio.sleep(0.2)
+    raise RuntimeError(f"服务未就绪: {url}")
+
+
+async def load(url: str, concurrency: int, total_requests: int):
+    """以固定并发数发送请求，返回 (requests/sec, 延迟列表, 失败数)"""
+    latencies = []
+    errors = 0
+    remaining = total_requests
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(limits=limits, timeout=60.0) as client:
+        async def worker(worker_id: int):
+            nonlocal remaining, errors
+            page = worker_id % 10 + 1
+            while remaining > 0:
+                remaining -= 1
+                started = time.perf_counter()
+                try:
+                    response = await client.get(url, params={"page": page, "size": 10})
+                    if response.status_code != 200:
+                        errors += 1
+                except httpx.HTTPError:
+                    errors += 1
+                latencies.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(i) for i in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    return len(latencies) / elapsed, latencies, errors
+
+
+def percentile(values, pct: float) -> float:
+    """计算百分位数"""
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="GET /api/v1/news 压测")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[50, 200])
+    parser.add_argument("--requests", type=int, default=2000, help="每个并发级别的请求总数")
+    parser.add_argument("--latency", type=float, default=20.0, help="桩服务注入延迟（毫秒）")
+    parser.add_argument("--modes", nargs="+", default=["sync", "async"], choices=["sync", "async"])
+    parser.add_argument("--stub-port", type=int, default=54321)
+    parser.add_argument("--api-port", type=int, default=8765)
+    args = parser.parse_args()
+
+    ctx = multiprocessing.get_context("spawn")
+    stub = ctx.Process(target=run_stub, args=(args.stub_port, args.latency), daemon=True)
+    stub.start()
+
+    print("=" * 60)
+    print("GET /api/v1/news benchmark")
+    print(f"Stub latency: {args.latency}ms, requests per level: {args.requests}")
+    print("=" * 60)
+    print(f"{'mode':<8}{'clients':>8}{'req/s':>10}{'p50(ms)':>10}{'p95(ms)':>10}{'errors':>8}")
+
+    try:
+        asyncio.run(wait_ready(f"http://127.0.0.1:{args.stub_port}/rest/v1/news"))
+        for mode in args.modes:
+            api = ctx.Process(target=run_api, args=(args.api_port, args.stub_port, mode), daemon=True)
+            api.start()
+            try:
+                base_url = f"http://127.0.0.1:{args.api_port}"
+                asyncio.run(wait_ready(f"{base_url}/health"))
+                for concurrency in args.concurrency:
+                    rps, latencies, errors = asyncio.run(
+                        load(f"{base_url}/api/v1/news", concurrency, args.requests)
+                    )
+                    print(
+                        f"{mode:<8}{concurrency:>8}{rps:>10.1f}"
+                        f"{statistics.median(latencies) * 1000:>10.1f}"
+                        f"{percentile(latencies, 95) * 1000:>10.1f}{errors:>8}"
+                    )
+            finally:
+                api.terminate()
+                api.join()
+    finally:
+        stub.terminate()
+        stub.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+新闻分页响应序列化微基准
+对比一页新闻（默认100条）在两种序列化方式下的单次 CPU 耗时：
+
+- model:  旧实现（逐行 NewsResponse(**item) + PaginatedResponse.create，
+          再经 jsonable_encoder 和 json.dumps 编码）
+- bulk:   当前实现（TypeAdapter 整页校验一次 + orjson 编码）
+
+使用方法:
+python scripts/benchmark_serialization.py
+python scripts/benchmark_serialization.py --items 100 --iterations 500
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from fastapi.encoders import jsonable_encoder
+
+from app.core.pagination import PaginatedResponse
+from app.core.serialization import BulkSerializer, orjson
+from app.schemas.news import NewsResponse
+from stub_postgrest import build_dataset
+
+
+def serialize_models(result) -> bytes:
+    """旧实现：逐行构造模型，再整体转换和编码"""
+    page = PaginatedResponse.create(
+        items=[NewsResponse(**item) for item in result["items"]],
+        total=result["total"],
+        page=result["page"],
+        size=result["size"]
+    )
+    return json.dumps(
+        jsonable_encoder(page),
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+def measure(func, arg, iterations: int):
+    """返回每次调用的 CPU 耗时列表（毫秒）"""
+    func(arg)
+    timings = []
+    for _ in range(iterations):
+        started = time.process_time()
+        func(arg)
+        timings.append((time.process_time() - started) * 1000)
+    return timings
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="新闻分页响应序列化微基准")
+    parser.add_argument("--items", type=int, default=100, help="每页条数")
+    parser.add_argument("--iterations", type=int, default=500)
+    args = parser.parse_args()
+
+    dataset = build_dataset(args.items)
+    users = {user["id"]: user for user in dataset["users"]}
+    rows = [
+        {**row, "creator": {key: users[row["creator_id"]][key] for key in ("id", "username", "email")}}
+        for row in dataset["news"]
+    ]
+    result = {
+        "items": rows,
+        "total": args.items * 10,
+        "page": 1,
+        "size": args.items,
+        "pages": 10,
+    }
+    bulk = BulkSerializer(PaginatedResponse[NewsResponse])
+
+    if json.loads(serialize_models(result)) != json.loads(bulk.dump(result)):
+        print("❌ 两种序列化方式的输出不一致")
+        sys.exit(1)
+
+    print("=" * 60)
+    print(f"Paginated news serialization ({args.items} items/page, {args.iterations} runs)")
+    print(f"orjson: {'available' if orjson is not None else 'missing (stdlib json fallback)'}")
+    print("=" * 60)
+    print(f"{'mode':<8}{'mean(ms)':>10}{'p50(ms)':>10}{'p95(ms)':>10}{'bytes':>10}")
+
+    means = {}
+    for name, func in (("model", serialize_models), ("bulk", bulk.dump)):
+        timings = sorted(measure(func, result, args.iterations))
+        means[name] = sum(timings) / len(timings)
+        print(
+            f"{name:<8}{means[name]:>10.3f}{timings[len(timings) // 2]:>10.3f}"
+            f"{timings[int(len(timings) * 0.95)]:>10.3f}{len(func(result)):>10}"
+        )
+    print("-" * 60)
+    print(f"Speedup: {means['model'] / means['bulk']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
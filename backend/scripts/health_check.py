@@ -122,7 +122,8 @@ def main():
     
     endpoints = [
         ("/", "Root endpoint"),
-        ("/health", "Health check"),
+        ("/health/live", "Liveness check"),
+        ("/health/ready", "Readiness check"),
         ("/api/v1/docs", "API documentation"),
         ("/api/v1/openapi.json", "OpenAPI schema"),
     ]
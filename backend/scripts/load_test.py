@@ -0,0 +1,368 @@
+#!/usr/bin/env python3
+"""
+负载测试脚本
+按真实的请求组合对 API 施压，输出每个场景的吞吐量和 p50/p95/p99 延迟（JSON）
+
+默认在进程内运行：API 通过 ASGI 传输层调用，数据访问使用内存 PostgREST 替身，不需要启动任何服务；
+也可以用 --base-url 对已经运行的服务压测（需要数据库中存在 user1..userN 且密码为 --password）。
+进程内的替身与 API 共用同一个 CPU，结果适合对比不同提交之间的相对变化。
+
+场景：
+- feed:   匿名浏览新闻列表，随机翻到较深的页
+- scroll: 游标分页连续下拉（每次请求取下一页，到底后从头开始）
+- search: 关键词搜索
+- detail: 新闻详情
+- login:  登录（bcrypt 校验）
+- write:  已登录用户发布新闻
+
+使用方法:
+python scripts/load_test.py
+python scripts/load_test.py --concurrency 50 --duration 30 --mix feed=50,search=20,login=10,write=20
+python scripts/load_test.py --output after.json --compare before.json
+python scripts/load_test.py --base-url http://127.0.0.1:8000 --password secret
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(Path(__file__).parent))
+
+PASSWORD = "benchmark123"
+DEFAULT_MIX = "feed=40,scroll=15,search=15,detail=10,login=5,write=15"
+STUB_URL = "http://postgrest-stub"
+
+
+def parse_mix(text: str):
+    """解析场景权重，如 feed=60,search=20,login=20"""
+    mix = {}
+    for item in text.split(","):
+        name, _, weight = item.partition("=")
+        name = name.strip()
+        if name not in SCENARIOS:
+            raise argparse.ArgumentTypeError(f"未知场景: {name}（可选: {', '.join(SCENARIOS)}）")
+        mix[name] = float(weight or 1)
+    if not any(mix.values()):
+        raise argparse.ArgumentTypeError("至少需要一个权重大于 0 的场景")
+    return mix
+
+
+def percentile(values, pct: float) -> float:
+    """计算百分位数（最近秩法）"""
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+class Worker:
+    """单个虚拟用户：按权重随机选择场景，持续发送请求直到压测结束"""
+
+    def __init__(self, worker_id: int, client: httpx.AsyncClient, args, tokens, results):
+        self.id = worker_id
+        self.client = client
+        self.args = args
+        self.random = random.Random(args.seed * 100003 + worker_id)
+        self.user_index = worker_id % args.users + 1
+        self.token = tokens.get(self.user_index)
+        self.results = results
+        self.cursor = ""
+
+    async def feed(self):
+        # 深分页：页码在整个数据集范围内均匀分布
+        page = self.random.randint(1, max(1, self.args.news // self.args.page_size))
+        return await self.client.get(
+            "/api/v1/news", params={"page": page, "size": self.args.page_size}
+        )
+
+    async def scroll(self):
+        response = await self.client.get(
+            "/api/v1/news", params={"cursor": self.cursor, "size": self.args.page_size}
+        )
+        if response.status_code == 200:
+            self.cursor = response.json().get("next_cursor") or ""
+        return response
+
+    async def search(self):
+        keyword = str(self.random.randint(1, self.args.news))
+        return await self.client.get(
+            "/api/v1/news", params={"keyword": keyword, "size": self.args.page_size}
+        )
+
+    async def detail(self):
+        news_id = self.random.randint(1, self.args.news)
+        return await self.client.get(f"/api/v1/news/{news_id}")
+
+    async def login(self):
+        return await self.client.post(
+            "/api/v1/users/login",
+            json={"username": f"user{self.user_index}", "password": self.args.password},
+        )
+
+    async def write(self):
+        return await self.client.post(
+            "/api/v1/news",
+            json={
+                "title": f"压测新闻 {self.id}-{self.random.randint(1, 10 ** 9)}",
+                "description": "负载测试生成的新闻内容",
+                "image_url": "https://example.com/images/load-test.jpg",
+            },
+            headers={"Authorization": f"Bearer {self.token}"},
+        )
+
+    async def run(self, deadline: float, measure_after: float):
+        names = list(self.args.mix)
+        weights = [self.args.mix[name] for name in names]
+        while time.monotonic() < deadline:
+            name = self.random.choices(names, weights)[0]
+            started = time.perf_counter()
+            try:
+                response = await getattr(self, name)()
+                status = response.status_code
+            except httpx.HTTPError:
+                status = None
+            elapsed = time.perf_counter() - started
+            # 预热阶段的请求不计入统计
+            if time.monotonic() >= measure_after:
+                self.results[name].append((elapsed, status))
+
+
+SCENARIOS = {
+    "feed": "GET /api/v1/news?page=N",
+    "scroll": "GET /api/v1/news?cursor=...",
+    "search": "GET /api/v1/news?keyword=...",
+    "detail": "GET /api/v1/news/{news_id}",
+    "login": "POST /api/v1/users/login",
+    "write": "POST /api/v1/news",
+}
+
+# 各场景视为成功的状态码
+EXPECTED_STATUS = {"write": (201,)}
+
+
+def create_in_process_app(args):
+    """在进程内组装 API 与内存 PostgREST 替身，返回 API 的 ASGI 应用"""
+    os.environ["SUPABASE_URL"] = STUB_URL
+    os.environ["SUPABASE_KEY"] = "load-test-key"
+    os.environ.setdefault("DEBUG", "false")
+    os.environ["RESPONSE_CACHE_BACKEND"] = args.response_cache
+    os.chdir(project_root)
+
+    from passlib.context import CryptContext
+    from postgrest import AsyncPostgrestClient
+    from stub_postgrest import create_stub_database
+
+    from app.core.config import settings
+    from app.core.memory_postgrest import InMemoryPostgRESTTransport
+    from app.core.supabase_client import PostgRESTMetricsTransport
+    from app.main import app
+    from app.services.supabase_service import supabase_service
+
+    password_hash = CryptContext(schemes=["bcrypt"]).hash(args.password)
+    database = create_stub_database(args.news, password_hash=password_hash)
+
+    # 与 get_async_postgrest_client 相同的客户端配置，只是把网络传输换成内存替身
+    http_client = httpx.AsyncClient(
+        transport=PostgRESTMetricsTransport(InMemoryPostgRESTTransport(database, args.latency)),
+        timeout=settings.SUPABASE_TIMEOUT,
+    )
+    supabase_service._client = AsyncPostgrestClient(
+        f"{STUB_URL}/rest/v1",
+        headers={
+            "Accept": "application/json",
+            "Content-Type": "application/json",
+            "apikey": settings.SUPABASE_KEY,
+            "Authorization": f"Bearer {settings.SUPABASE_KEY}",
+        },
+        http_client=http_client,
+    )
+    return app
+
+
+async def login_users(client: httpx.AsyncClient, args):
+    """预先为每个虚拟用户登录，获取发布新闻所需的令牌"""
+    tokens = {}
+    for index in range(1, args.users + 1):
+        response = await client.post(
+            "/api/v1/users/login",
+            json={"username": f"user{index}", "password": args.password},
+        )
+        if response.status_code == 200:
+            tokens[index] = response.json()["access_token"]
+    if "write" in args.mix and not tokens:
+        raise RuntimeError("所有用户登录失败，无法执行 write 场景（检查 --password 或 --users）")
+    return tokens
+
+
+async def run_load(args):
+    """执行压测，返回各场景的 (耗时, 状态码) 列表和实际统计时长"""
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    if args.base_url:
+        client = httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=60.0)
+    else:
+        app = create_in_process_app(args)
+        client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://testserver", timeout=60.0
+        )
+
+    results = {name: [] for name in args.mix}
+    async with client:
+        tokens = await login_users(client, args)
+        started = time.monotonic()
+        measure_after = started + args.warmup
+        deadline = measure_after + args.duration
+        workers = [Worker(i, client, args, tokens, results) for i in range(args.concurrency)]
+        await asyncio.gather(*(worker.run(deadline, measure_after) for worker in workers))
+        elapsed = time.monotonic() - measure_after
+    return results, elapsed
+
+
+def summarize(samples, elapsed: float, expected=(200,)):
+    """单个场景的统计结果（延迟单位为毫秒）"""
+    latencies = [latency * 1000 for latency, _ in samples]
+    errors = sum(1 for _, status in samples if status not in expected)
+    summary = {"requests": len(samples), "errors": errors, "rps": round(len(samples) / elapsed, 1)}
+    if latencies:
+        summary.update({
+            "mean_ms": round(statistics.fmean(latencies), 2),
+            "p50_ms": round(percentile(latencies, 50), 2),
+            "p95_ms": round(percentile(latencies, 95), 2),
+            "p99_ms": round(percentile(latencies, 99), 2),
+            "max_ms": round(max(latencies), 2),
+        })
+    return summary
+
+
+def git_commit():
+    """当前代码的提交号（用于跨提交对比）"""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=project_root, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def build_report(args, results, elapsed: float):
+    endpoints = {
+        name: {"endpoint": SCENARIOS[name], **summarize(samples, elapsed, EXPECTED_STATUS.get(name, (200,)))}
+        for name, samples in results.items()
+    }
+    total = summarize([sample for samples in results.values() for sample in samples], elapsed)
+    total["errors"] = sum(summary["errors"] for summary in endpoints.values())
+    return {
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "config": {
+            "target": args.base_url or "in-process",
+            "concurrency": args.concurrency,
+            "duration": args.duration,
+            "warmup": args.warmup,
+            "mix": args.mix,
+            "seed": args.seed,
+            "stub_latency_ms": None if args.base_url else args.latency,
+            "response_cache": None if args.base_url else args.response_cache,
+            "news": args.news,
+            "page_size": args.page_size,
+        },
+        "total": total,
+        "endpoints": endpoints,
+    }
+
+
+def print_report(report, baseline=None):
+    """打印结果表格；指定基线时附带与基线相比的变化"""
+    print("=" * 84)
+    config = report["config"]
+    print(
+        f"Load test @ {report['commit'] or 'unknown'}: {config['target']}, "
+        f"{config['concurrency']} clients, {config['duration']}s"
+    )
+    print("=" * 84)
+    print(
+        f"{'scenario':<10}{'requests':>10}{'errors':>8}{'req/s':>10}"
+        f"{'p50(ms)':>10}{'p95(ms)':>10}{'p99(ms)':>10}{'max(ms)':>10}"
+    )
+    rows = list(report["endpoints"].items()) + [("total", report["total"])]
+    for name, summary in rows:
+        print(
+            f"{name:<10}{summary['requests']:>10}{summary['errors']:>8}{summary['rps']:>10.1f}"
+            f"{summary.get('p50_ms') or 0:>10.1f}{summary.get('p95_ms') or 0:>10.1f}"
+            f"{summary.get('p99_ms') or 0:>10.1f}{summary.get('max_ms') or 0:>10.1f}"
+        )
+
+    if baseline:
+        print("-" * 84)
+        print(f"Compared with {baseline.get('commit') or 'baseline'}:")
+        base_rows = dict(baseline.get("endpoints", {}), total=baseline.get("total", {}))
+        for name, summary in rows:
+            base = base_rows.get(name)
+            if not base:
+                continue
+            deltas = []
+            for key in ("rps", "p50_ms", "p99_ms"):
+                if summary.get(key) and base.get(key):
+                    deltas.append(f"{key} {(summary[key] - base[key]) / base[key] * 100:+.1f}%")
+            print(f"  {name:<10}{', '.join(deltas)}")
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="API 负载测试")
+    parser.add_argument("--concurrency", type=int, default=20, help="并发虚拟用户数")
+    parser.add_argument("--duration", type=float, default=10.0, help="统计时长（秒）")
+    parser.add_argument("--warmup", type=float, default=1.0, help="预热时长（秒），不计入统计")
+    parser.add_argument("--mix", type=parse_mix, default=DEFAULT_MIX, help=f"场景权重（默认 {DEFAULT_MIX}）")
+    parser.add_argument("--seed", type=int, default=1, help="随机种子，便于复现同一请求序列")
+    parser.add_argument("--latency", type=float, default=5.0, help="替身注入延迟（毫秒）")
+    parser.add_argument("--news", type=int, default=5000, help="新闻条数（决定分页深度和详情 id 范围）")
+    parser.add_argument("--users", type=int, default=20, help="虚拟用户使用的账号数")
+    parser.add_argument("--page-size", type=int, default=10)
+    parser.add_argument("--password", default=PASSWORD, help="账号密码")
+    parser.add_argument(
+        "--response-cache",
+        choices=["none", "memory"],
+        default="none",
+        help="进程内运行时的响应缓存后端（默认 none，测量数据访问路径而不是缓存命中）",
+    )
+    parser.add_argument("--base-url", help="压测已运行的服务，不指定时在进程内运行")
+    parser.add_argument("--output", help="JSON 报告输出路径")
+    parser.add_argument("--compare", help="基线 JSON 报告路径，打印与基线的差异")
+    args = parser.parse_args()
+    if isinstance(args.mix, str):
+        args.mix = parse_mix(args.mix)
+    args.mix = {name: weight for name, weight in args.mix.items() if weight > 0}
+    # 进程内运行时会切换工作目录，先把路径转为绝对路径
+    output = Path(args.output).resolve() if args.output else None
+    baseline = json.loads(Path(args.compare).read_text(encoding="utf-8")) if args.compare else None
+
+    logging.disable(logging.CRITICAL)
+    results, elapsed = asyncio.run(run_load(args))
+    report = build_report(args, results, elapsed)
+
+    print_report(report, baseline)
+
+    if output:
+        output.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"\n报告已写入 {output}")
+    else:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+
+    return 1 if report["total"]["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+冷启动导入耗时分析脚本
+以 VERCEL=1 运行 `python -X importtime -c "import api.index"`，汇总最耗时的模块，
+并检查导入总耗时预算以及不应出现在请求路径上的模块（SQLAlchemy、alembic、supabase 同步客户端等）
+
+超出预算或导入了禁止的模块时以非零状态退出；CI 中由 tests/test_import_budget.py 执行同样的检查
+
+使用方法:
+python scripts/profile_import.py
+python scripts/profile_import.py --budget-ms 1000 --top 20 --runs 3
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+# 项目根目录
+project_root = Path(__file__).parent.parent
+
+# 请求路径上不应导入的模块（顶层包名；PIL 在首次生成缩略图时才导入）
+FORBIDDEN_MODULES = ["sqlalchemy", "alembic", "supabase", "realtime", "storage3", "gotrue", "PIL"]
+
+
+def profile_import(target: str):
+    """在子进程中导入目标模块，返回 [(模块名, 自身耗时us, 累计耗时us), ...]"""
+    env = dict(os.environ, VERCEL="1", PYTHONDONTWRITEBYTECODE="1")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        cwd=project_root,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"导入 {target} 失败:\n{result.stderr}")
+
+    records = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        records.append((name.strip(), int(self_us), int(cumulative_us)))
+    return records
+
+
+def total_time_us(records, target: str) -> int:
+    """目标模块的累计导入耗时"""
+    for name, _, cumulative in records:
+        if name == target:
+            return cumulative
+    return sum(self_us for _, self_us, _ in records)
+
+
+def find_forbidden(records):
+    """找出被导入的禁止模块"""
+    imported = {name.split(".")[0] for name, _, _ in records}
+    return [module for module in FORBIDDEN_MODULES if module in imported]
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="冷启动导入耗时分析")
+    parser.add_argument("--target", default="api.index", help="要导入的入口模块")
+    parser.add_argument("--budget-ms", type=float, default=1000.0, help="导入总耗时预算（毫秒）")
+    parser.add_argument("--top", type=int, default=15, help="显示累计耗时最高的模块数量")
+    parser.add_argument("--runs", type=int, default=3, help="运行次数（取最快一次，减少磁盘缓存抖动）")
+    args = parser.parse_args()
+
+    best = None
+    for _ in range(max(1, args.runs)):
+        records = profile_import(args.target)
+        if best is None or total_time_us(records, args.target) < total_time_us(best, args.target):
+            best = records
+
+    total_ms = total_time_us(best, args.target) / 1000
+    print("=" * 60)
+    print(f"Import profile: {args.target} (VERCEL=1, best of {args.runs})")
+    print("=" * 60)
+    print(f"{'cumulative(ms)':>15}{'self(ms)':>10}  module")
+    for name, self_us, cumulative_us in sorted(best, key=lambda r: r[2], reverse=True)[:args.top]:
+        print(f"{cumulative_us / 1000:>15.1f}{self_us / 1000:>10.1f}  {name}")
+    print("-" * 60)
+    print(f"Total: {total_ms:.1f}ms (budget {args.budget_ms:.0f}ms)")
+
+    failed = False
+    forbidden = find_forbidden(best)
+    if forbidden:
+        print(f"❌ 请求路径上导入了禁止的模块: {', '.join(forbidden)}")
+        failed = True
+    if total_ms > args.budget_ms:
+        print(f"❌ 导入耗时超出预算: {total_ms:.1f}ms > {args.budget_ms:.0f}ms")
+        failed = True
+    if not failed:
+        print("✅ 导入耗时在预算内，未导入禁止的模块")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+本地 PostgREST 桩服务
+用于在没有 Supabase 项目的情况下对 API 进行压测
+
+请求由 app.core.memory_postgrest.InMemoryPostgREST 处理（与 SUPABASE_BACKEND=memory 相同的实现），
+这里只负责通过 HTTP 暴露出来并预置测试数据：
+- users: user1..user20（所有用户共用同一个密码哈希）
+- news:  固定数量的新闻，created_at 依次递增
+
+使用方法:
+python scripts/stub_postgrest.py --port 54321 --latency 20
+"""
+
+import argparse
+import asyncio
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import Route
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.memory_postgrest import InMemoryPostgREST
+
+
+def build_dataset(news_count: int = 1000, user_count: int = 20, password_hash: str = ""):
+    """生成固定的测试数据
+
+    Args:
+        password_hash: 所有用户共用的密码哈希（登录压测时传入 bcrypt 哈希）
+    """
+    base_time = datetime(2024, 1, 1)
+    users = [
+        {
+            "id": i,
+            "username": f"user{i}",
+            "email": f"user{i}@example.com",
+            "password": password_hash,
+            "created_at": base_time.isoformat(),
+        }
+        for i in range(1, user_count + 1)
+    ]
+    news = []
+    for i in range(1, news_count + 1):
+        created_at = (base_time + timedelta(minutes=i)).isoformat()
+        news.append({
+            "id": i,
+            "title": f"新闻标题 {i}",
+            "description": "音乐资讯内容 " * 20,
+            "image_url": f"https://example.com/images/{i}.jpg",
+            "creator_id": users[i % user_count]["id"],
+            "created_at": created_at,
+            "updated_at": created_at,
+        })
+    news.reverse()
+    return {"users": users, "news": news}
+
+
+def create_stub_database(news_count: int = 1000, password_hash: str = "") -> InMemoryPostgREST:
+    """创建预置测试数据的内存 PostgREST 替身"""
+    database = InMemoryPostgREST()
+    database.load(build_dataset(news_count, password_hash=password_hash))
+    return database
+
+
+def create_stub_app(
+    latency_ms: float = 0.0,
+    news_count: int = 1000,
+    password_hash: str = "",
+) -> Starlette:
+    """创建 PostgREST 桩应用
+
+    Args:
+        latency_ms: 每个请求注入的延迟（毫秒），模拟网络与数据库耗时
+        news_count: 新闻条数
+        password_hash: 用户密码哈希
+    """
+    database = create_stub_database(news_count, password_hash)
+
+    async def endpoint(request: Request):
+        body = await request.body()
+        if latency_ms:
+            await asyncio.sleep(latency_ms / 1000)
+        status, headers, content = database.handle(
+            request.method,
+            request.url.path,
+            request.query_params.multi_items(),
+            {key.lower(): value for key, value in request.headers.items()},
+            body,
+        )
+        return Response(content, status_code=status, headers=headers)
+
+    return Starlette(routes=[
+        Route(
+            "/rest/v1/{resource:path}",
+            endpoint,
+            methods=["GET", "HEAD", "POST", "PATCH", "DELETE"],
+        )
+    ])
+
+
+def main():
+    """主函数"""
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="本地 PostgREST 桩服务")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=54321)
+    parser.add_argument("--latency", type=float, default=20.0, help="注入延迟（毫秒）")
+    parser.add_argument("--news-count", type=int, default=1000)
+    args = parser.parse_args()
+
+    app = create_stub_app(args.latency, args.news_count)
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""测试公共配置"""
+import os
+import sys
+from pathlib import Path
+
+import httpx
+import pytest
+from postgrest import AsyncPostgrestClient
+
+# 添加项目根目录和脚本目录到Python路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "scripts"))
+
+# 测试使用进程内的内存 PostgREST，不连接 Supabase；关闭响应缓存，避免用例之间互相影响
+os.environ.setdefault("SUPABASE_BACKEND", "memory")
+os.environ.setdefault("RESPONSE_CACHE_BACKEND", "none")
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+def memory_db():
+    """为单个用例提供独立的内存 PostgREST 数据库（SupabaseService 的请求都发到这里）"""
+    from app.core.memory_postgrest import InMemoryPostgREST, InMemoryPostgRESTTransport
+    from app.core.search_index import NewsSearchIndex
+    from app.services.supabase_service import supabase_service
+
+    database = InMemoryPostgREST()
+    previous = supabase_service._client
+    supabase_service._client = AsyncPostgrestClient(
+        "http://memory/rest/v1",
+        http_client=httpx.AsyncClient(transport=InMemoryPostgRESTTransport(database)),
+    )
+    supabase_service._search_index = NewsSearchIndex()
+    supabase_service.user_cache.clear()
+    yield database
+    supabase_service._client = previous
+    supabase_service._search_index = NewsSearchIndex()
+    supabase_service.user_cache.clear()
+
+
+@pytest.fixture
+async def client():
+    """在进程内调用应用的 HTTP 客户端"""
+    from app.main import app
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as http_client:
+        yield http_client
@@ -0,0 +1,132 @@
+"""响应压缩：Accept-Encoding 协商、一次性与流式压缩、ETag 与 Vary 处理"""
+import zlib
+
+import httpx
+import pytest
+import zstandard
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse, Response, StreamingResponse
+from starlette.routing import Route
+
+from app.middleware.compression import (
+    CompressionMiddleware,
+    is_compressible,
+    negotiate_encoding,
+    parse_accept_encoding,
+)
+from stub_postgrest import build_dataset
+
+pytestmark = pytest.mark.anyio
+
+BODY = ("音乐资讯 music news " * 200).encode()
+
+
+async def large(request):
+    return PlainTextResponse(BODY, headers={"ETag": '"abc"'})
+
+
+async def small(request):
+    return PlainTextResponse("ok")
+
+
+async def image(request):
+    return Response(BODY, media_type="image/png")
+
+
+async def stream(request):
+    async def chunks():
+        for _ in range(4):
+            yield BODY
+
+    return StreamingResponse(chunks(), media_type="application/x-ndjson")
+
+
+@pytest.fixture
+async def compressed_client():
+    app = Starlette(routes=[
+        Route("/large", large),
+        Route("/small", small),
+        Route("/image", image),
+        Route("/stream", stream),
+    ])
+    app.add_middleware(CompressionMiddleware, minimum_size=1024)
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+
+
+async def get_raw(client, path, accept_encoding):
+    """返回响应头和未解码的响应体"""
+    async with client.stream("GET", path, headers={"Accept-Encoding": accept_encoding}) as response:
+        return response.headers, b"".join([chunk async for chunk in response.aiter_raw()])
+
+
+def test_parse_accept_encoding():
+    assert parse_accept_encoding("gzip;q=0.5, zstd , br;q=bad") == {"gzip": 0.5, "zstd": 1.0, "br": 0.0}
+
+
+@pytest.mark.parametrize("header, expected", [
+    (None, None),
+    ("", None),
+    ("identity", None),
+    ("br", None),
+    ("gzip", "gzip"),
+    ("gzip, zstd", "zstd"),
+    ("zstd;q=0.5, gzip", "gzip"),
+    ("zstd;q=0, gzip;q=0", None),
+    ("*", "zstd"),
+    ("*;q=0.1, gzip;q=0.5", "gzip"),
+])
+def test_negotiate_encoding(header, expected):
+    assert negotiate_encoding(header) == expected
+
+
+def test_is_compressible():
+    assert is_compressible("application/json")
+    assert is_compressible("text/html; charset=utf-8")
+    assert is_compressible("application/problem+json")
+    assert not is_compressible("image/png")
+    assert not is_compressible("")
+
+
+@pytest.mark.parametrize("encoding, decompress", [
+    ("zstd", lambda data: zstandard.ZstdDecompressor().decompress(data)),
+    ("gzip", lambda data: zlib.decompress(data, 31)),
+])
+async def test_compresses_full_response(compressed_client, encoding, decompress):
+    headers, body = await get_raw(compressed_client, "/large", encoding)
+    assert headers["content-encoding"] == encoding
+    assert int(headers["content-length"]) == len(body) < len(BODY)
+    assert decompress(body) == BODY
+    assert headers["etag"] == 'W/"abc"'
+    assert headers["vary"] == "Accept-Encoding"
+
+
+async def test_streaming_response_is_compressed(compressed_client):
+    headers, body = await get_raw(compressed_client, "/stream", "gzip")
+    assert headers["content-encoding"] == "gzip"
+    assert "content-length" not in headers
+    assert zlib.decompress(body, 31) == BODY * 4
+
+
+async def test_uncompressed_responses(compressed_client):
+    headers, body = await get_raw(compressed_client, "/large", "identity")
+    assert "content-encoding" not in headers
+    assert headers["vary"] == "Accept-Encoding"
+    assert headers["etag"] == '"abc"'
+    assert body == BODY
+
+    headers, body = await get_raw(compressed_client, "/small", "zstd")
+    assert "content-encoding" not in headers
+    assert body == b"ok"
+
+    headers, body = await get_raw(compressed_client, "/image", "zstd")
+    assert "content-encoding" not in headers
+    assert body == BODY
+
+
+async def test_news_list_is_compressed(client, memory_db):
+    memory_db.load(build_dataset(news_count=30))
+    response = await client.get("/api/v1/news", params={"size": 30}, headers={"Accept-Encoding": "zstd"})
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "zstd"
+    assert len(response.json()["items"]) == 30
@@ -0,0 +1,75 @@
+"""磁盘 LRU 缓存：容量淘汰、访问顺序和重启后重建索引"""
+import os
+import time
+
+import pytest
+
+from app.core.disk_cache import DiskLRUCache
+
+pytestmark = pytest.mark.anyio
+
+
+async def put(cache, name, size):
+    temp_path = cache.temp_path(name)
+    temp_path.write_bytes(b"x" * size)
+    return await cache.add(name, temp_path)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = DiskLRUCache(str(tmp_path / "cache"), max_bytes=300)
+    cache.load()
+    return cache
+
+
+async def test_evicts_least_recently_used(cache):
+    for name in ("a", "b", "c"):
+        await put(cache, name, 100)
+    assert cache.get("a") is not None
+
+    await put(cache, "d", 100)
+    assert cache.get("b") is None
+    assert not cache.path("b").exists()
+    assert {name for name in ("a", "c", "d") if cache.get(name)} == {"a", "c", "d"}
+    stats = cache.stats()
+    assert stats["bytes"] == 300
+    assert stats["evictions"] == 1
+
+
+async def test_entry_larger_than_capacity_is_kept(cache):
+    await put(cache, "a", 100)
+    await put(cache, "big", 500)
+    assert cache.get("big") is not None
+    assert cache.get("a") is None
+    assert len(cache) == 1
+
+
+async def test_replacing_entry_updates_size(cache):
+    await put(cache, "a", 200)
+    await put(cache, "a", 50)
+    await put(cache, "b", 250)
+    assert cache.stats()["bytes"] == 300
+    assert cache.get("a") is not None
+
+
+async def test_file_deleted_externally_is_a_miss(cache):
+    path = await put(cache, "a", 100)
+    os.unlink(path)
+    assert cache.get("a") is None
+    assert cache.stats()["bytes"] == 0
+
+
+async def test_load_rebuilds_index_in_mtime_order(cache):
+    for index, name in enumerate(("old", "mid", "new")):
+        path = await put(cache, name, 100)
+        os.utime(path, (time.time() - 100 + index, time.time() - 100 + index))
+    cache.temp_path("partial").write_bytes(b"x")
+
+    reloaded = DiskLRUCache(str(cache.directory), max_bytes=300)
+    reloaded.load()
+    assert len(reloaded) == 3
+    assert not cache.temp_path("partial").exists()
+
+    await put(reloaded, "newest", 100)
+    assert reloaded.get("old") is None
+    assert reloaded.get("mid") is not None
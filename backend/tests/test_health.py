@@ -0,0 +1,42 @@
+"""就绪检查：事件循环延迟取自后台监测器的最近采样"""
+import asyncio
+import time
+
+import pytest
+
+from app.core.config import settings
+from app.core.profiling import loop_lag_monitor
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def lag_monitor(monkeypatch):
+    monkeypatch.setattr(settings, "PROFILER_LOOP_LAG_INTERVAL", 0.01)
+    monkeypatch.setattr(settings, "HEALTH_MAX_LOOP_LAG", 0.2)
+    monkeypatch.setattr(settings, "HEALTH_LOOP_LAG_WINDOW", 0.5)
+    yield loop_lag_monitor
+    await loop_lag_monitor.stop()
+
+
+async def test_ready_when_loop_is_free(client, memory_db, lag_monitor):
+    response = await client.get("/health/ready")
+    assert response.status_code == 200
+    assert response.json()["checks"]["event_loop"]["lag_ms"] < 200
+    assert lag_monitor.running
+
+
+async def test_blocked_loop_is_reported_after_it_recovers(client, memory_db, lag_monitor):
+    await client.get("/health/ready")
+    await asyncio.sleep(0.05)
+
+    # 阻塞结束后处理函数才会执行，仍应报告刚才的阻塞
+    time.sleep(0.3)
+    response = await client.get("/health/ready")
+    assert response.status_code == 503
+    assert response.json()["checks"]["event_loop"]["lag_ms"] >= 250
+
+    # 超出统计窗口后恢复就绪
+    await asyncio.sleep(0.6)
+    response = await client.get("/health/ready")
+    assert response.status_code == 200
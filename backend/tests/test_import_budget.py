@@ -0,0 +1,28 @@
+"""冷启动导入检查：导入耗时超出预算或请求路径上导入了禁止的模块时失败"""
+import os
+
+from profile_import import find_forbidden, profile_import, total_time_us
+
+TARGET = "api.index"
+# CI 机器较慢时可通过环境变量放宽
+BUDGET_MS = float(os.getenv("IMPORT_BUDGET_MS", "1000"))
+RUNS = 3
+
+
+def _best_profile():
+    best = None
+    for _ in range(RUNS):
+        records = profile_import(TARGET)
+        if best is None or total_time_us(records, TARGET) < total_time_us(best, TARGET):
+            best = records
+    return best
+
+
+def test_import_budget():
+    records = _best_profile()
+
+    forbidden = find_forbidden(records)
+    assert not forbidden, f"请求路径上导入了禁止的模块: {', '.join(forbidden)}"
+
+    total_ms = total_time_us(records, TARGET) / 1000
+    assert total_ms <= BUDGET_MS, f"导入耗时超出预算: {total_ms:.1f}ms > {BUDGET_MS:.0f}ms"
@@ -0,0 +1,67 @@
+"""内存 PostgREST 替身：通过 postgrest 客户端验证与真实服务一致的行为"""
+import pytest
+from postgrest import APIError
+
+from stub_postgrest import build_dataset
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def db(memory_db):
+    from app.services.supabase_service import supabase_service
+
+    memory_db.load(build_dataset(news_count=30, user_count=3))
+    return supabase_service.supabase
+
+
+async def test_filters_order_and_range(db):
+    response = await (
+        db.table("news").select("id,creator_id", count="exact")
+        .eq("creator_id", 2).order("id", desc=True).range(2, 4).execute()
+    )
+    assert [row["id"] for row in response.data] == [22, 19, 16]
+    assert all(row["creator_id"] == 2 for row in response.data)
+    assert response.count == 10
+
+
+async def test_or_filter_with_quoted_values(db):
+    await db.table("news").update({"title": 'a,b (c) "d"'}).eq("id", 5).execute()
+    response = await (
+        db.table("news").select("id")
+        .or_('title.eq."a,b (c) \\"d\\"",id.eq.7').order("id").execute()
+    )
+    assert [row["id"] for row in response.data] == [5, 7]
+
+
+async def test_embedded_relationship(db):
+    response = await db.table("news").select("id,creator:users(id,username)").eq("id", 4).execute()
+    assert response.data == [{"id": 4, "creator": {"id": 2, "username": "user2"}}]
+
+
+async def test_full_text_search_and_rpc(db):
+    await db.table("news").update({"title": "摇滚 album"}).in_("id", [3, 8]).execute()
+    response = await db.table("news").select("id").filter("search_vector", "wfts(simple)", "摇滚").execute()
+    assert sorted(row["id"] for row in response.data) == [3, 8]
+    response = await db.rpc("search_news", {"search_query": "album"}, get=True).select("id").execute()
+    assert sorted(row["id"] for row in response.data) == [3, 8]
+
+
+@pytest.mark.parametrize("query, code", [
+    (lambda db: db.table("news").select("nope").execute(), "42703"),
+    (lambda db: db.table("users").insert({"username": "user1", "email": "x@example.com"}).execute(), "23505"),
+    (lambda db: db.table("news").select("id", count="exact").range(100, 109).execute(), "PGRST103"),
+    (lambda db: db.rpc("missing", {}).execute(), "PGRST202"),
+])
+async def test_error_codes(db, query, code):
+    with pytest.raises(APIError) as error:
+        await query(db)
+    assert error.value.code == code
+
+
+async def test_failed_bulk_insert_is_rolled_back(db):
+    rows = [{"username": "new1", "email": "new1@example.com"}, {"username": "user1", "email": "dup@example.com"}]
+    with pytest.raises(APIError):
+        await db.table("users").insert(rows).execute()
+    response = await db.table("users").select("id", count="exact").eq("username", "new1").execute()
+    assert response.count == 0
@@ -0,0 +1,58 @@
+"""新闻创建者信息：请求级加载器合并查询，当前用户和已缓存的用户不再查询"""
+import pytest
+
+from app.core.security import create_access_token
+from stub_postgrest import build_dataset
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def requests(memory_db, monkeypatch):
+    """记录发往内存 PostgREST 的请求（方法 + 资源）"""
+    memory_db.load(build_dataset(news_count=30, user_count=5))
+    log = []
+    handle = memory_db.handle
+
+    def recording_handle(method, path, params, headers, body):
+        log.append(f"{method} {path.rpartition('/rest/v1/')[2]}")
+        return handle(method, path, params, headers, body)
+
+    monkeypatch.setattr(memory_db, "handle", recording_handle)
+    return log
+
+
+@pytest.fixture
+def auth_headers():
+    return {"Authorization": f"Bearer {create_access_token(1)}"}
+
+
+async def test_list_loads_creators_in_one_batch(client, requests):
+    response = await client.get("/api/v1/news", params={"size": 20, "cursor": ""})
+    assert response.status_code == 200
+    items = response.json()["items"]
+    assert all(item["creator"]["id"] == item["creator_id"] for item in items)
+    assert requests == ["GET news", "GET users"]
+
+    # 创建者已在用户缓存中，再次读取只需一次往返
+    requests.clear()
+    await client.get("/api/v1/news", params={"size": 20, "cursor": ""})
+    await client.get(f"/api/v1/news/{items[0]['id']}")
+    assert requests == ["GET news", "GET news"]
+
+
+async def test_writes_reuse_current_user(client, requests, auth_headers):
+    await client.get("/api/v1/users/me", headers=auth_headers)
+    requests.clear()
+
+    response = await client.post(
+        "/api/v1/news", json={"title": "新专辑", "description": "发行"}, headers=auth_headers
+    )
+    assert response.status_code == 201
+    assert response.json()["creator"]["username"] == "user1"
+    news_id = response.json()["id"]
+
+    response = await client.put(f"/api/v1/news/{news_id}", json={"title": "新专辑发行"}, headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json()["creator"]["id"] == 1
+    assert requests == ["POST news", "PATCH news"]
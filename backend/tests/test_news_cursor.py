@@ -0,0 +1,88 @@
+"""新闻游标分页：游标编解码，以及按 (排序列, id) 翻页不重复、不遗漏"""
+import pytest
+
+from app.core.pagination import decode_cursor, encode_cursor
+from stub_postgrest import build_dataset
+
+pytestmark = pytest.mark.anyio
+
+NEWS_COUNT = 47
+PAGE_SIZE = 6
+
+
+@pytest.fixture
+def news_rows(memory_db):
+    """每 3 条新闻共用同一个时间和标题，检验排序列取值相同时按 id 继续翻页"""
+    dataset = build_dataset(NEWS_COUNT)
+    for row in dataset["news"]:
+        group = row["id"] // 3
+        row["created_at"] = row["updated_at"] = f"2024-01-01T00:{group:02d}:00"
+        # 标题中包含 PostgREST 过滤语法里的特殊字符
+        row["title"] = f'新闻 {group % 5}, (第"{group}"组)'
+    memory_db.load(dataset)
+    return dataset["news"]
+
+
+def expected_ids(rows, sort_by, sort_order):
+    ordered = sorted(rows, key=lambda row: (row[sort_by], row["id"]), reverse=sort_order == "desc")
+    return [row["id"] for row in ordered]
+
+
+async def walk(client, **params):
+    """从首页开始沿 next_cursor 翻到最后一页，返回所有 id 和页数"""
+    ids, pages, cursor = [], 0, ""
+    while True:
+        response = await client.get("/api/v1/news", params={**params, "size": PAGE_SIZE, "cursor": cursor})
+        assert response.status_code == 200, response.text
+        page = response.json()
+        pages += 1
+        ids.extend(item["id"] for item in page["items"])
+        assert page["has_more"] == (page["next_cursor"] is not None)
+        if not page["has_more"]:
+            return ids, pages
+        assert len(page["items"]) == PAGE_SIZE
+        cursor = page["next_cursor"]
+
+
+def test_cursor_round_trip():
+    payload = {"k": "title", "o": "asc", "v": '新闻, (1) "a"', "id": 7}
+    cursor = encode_cursor(payload)
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == payload
+
+
+@pytest.mark.parametrize("cursor", ["not-base64!", encode_cursor({"k": "title"})[:-2], "WzEsMl0"])
+def test_decode_invalid_cursor(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+@pytest.mark.parametrize("sort_by", ["created_at", "updated_at", "title"])
+@pytest.mark.parametrize("sort_order", ["desc", "asc"])
+async def test_walk_returns_every_row_once(client, news_rows, sort_by, sort_order):
+    ids, pages = await walk(client, sort_by=sort_by, sort_order=sort_order)
+    assert ids == expected_ids(news_rows, sort_by, sort_order)
+    assert pages == -(-NEWS_COUNT // PAGE_SIZE)
+
+
+async def test_walk_with_filters(client, news_rows):
+    creator_id = news_rows[0]["creator_id"]
+    ids, _ = await walk(client, creator_id=creator_id, sort_by="title", sort_order="asc")
+    rows = [row for row in news_rows if row["creator_id"] == creator_id]
+    assert ids == expected_ids(rows, "title", "asc")
+
+
+async def test_first_page_counts_only_when_requested(client, news_rows):
+    response = await client.get("/api/v1/news", params={"size": PAGE_SIZE, "cursor": ""})
+    assert response.json()["total"] is None
+    response = await client.get("/api/v1/news", params={"size": PAGE_SIZE, "cursor": "", "count": "exact"})
+    assert response.json()["total"] == NEWS_COUNT
+
+
+async def test_cursor_must_match_sort(client, news_rows):
+    response = await client.get("/api/v1/news", params={"size": PAGE_SIZE, "cursor": ""})
+    cursor = response.json()["next_cursor"]
+    response = await client.get("/api/v1/news", params={"size": PAGE_SIZE, "cursor": cursor, "sort_by": "title"})
+    assert response.status_code == 400
+    response = await client.get("/api/v1/news", params={"size": PAGE_SIZE, "cursor": "not-base64!"})
+    assert response.status_code == 400
@@ -0,0 +1,58 @@
+"""新闻导出：分批流式输出，未执行全文检索迁移时 fts 搜索回退到进程内索引"""
+import csv
+import io
+import json
+
+import pytest
+
+from app.core.config import settings
+from app.core.security import create_access_token
+from stub_postgrest import build_dataset
+
+pytestmark = pytest.mark.anyio
+
+HEADERS = {"Authorization": f"Bearer {create_access_token(1)}"}
+MATCHING_IDS = [3, 8, 15, 22, 27]
+
+
+@pytest.fixture
+def news_db(memory_db, monkeypatch):
+    monkeypatch.setattr(settings, "NEWS_EXPORT_BATCH_SIZE", 2)
+    dataset = build_dataset(news_count=30, user_count=3)
+    for row in dataset["news"]:
+        if row["id"] in MATCHING_IDS:
+            row["title"] = f"摇滚乐队 新闻 {row['id']}"
+    memory_db.load(dataset)
+    return memory_db
+
+
+async def export_ndjson(client, **params):
+    response = await client.get("/api/v1/news/export", params=params, headers=HEADERS)
+    assert response.status_code == 200, response.text
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+async def test_export_all_in_id_order(client, news_db):
+    rows = await export_ndjson(client)
+    assert [row["id"] for row in rows] == list(range(1, 31))
+    assert set(rows[0]) == {"id", "title", "description", "image_url", "creator_id", "created_at", "updated_at"}
+
+
+async def test_export_csv(client, news_db):
+    response = await client.get("/api/v1/news/export", params={"format": "csv", "creator_id": 2}, headers=HEADERS)
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [int(row["id"]) for row in rows] == [i for i in range(1, 31) if i % 3 == 1]
+
+
+@pytest.mark.parametrize("search_mode", ["ilike", "fts"])
+async def test_export_search(client, news_db, search_mode):
+    rows = await export_ndjson(client, keyword="摇滚", search_mode=search_mode)
+    assert [row["id"] for row in rows] == MATCHING_IDS
+
+
+async def test_fts_export_falls_back_without_search_schema(client, news_db):
+    news_db.table("news").search_vectors = {}
+    rows = await export_ndjson(client, keyword="摇滚", search_mode="fts")
+    assert [row["id"] for row in rows] == MATCHING_IDS
+    rows = await export_ndjson(client, keyword="摇滚", search_mode="fts", creator_id=1)
+    assert [row["id"] for row in rows] == [3, 15, 27]
@@ -0,0 +1,105 @@
+"""NDJSON 流式导入：跨数据块的行、超长行、CRLF、空行、条数上限和逐条错误"""
+import json
+
+import pytest
+
+from app.core.config import settings
+from app.core.security import create_access_token
+from stub_postgrest import build_dataset
+
+pytestmark = pytest.mark.anyio
+
+HEADERS = {"Authorization": f"Bearer {create_access_token(1)}", "Content-Type": "application/x-ndjson"}
+
+
+@pytest.fixture(autouse=True)
+def import_settings(memory_db, monkeypatch):
+    memory_db.load(build_dataset(news_count=0, user_count=1))
+    monkeypatch.setattr(settings, "NEWS_BATCH_CHUNK_SIZE", 3)
+    monkeypatch.setattr(settings, "NEWS_IMPORT_MAX_LINE_BYTES", 200)
+    monkeypatch.setattr(settings, "NEWS_IMPORT_MAX_ITEMS", 100)
+
+
+def line(title, **fields):
+    return json.dumps({"title": title, "description": "内容", **fields}, ensure_ascii=False)
+
+
+async def post_import(client, body: bytes, chunk_size: int):
+    async def chunks():
+        for start in range(0, len(body), chunk_size):
+            yield body[start:start + chunk_size]
+
+    response = await client.post("/api/v1/news/import", content=chunks(), headers=HEADERS)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def outcomes(result):
+    return [(item["index"], item["status"], item["error"]) for item in result["results"]]
+
+
+def titles(memory_db):
+    return [row["title"] for row in memory_db.table("news").rows]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 5, 64, 4096])
+async def test_lines_split_across_chunks(client, memory_db, chunk_size):
+    body = "\n".join(line(f"新闻{i}") for i in range(7)).encode()
+    result = await post_import(client, body, chunk_size)
+    assert (result["created"], result["failed"]) == (7, 0)
+    assert [item["index"] for item in result["results"]] == list(range(7))
+    assert titles(memory_db) == [f"新闻{i}" for i in range(7)]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 4096])
+async def test_oversized_line_is_skipped(client, memory_db, chunk_size):
+    body = "\n".join([
+        line("前"),
+        line("超长", description="x" * 300),
+        line("后"),
+        line("末尾超长", description="y" * 300),
+    ]).encode()
+    result = await post_import(client, body, chunk_size)
+    assert outcomes(result) == [
+        (0, "created", None),
+        (1, "failed", "单行超过200字节"),
+        (2, "created", None),
+        (3, "failed", "单行超过200字节"),
+    ]
+    assert titles(memory_db) == ["前", "后"]
+
+
+async def test_crlf_and_blank_lines(client, memory_db):
+    body = "\r\n".join([line("a"), "", "   ", line("b"), "", ""]).encode() + b"\r\n" + line("c").encode()
+    result = await post_import(client, body, 3)
+    assert outcomes(result) == [(0, "created", None), (3, "created", None), (6, "created", None)]
+    assert titles(memory_db) == ["a", "b", "c"]
+
+
+async def test_stops_at_item_limit(client, memory_db, monkeypatch):
+    monkeypatch.setattr(settings, "NEWS_IMPORT_MAX_ITEMS", 4)
+    body = "\n".join(line(f"新闻{i}") for i in range(10)).encode()
+    result = await post_import(client, body, 16)
+    assert (result["created"], result["failed"]) == (4, 1)
+    assert outcomes(result)[-1] == (4, "failed", "超出单次导入上限4条，停止导入")
+    assert len(titles(memory_db)) == 4
+
+
+async def test_bad_records_do_not_drop_valid_rows(client, memory_db):
+    body = "\n".join([
+        line("ok1"),
+        "{bad json",
+        line("ok2"),
+        line("   "),
+        line("ok3", image_url="ftp://example.com/a.jpg"),
+        json.dumps(["not", "an", "object"]),
+        line("ok4"),
+    ]).encode()
+    result = await post_import(client, body, 10)
+    statuses = {index: (status, error) for index, status, error in outcomes(result)}
+    assert [index for index, (status, _) in statuses.items() if status == "created"] == [0, 2, 6]
+    assert statuses[1] == ("failed", "JSON 格式错误")
+    assert statuses[3][0] == statuses[4][0] == statuses[5][0] == "failed"
+    assert "title" in statuses[3][1]
+    assert "image_url" in statuses[4][1]
+    assert titles(memory_db) == ["ok1", "ok2", "ok4"]
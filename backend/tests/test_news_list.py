@@ -0,0 +1,42 @@
+"""新闻分页列表：数据和总数一次请求返回，页码超出范围时单独查询总数"""
+import pytest
+
+from stub_postgrest import build_dataset
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def requests(memory_db, monkeypatch):
+    """记录发往内存 PostgREST 的请求（方法 + 资源）"""
+    memory_db.load(build_dataset(news_count=30, user_count=5))
+    log = []
+    handle = memory_db.handle
+
+    def recording_handle(method, path, params, headers, body):
+        log.append(f"{method} {path.rpartition('/rest/v1/')[2]}")
+        return handle(method, path, params, headers, body)
+
+    monkeypatch.setattr(memory_db, "handle", recording_handle)
+    return log
+
+
+async def test_page_and_total_in_one_request(client, requests):
+    response = await client.get("/api/v1/news", params={"page": 2, "size": 10})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["total"] == 30
+    assert [item["id"] for item in body["items"]] == list(range(20, 10, -1))
+    assert [request for request in requests if request.endswith("news")] == ["GET news"]
+
+
+@pytest.mark.parametrize("params, total", [
+    ({}, 30),
+    ({"creator_id": 1}, 6),
+])
+async def test_page_past_the_end_still_reports_total(client, requests, params, total):
+    response = await client.get("/api/v1/news", params={"page": 9, "size": 10, **params})
+    assert response.status_code == 200, response.text
+    assert response.json()["items"] == []
+    assert response.json()["total"] == total
+    assert requests == ["GET news", "HEAD news"]
@@ -0,0 +1,114 @@
+"""新闻关键词搜索：未执行全文检索迁移时回退到进程内倒排索引"""
+import asyncio
+
+import pytest
+
+from app.core.security import create_access_token
+from stub_postgrest import build_dataset
+
+pytestmark = pytest.mark.anyio
+
+MATCHING_IDS = [27, 15, 8, 3]
+
+
+@pytest.fixture
+def news_db(memory_db):
+    dataset = build_dataset(news_count=30, user_count=3)
+    for row in dataset["news"]:
+        if row["id"] in MATCHING_IDS:
+            row["title"] = f"摇滚乐队 新闻 {row['id']}"
+    memory_db.load(dataset)
+    return memory_db
+
+
+@pytest.fixture
+def without_search_schema(news_db):
+    """模拟未执行迁移：没有 search_vector 列（42703）和 search_news 函数（PGRST202）"""
+    news_db.table("news").search_vectors = {}
+    news_db.functions.pop("search_news")
+    return news_db
+
+
+@pytest.fixture
+def rebuilds(memory_db, monkeypatch):
+    """记录服务层进程内索引的重建次数"""
+    from app.services.supabase_service import supabase_service
+
+    calls = []
+    index = supabase_service._search_index
+    rebuild = index.rebuild
+
+    def counting_rebuild(rows):
+        calls.append(1)
+        rebuild(rows)
+
+    monkeypatch.setattr(index, "rebuild", counting_rebuild)
+    return calls
+
+
+async def search_ids(client, search_mode, **params):
+    response = await client.get(
+        "/api/v1/news", params={"keyword": "摇滚", "search_mode": search_mode, "size": 10, **params}
+    )
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert all("search_vector" not in item for item in body["items"])
+    return [item["id"] for item in body["items"]], body
+
+
+@pytest.mark.parametrize("search_mode", ["fts", "ranked"])
+async def test_schema_present(client, news_db, rebuilds, search_mode):
+    ids, body = await search_ids(client, search_mode)
+    assert sorted(ids, reverse=True) == MATCHING_IDS
+    assert body["total"] == len(MATCHING_IDS)
+    assert rebuilds == []
+
+
+@pytest.mark.parametrize("search_mode", ["fts", "ranked", "ilike"])
+async def test_falls_back_without_schema(client, without_search_schema, search_mode):
+    ids, body = await search_ids(client, search_mode)
+    assert sorted(ids, reverse=True) == MATCHING_IDS
+    assert body["total"] == len(MATCHING_IDS)
+    assert all(item["creator"]["id"] == item["creator_id"] for item in body["items"])
+
+
+async def test_fallback_pagination_and_sort(client, without_search_schema):
+    ids, _ = await search_ids(client, "fts", size=3, page=2)
+    assert ids == MATCHING_IDS[3:]
+    ids, _ = await search_ids(client, "fts", sort_order="asc")
+    assert ids == MATCHING_IDS[::-1]
+
+
+async def test_cursor_fallback_without_schema(client, without_search_schema):
+    ids, cursor = [], ""
+    while cursor is not None:
+        page_ids, body = await search_ids(client, "fts", size=3, cursor=cursor, count="exact")
+        ids += page_ids
+        cursor = body["next_cursor"]
+        assert body["total"] == len(MATCHING_IDS)
+    assert ids == MATCHING_IDS
+
+
+async def test_concurrent_searches_rebuild_index_once(client, without_search_schema, rebuilds):
+    from app.services.supabase_service import supabase_service
+
+    # 注入延迟，让并发请求在重建索引的查询期间交错执行
+    supabase_service.supabase.session._transport.latency_ms = 5
+    results = await asyncio.gather(*(search_ids(client, "fts", page=page) for page in (1, 1, 2, 1, 2)))
+    assert [sorted(ids, reverse=True) for ids, _ in results if ids][0] == MATCHING_IDS
+    assert rebuilds == [1]
+
+
+async def test_writes_update_built_index(client, without_search_schema, rebuilds):
+    await search_ids(client, "fts")
+    headers = {"Authorization": f"Bearer {create_access_token(1)}"}
+    response = await client.post(
+        "/api/v1/news", json={"title": "摇滚新专辑", "description": "发行"}, headers=headers
+    )
+    new_id = response.json()["id"]
+    response = await client.delete(f"/api/v1/news/{MATCHING_IDS[0]}", headers=headers)
+    assert response.status_code == 204
+
+    ids, _ = await search_ids(client, "fts")
+    assert sorted(ids, reverse=True) == [new_id] + MATCHING_IDS[1:]
+    assert rebuilds == [1]
@@ -0,0 +1,68 @@
+"""新闻写操作：按 id 和创建者条件写入，未命中时区分不存在（404）和没有权限（403）"""
+import pytest
+
+from app.core.security import create_access_token
+from stub_postgrest import build_dataset
+
+pytestmark = pytest.mark.anyio
+
+# id 为 5 的新闻由 id 为 6 的用户创建
+NEWS_ID = 5
+OWNER = {"Authorization": f"Bearer {create_access_token(6)}"}
+OTHER = {"Authorization": f"Bearer {create_access_token(1)}"}
+
+
+@pytest.fixture
+def requests(memory_db, monkeypatch):
+    """记录发往内存 PostgREST 的请求（方法 + 资源）"""
+    memory_db.load(build_dataset(news_count=5))
+    log = []
+    handle = memory_db.handle
+
+    def recording_handle(method, path, params, headers, body):
+        log.append(f"{method} {path.rpartition('/rest/v1/')[2]}")
+        return handle(method, path, params, headers, body)
+
+    monkeypatch.setattr(memory_db, "handle", recording_handle)
+    return log
+
+
+async def test_update_own_news(client, requests):
+    await client.get("/api/v1/users/me", headers=OWNER)
+    requests.clear()
+    response = await client.put(f"/api/v1/news/{NEWS_ID}", json={"title": "新标题"}, headers=OWNER)
+    assert response.status_code == 200, response.text
+    assert response.json()["title"] == "新标题"
+    assert response.json()["creator"]["id"] == 6
+    assert requests == ["PATCH news"]
+
+
+async def test_update_missing_news(client, requests):
+    response = await client.put("/api/v1/news/999", json={"title": "新标题"}, headers=OWNER)
+    assert response.status_code == 404
+
+
+async def test_update_others_news(client, requests):
+    response = await client.put(f"/api/v1/news/{NEWS_ID}", json={"title": "新标题"}, headers=OTHER)
+    assert response.status_code == 403
+    assert (await client.get(f"/api/v1/news/{NEWS_ID}")).json()["title"] != "新标题"
+
+
+async def test_delete_own_news(client, requests):
+    await client.get("/api/v1/users/me", headers=OWNER)
+    requests.clear()
+    response = await client.delete(f"/api/v1/news/{NEWS_ID}", headers=OWNER)
+    assert response.status_code == 204
+    assert requests == ["DELETE news"]
+    assert (await client.get(f"/api/v1/news/{NEWS_ID}")).status_code == 404
+
+
+async def test_delete_missing_news(client, requests):
+    response = await client.delete("/api/v1/news/999", headers=OWNER)
+    assert response.status_code == 404
+
+
+async def test_delete_others_news(client, requests):
+    response = await client.delete(f"/api/v1/news/{NEWS_ID}", headers=OTHER)
+    assert response.status_code == 403
+    assert (await client.get(f"/api/v1/news/{NEWS_ID}")).status_code == 200
@@ -0,0 +1,60 @@
+"""调用栈采样：所有请求共用一个采样线程，注销采样不等待线程"""
+import threading
+import time
+
+from app.core.profiling import StackSampler
+
+
+def busy_wait(seconds):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+def sampler_threads():
+    return [thread for thread in threading.enumerate() if thread.name == "stack-sampler"]
+
+
+def test_samples_stacks_of_calling_thread():
+    sampler = StackSampler(interval=0.001)
+    profile = sampler.begin()
+    busy_wait(0.1)
+    sampler.end(profile)
+
+    assert profile.stacks
+    assert any(stack.endswith("test_profiling.py:busy_wait") for stack in profile.stacks)
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in profile.folded().splitlines())
+
+    # end() 返回后不再采样
+    snapshot = dict(profile.stacks)
+    busy_wait(0.02)
+    assert profile.stacks == snapshot
+
+
+def test_concurrent_profiles_share_one_thread():
+    before = len(sampler_threads())
+    sampler = StackSampler(interval=0.001)
+    first = sampler.begin()
+    second = sampler.begin()
+    assert len(sampler_threads()) == before + 1
+
+    busy_wait(0.05)
+    sampler.end(first)
+    busy_wait(0.05)
+    sampler.end(second)
+    assert sum(second.stacks.values()) > sum(first.stacks.values())
+
+    # 没有请求需要采样后，再次登记仍由同一个线程处理
+    third = sampler.begin()
+    busy_wait(0.05)
+    sampler.end(third)
+    assert third.stacks
+    assert len(sampler_threads()) == before + 1
+
+
+def test_end_does_not_wait_for_sampler_thread():
+    sampler = StackSampler(interval=0.5)
+    profile = sampler.begin()
+    started = time.perf_counter()
+    sampler.end(profile)
+    assert time.perf_counter() - started < 0.05
@@ -0,0 +1,85 @@
+"""上传图片缩略图：按档位生成、缓存命中和 ETag"""
+import io
+
+import pytest
+
+from app.api import uploads
+from app.core.disk_cache import DiskLRUCache
+from app.services.rendition_service import RenditionService
+from app.services.upload_service import UploadService
+
+Image = pytest.importorskip("PIL.Image")
+
+pytestmark = pytest.mark.anyio
+
+
+def make_image(width, height, image_format):
+    buffer = io.BytesIO()
+    Image.new("RGB", (width, height), (200, 40, 90)).save(buffer, image_format)
+    return buffer.getvalue()
+
+
+def image_size(content):
+    with Image.open(io.BytesIO(content)) as image:
+        return image.size
+
+
+@pytest.fixture
+def stored(tmp_path, monkeypatch):
+    """把一张 1000x500 的 JPEG 和一张 100x50 的 PNG 直接写入上传目录"""
+    upload = UploadService(str(tmp_path / "uploads"), 5 * 1024 * 1024, [".jpg", ".png"])
+    rendition = RenditionService(
+        DiskLRUCache(str(tmp_path / "renditions"), 10 * 1024 * 1024),
+        {"thumb": 200, "card": 640},
+    )
+    monkeypatch.setattr(uploads, "upload_service", upload)
+    monkeypatch.setattr(uploads, "rendition_service", rendition)
+
+    keys = {"large": f"aa/{'a' * 64}.jpg", "small": f"bb/{'b' * 64}.png"}
+    for key, content in (
+        (keys["large"], make_image(1000, 500, "JPEG")),
+        (keys["small"], make_image(100, 50, "PNG")),
+    ):
+        path = upload.path_for(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(content)
+    yield keys, rendition
+    rendition.shutdown()
+
+
+async def test_rendition_by_size_name(client, stored):
+    keys, rendition = stored
+    response = await client.get(f"/api/v1/uploads/{keys['large']}", params={"size": "thumb"})
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "image/jpeg"
+    assert image_size(response.content) == (200, 100)
+    etag = response.headers["etag"]
+    assert etag == f'"{"a" * 64}-w200-q82"'
+
+    await client.get(f"/api/v1/uploads/{keys['large']}", params={"size": "thumb"})
+    assert rendition.cache.stats()["hits"] == 1
+    response = await client.get(
+        f"/api/v1/uploads/{keys['large']}", params={"size": "thumb"}, headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 304
+
+
+async def test_width_rounds_up_to_bucket(client, stored):
+    keys, _ = stored
+    response = await client.get(f"/api/v1/uploads/{keys['large']}", params={"w": 300})
+    assert image_size(response.content) == (640, 320)
+    response = await client.get(f"/api/v1/uploads/{keys['large']}", params={"w": 5000})
+    assert image_size(response.content) == (640, 320)
+
+
+async def test_small_image_is_not_upscaled(client, stored):
+    keys, _ = stored
+    response = await client.get(f"/api/v1/uploads/{keys['small']}", params={"size": "card"})
+    assert response.status_code == 200
+    assert image_size(response.content) == (100, 50)
+
+
+async def test_unknown_size_is_rejected(client, stored):
+    keys, _ = stored
+    response = await client.get(f"/api/v1/uploads/{keys['large']}", params={"size": "huge"})
+    assert response.status_code == 400
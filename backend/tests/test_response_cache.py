@@ -0,0 +1,60 @@
+"""新闻公开接口的响应缓存：ETag / 304 和写操作后的失效"""
+import pytest
+
+from app.core.response_cache import MemoryCacheBackend, news_cache
+from app.core.security import create_access_token
+from stub_postgrest import build_dataset
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def response_cache(monkeypatch, memory_db):
+    """为单个用例启用进程内响应缓存"""
+    memory_db.load(build_dataset(news_count=5))
+    monkeypatch.setattr(news_cache, "_backend", MemoryCacheBackend())
+    monkeypatch.setattr(news_cache, "_backend_created", True)
+    monkeypatch.setattr(news_cache, "hits", 0)
+    monkeypatch.setattr(news_cache, "misses", 0)
+    return news_cache
+
+
+async def test_etag_and_not_modified(client, response_cache):
+    # 不协商压缩，ETag 保持为缓存生成的强 ETag
+    client.headers["Accept-Encoding"] = "identity"
+    response = await client.get("/api/v1/news", params={"size": 5})
+    assert response.status_code == 200
+    etag = response.headers["etag"]
+    assert response.headers["cache-control"].startswith("public, max-age=")
+
+    response = await client.get("/api/v1/news", params={"size": 5}, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+    assert response_cache.stats()["hits"] == 1
+
+    response = await client.get("/api/v1/news", params={"size": 5}, headers={"If-None-Match": f"W/{etag}"})
+    assert response.status_code == 304
+    response = await client.get("/api/v1/news", params={"size": 5}, headers={"If-None-Match": '"stale"'})
+    assert response.status_code == 200
+
+
+async def test_write_invalidates_cached_responses(client, response_cache):
+    # id 为 5 的新闻由 id 为 6 的用户创建
+    headers = {"Authorization": f"Bearer {create_access_token(6)}"}
+    list_etag = (await client.get("/api/v1/news", params={"size": 5})).headers["etag"]
+    detail = await client.get("/api/v1/news/5")
+    assert detail.status_code == 200
+
+    response = await client.put("/api/v1/news/5", json={"title": "更新后的标题"}, headers=headers)
+    assert response.status_code == 200, response.text
+
+    detail = await client.get("/api/v1/news/5")
+    assert detail.json()["title"] == "更新后的标题"
+    response = await client.get("/api/v1/news", params={"size": 5}, headers={"If-None-Match": list_etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != list_etag
+
+    response = await client.delete("/api/v1/news/5", headers=headers)
+    assert response.status_code == 204
+    assert (await client.get("/api/v1/news/5")).status_code == 404
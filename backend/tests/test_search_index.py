@@ -0,0 +1,55 @@
+"""进程内新闻倒排索引：分词、全部命中匹配和打分"""
+from app.core.search_index import NewsSearchIndex, tokenize
+
+
+def news(news_id, title, description="", creator_id=1):
+    return {"id": news_id, "title": title, "description": description, "creator_id": creator_id}
+
+
+def test_tokenize():
+    assert tokenize("Live 2024 Tour") == ["live", "2024", "tour"]
+    assert tokenize("摇滚乐队") == ["摇滚", "滚乐", "乐队"]
+    assert tokenize("新 album") == ["album", "新"]
+    assert tokenize(None) == []
+
+
+def test_all_terms_must_match():
+    index = NewsSearchIndex()
+    index.rebuild([news(1, "摇滚乐队巡演"), news(2, "摇滚专辑"), news(3, "民谣巡演")])
+    assert [doc["id"] for doc, _ in index.search("摇滚")] == [2, 1]
+    assert [doc["id"] for doc, _ in index.search("摇滚 巡演")] == [1]
+    assert index.search("爵士") == []
+    assert index.search("   ") == []
+
+
+def test_title_outweighs_description():
+    index = NewsSearchIndex()
+    index.rebuild([news(1, "新歌", "vinyl"), news(2, "vinyl", "新歌")])
+    assert [doc["id"] for doc, _ in index.search("vinyl")] == [2, 1]
+
+
+def test_creator_filter():
+    index = NewsSearchIndex()
+    index.rebuild([news(1, "album", creator_id=1), news(2, "album", creator_id=2)])
+    assert [doc["id"] for doc, _ in index.search("album", creator_id=2)] == [2]
+
+
+def test_add_and_remove_keep_postings_consistent():
+    index = NewsSearchIndex()
+    index.rebuild([news(1, "album tour")])
+    index.add(news(1, "festival"))
+    assert index.search("album") == []
+    assert [doc["id"] for doc, _ in index.search("festival")] == [1]
+
+    index.remove(1)
+    assert len(index) == 0
+    assert index.search("festival") == []
+    assert index._postings == {}
+
+
+def test_is_stale():
+    index = NewsSearchIndex()
+    assert index.is_stale(300)
+    index.rebuild([])
+    assert not index.is_stale(300)
+    assert index.is_stale(-1)
@@ -0,0 +1,75 @@
+"""令牌撤销：布隆过滤器、撤销列表，以及登出后令牌不能再使用"""
+import os
+import time
+
+import pytest
+
+from app.core.security import create_access_token
+from app.core.token_cache import BloomFilter, RevocationList, token_digest
+from stub_postgrest import build_dataset
+
+
+def random_digests(count):
+    return [os.urandom(16) for _ in range(count)]
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    digests = random_digests(1000)
+    for digest in digests:
+        bloom.add(digest)
+    assert all(digest in bloom for digest in digests)
+
+
+def test_bloom_filter_false_positive_rate():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    for digest in random_digests(1000):
+        bloom.add(digest)
+    false_positives = sum(digest in bloom for digest in random_digests(20000))
+    # 满载时的理论误判率为 1%，留出随机波动的余量
+    assert false_positives / 20000 < 0.02
+
+
+def test_revoked_until_expiry():
+    revoked = RevocationList(capacity=100)
+    digest, other = token_digest("a"), token_digest("b")
+    revoked.revoke(digest, time.time() + 60)
+    assert revoked.is_revoked(digest)
+    assert not revoked.is_revoked(other)
+
+    revoked.purge(now=time.time() + 61)
+    assert len(revoked) == 0
+    assert not revoked.is_revoked(digest)
+
+
+def test_expired_token_is_not_stored():
+    revoked = RevocationList(capacity=100)
+    revoked.revoke(token_digest("a"), time.time() - 1)
+    assert len(revoked) == 0
+
+
+def test_revocations_beyond_capacity_stay_exact():
+    revoked = RevocationList(capacity=10, error_rate=0.01)
+    expires_at = time.time() + 60
+    digests = random_digests(50)
+    for digest in digests:
+        revoked.revoke(digest, expires_at)
+    assert len(revoked) == 50
+    assert revoked.stats()["bloom_bits"] > BloomFilter(10, 0.01).size
+    assert all(revoked.is_revoked(digest) for digest in digests)
+    assert not any(revoked.is_revoked(digest) for digest in random_digests(1000))
+
+
+@pytest.mark.anyio
+async def test_logout_revokes_token(client, memory_db):
+    memory_db.load(build_dataset(news_count=0))
+    headers = {"Authorization": f"Bearer {create_access_token(1)}"}
+    other = {"Authorization": f"Bearer {create_access_token(1)}"}
+
+    assert (await client.get("/api/v1/users/me", headers=headers)).status_code == 200
+    assert (await client.post("/api/v1/users/logout", headers=headers)).status_code == 200
+
+    response = await client.get("/api/v1/users/me", headers=headers)
+    assert response.status_code == 401
+    # 同一用户的其他令牌不受影响
+    assert (await client.get("/api/v1/users/me", headers=other)).status_code == 200
@@ -0,0 +1,143 @@
+"""图片上传：multipart 流式解析、大小限制、按内容去重"""
+import hashlib
+
+import pytest
+
+from app.api import uploads
+from app.core.exceptions import PayloadTooLargeException
+from app.core.security import create_access_token
+from app.services.upload_service import UploadService
+from stub_postgrest import build_dataset
+
+pytestmark = pytest.mark.anyio
+
+PNG = b"\x89PNG\r\n\x1a\n" + bytes(range(256)) * 8
+BOUNDARY = "test-boundary"
+
+
+def multipart_body(content, filename="cover.png", field_name="file"):
+    return (
+        f"--{BOUNDARY}\r\n"
+        f'Content-Disposition: form-data; name="note"\r\n\r\n'
+        f"hello\r\n"
+        f"--{BOUNDARY}\r\n"
+        f'Content-Disposition: form-data; name="{field_name}"; filename="{filename}"\r\n'
+        f"Content-Type: application/octet-stream\r\n\r\n"
+    ).encode() + content + f"\r\n--{BOUNDARY}--\r\n".encode()
+
+
+async def chunked(body, size):
+    for start in range(0, len(body), size):
+        yield body[start:start + size]
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    service = UploadService(str(tmp_path), max_file_size=4096, allowed_extensions=[".jpg", ".png", ".gif"])
+    monkeypatch.setattr(uploads, "upload_service", service)
+    return service
+
+
+@pytest.fixture
+def auth_headers(memory_db):
+    memory_db.load(build_dataset(news_count=0))
+    return {"Authorization": f"Bearer {create_access_token(1)}"}
+
+
+def leftover_temp_files(service):
+    return list(service.tmp_dir.iterdir()) if service.tmp_dir.exists() else []
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 65536])
+async def test_streamed_parse_is_independent_of_chunking(service, chunk_size):
+    result = await service.save_multipart(
+        f"multipart/form-data; boundary={BOUNDARY}",
+        chunked(multipart_body(PNG), chunk_size),
+    )
+    digest = hashlib.sha256(PNG).hexdigest()
+    assert result == {
+        "key": f"{digest[:2]}/{digest}.png",
+        "size": len(PNG),
+        "sha256": digest,
+        "content_type": "image/png",
+        "deduplicated": False,
+    }
+    assert service.path_for(result["key"]).read_bytes() == PNG
+    assert leftover_temp_files(service) == []
+
+
+async def test_extension_comes_from_content(service):
+    result = await service.save_multipart(
+        f"multipart/form-data; boundary={BOUNDARY}",
+        chunked(multipart_body(PNG, filename="cover.jpg"), 1024),
+    )
+    assert result["key"].endswith(".png")
+
+
+async def test_oversized_file_is_aborted_mid_stream(service):
+    with pytest.raises(PayloadTooLargeException, match="大小超过限制"):
+        await service.save_multipart(
+            f"multipart/form-data; boundary={BOUNDARY}",
+            chunked(multipart_body(PNG + b"\0" * 4096), 512),
+        )
+    assert leftover_temp_files(service) == []
+
+
+def test_content_length_checked_before_reading(service):
+    service.check_content_length("1000")
+    with pytest.raises(PayloadTooLargeException, match="大小超过限制"):
+        service.check_content_length(str(10 * 1024 * 1024))
+    with pytest.raises(Exception, match="不合法"):
+        service.check_content_length("abc")
+
+
+async def test_upload_and_deduplicate(client, service, auth_headers):
+    files = {"file": ("cover.png", PNG, "image/png")}
+    first = await client.post("/api/v1/uploads", files=files, headers=auth_headers)
+    assert first.status_code == 201, first.text
+    second = await client.post("/api/v1/uploads", files=files, headers=auth_headers)
+    assert second.status_code == 200
+    assert second.json()["deduplicated"] is True
+    assert second.json()["key"] == first.json()["key"]
+    assert len(list(service.upload_dir.glob("*/*.png"))) == 1
+
+    response = await client.get(f"/api/v1/uploads/{first.json()['key']}")
+    assert response.status_code == 200
+    assert response.content == PNG
+    assert response.headers["content-type"] == "image/png"
+    etag = response.headers["etag"]
+    response = await client.get(f"/api/v1/uploads/{first.json()['key']}", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+
+    # 多个 ETag 列表和压缩中间件加上的弱 ETag 前缀也视为命中；仅包含其子串的 ETag 不算
+    for if_none_match in (f'"other", {etag}', f"W/{etag}"):
+        response = await client.get(
+            f"/api/v1/uploads/{first.json()['key']}", headers={"If-None-Match": if_none_match}
+        )
+        assert response.status_code == 304
+    response = await client.get(
+        f"/api/v1/uploads/{first.json()['key']}", headers={"If-None-Match": f'"x{etag[1:-1]}x"'}
+    )
+    assert response.status_code == 200
+
+
+async def test_upload_rejections(client, service, auth_headers):
+    response = await client.post(
+        "/api/v1/uploads", files={"file": ("cover.png", b"not an image", "image/png")}, headers=auth_headers
+    )
+    assert response.status_code == 400
+    response = await client.post(
+        "/api/v1/uploads", files={"file": ("cover.exe", PNG, "image/png")}, headers=auth_headers
+    )
+    assert response.status_code == 400
+    response = await client.post(
+        "/api/v1/uploads", files={"file": ("cover.png", PNG * 2, "image/png")}, headers=auth_headers
+    )
+    assert response.status_code == 413
+    assert leftover_temp_files(service) == []
+    assert list(service.upload_dir.glob("*/*")) == []
+
+
+async def test_get_rejects_invalid_keys(client, service):
+    assert (await client.get("/api/v1/uploads/../../etc/passwd")).status_code == 404
+    assert (await client.get(f"/api/v1/uploads/ab/{'ab' + '0' * 62}.png")).status_code == 404
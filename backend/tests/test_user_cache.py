@@ -0,0 +1,54 @@
+"""已认证用户缓存：命中时不查询用户表，过期后重新读取"""
+import asyncio
+
+import pytest
+
+from app.core.security import create_access_token
+from app.services.supabase_service import supabase_service
+from stub_postgrest import build_dataset
+
+pytestmark = pytest.mark.anyio
+
+AUTH_HEADERS = {"Authorization": f"Bearer {create_access_token(1)}"}
+
+
+@pytest.fixture
+def requests(memory_db, monkeypatch):
+    """记录发往内存 PostgREST 的请求（方法 + 资源）"""
+    memory_db.load(build_dataset(news_count=0, user_count=3))
+    log = []
+    handle = memory_db.handle
+
+    def recording_handle(method, path, params, headers, body):
+        log.append(f"{method} {path.rpartition('/rest/v1/')[2]}")
+        return handle(method, path, params, headers, body)
+
+    monkeypatch.setattr(memory_db, "handle", recording_handle)
+    return log
+
+
+async def test_cache_hit_skips_users_table(client, requests):
+    first = await client.get("/api/v1/users/me", headers=AUTH_HEADERS)
+    assert first.status_code == 200
+    assert requests == ["GET users"]
+
+    second = await client.get("/api/v1/users/me", headers=AUTH_HEADERS)
+    assert second.json() == first.json()
+    assert requests == ["GET users"]
+
+    cached = supabase_service.user_cache.get(1)
+    assert "password" not in cached
+
+
+async def test_cached_user_expires(client, memory_db, requests, monkeypatch):
+    monkeypatch.setattr(supabase_service.user_cache, "ttl", 0.05)
+    first = await client.get("/api/v1/users/me", headers=AUTH_HEADERS)
+
+    # 缓存有效期内，数据库中的修改不可见
+    memory_db.table("users").rows[0]["username"] = "renamed"
+    assert (await client.get("/api/v1/users/me", headers=AUTH_HEADERS)).json() == first.json()
+
+    await asyncio.sleep(0.1)
+    response = await client.get("/api/v1/users/me", headers=AUTH_HEADERS)
+    assert response.json()["username"] == "renamed"
+    assert requests == ["GET users", "GET users"]
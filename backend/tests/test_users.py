@@ -0,0 +1,35 @@
+"""用户注册：由唯一约束检查重复，用户名或邮箱重复时返回 409"""
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+USER = {"username": "alice", "email": "alice@example.com", "password": "secret123"}
+
+
+async def register(client, **overrides):
+    return await client.post("/api/v1/users/register", json={**USER, **overrides})
+
+
+async def test_register_and_login(client, memory_db):
+    response = await register(client)
+    assert response.status_code == 201, response.text
+    assert response.json()["username"] == "alice"
+    assert "password" not in response.json()
+
+    response = await client.post(
+        "/api/v1/users/login", json={"username": "alice@example.com", "password": "secret123"}
+    )
+    assert response.status_code == 200, response.text
+    assert response.json()["access_token"]
+
+
+@pytest.mark.parametrize("overrides, message", [
+    ({"email": "other@example.com"}, "用户名已存在"),
+    ({"username": "bob"}, "邮箱已被注册"),
+])
+async def test_duplicate_user_conflicts(client, memory_db, overrides, message):
+    assert (await register(client)).status_code == 201
+    response = await register(client, **overrides)
+    assert response.status_code == 409
+    assert message in response.json()["detail"]
+    assert len(memory_db.table("users").rows) == 1
@@ -1,6 +1,8 @@
 import React, { useState } from 'react';
+import { getImageRendition } from '../utils/helpers';
 
-const ImageWithPlaceholder = ({ src, alt, className }) => {
+// size: 缩略图尺寸档位（thumb/card/full），只对上传的图片生效
+const ImageWithPlaceholder = ({ src, alt, className, size }) => {
   const [imageError, setImageError] = useState(false);
   const [imageLoaded, setImageLoaded] = useState(false);
 
@@ -47,7 +49,7 @@ const ImageWithPlaceholder = ({ src, alt, className }) => {
         <>
           {!imageLoaded && <PlaceholderSVG />}
           <img 
-            src={src} 
+            src={getImageRendition(src, size)} 
             alt={alt} 
             onError={handleImageError}
             onLoad={handleImageLoad}
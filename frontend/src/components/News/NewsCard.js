@@ -1,6 +1,7 @@
 import React, { useState } from 'react';
 import './NewsCard.scss';
 import ImagePlaceholder from '../common/ImagePlaceholder';
+import { getImageRendition, getImageSrcSet } from '../../utils/helpers';
 
 const NewsCard = ({ news }) => {
 const [imageError, setImageError] = useState(false);
@@ -47,8 +48,11 @@ const handleImageError = () => {
           <ImagePlaceholder />
         ) : (
           <img
-            src={news.image_url}
+            src={getImageRendition(news.image_url, 'card')}
+            srcSet={getImageSrcSet(news.image_url)}
+            sizes="(max-width: 768px) 100vw, (max-width: 1200px) 50vw, 460px"
             alt={news.title}
+            loading="lazy"
             onError={handleImageError}
           />
         )}
@@ -286,6 +286,7 @@ const NewsManagementPage = () => {
                     <div className="news-image">
                       <ImageWithPlaceholder 
                         src={item.image_url} 
+                        size="thumb"
                         alt={item.title}
                         className="news-image-placeholder"
                       />
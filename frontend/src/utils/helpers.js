@@ -0,0 +1,23 @@
+// 后端上传接口返回的图片地址：.../<哈希前两位>/<sha256>.<扩展名>
+const UPLOAD_KEY_PATTERN = /\/[0-9a-f]{2}\/[0-9a-f]{64}\.(jpg|png|webp)$/;
+
+// 缩略图尺寸档位（与后端 IMAGE_RENDITION_SIZES 保持一致）
+export const IMAGE_SIZES = {
+  thumb: 200,
+  card: 640,
+  full: 1600,
+};
+
+// 获取上传图片的缩略图地址；外部图片地址原样返回
+export const getImageRendition = (url, size) => {
+  if (!url || !size || !UPLOAD_KEY_PATTERN.test(url)) return url;
+  return `${url}?size=${size}`;
+};
+
+// 生成 srcSet，让浏览器按显示宽度和像素密度选择档位；外部图片返回 undefined
+export const getImageSrcSet = (url) => {
+  if (!url || !UPLOAD_KEY_PATTERN.test(url)) return undefined;
+  return Object.entries(IMAGE_SIZES)
+    .map(([size, width]) => `${getImageRendition(url, size)} ${width}w`)
+    .join(', ');
+};